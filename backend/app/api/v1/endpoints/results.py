@@ -1,5 +1,6 @@
 """Results endpoints."""
 
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Annotated, Any
 
@@ -15,7 +16,11 @@ from app.models.result import (
 )
 from app.models.user import User
 from app.repositories.project import ProjectRepository, get_project_repository
-from app.repositories.result import ResultRepository, get_result_repository
+from app.repositories.result import (
+    EXPORT_COLUMNS_PROJECTION,
+    ResultRepository,
+    get_result_repository,
+)
 
 router = APIRouter()
 
@@ -34,16 +39,20 @@ async def list_results(
     platform: str | None = Query(None, description="Filter by platform"),
     target_id: str | None = Query(None, description="Filter by target"),
     search: str | None = Query(None, description="Search in text/title"),
+    substring: bool = Query(False, description="Match search as a substring instead of words"),
+    sort_by_relevance: bool = Query(False, description="Order word searches by relevance"),
     date_from: datetime | None = Query(None, description="Results after this date"),
     date_to: datetime | None = Query(None, description="Results before this date"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    include_total: bool = Query(True, description="Count matching results"),
 ) -> ResultList:
     """
     Get paginated list of analysis results for a project.
 
     Supports filtering by sentiment, platform, target, and date range.
-    Use search to find specific text in results.
+    Use search to find words in results, or set substring=true to match
+    any part of the text.
     """
     # Verify project ownership
     await project_repo.get_project(project_id, current_user.id)
@@ -53,6 +62,8 @@ async def list_results(
         platform=platform,
         target_id=target_id,
         search=search,
+        substring_search=substring,
+        sort_by_relevance=sort_by_relevance,
         date_from=date_from,
         date_to=date_to,
     )
@@ -63,6 +74,7 @@ async def list_results(
         filters=filters,
         page=page,
         page_size=page_size,
+        include_total=include_total,
     )
 
 
@@ -215,41 +227,30 @@ async def export_results(
     # Verify project ownership
     project = await project_repo.get_project(project_id, current_user.id)
 
-    results = await result_repo.export_results(
-        project_id=project_id,
-        user_id=current_user.id,
-        format=format,
-    )
-
-    # Helper function to flatten results
-    def flatten_results(results_data: list) -> list[dict]:
-        flat_results = []
-        for r in results_data:
-            flat = {
-                "id": r.get("id"),
-                "platform": r.get("platform"),
-                "text": r.get("content", {}).get("text"),
-                "title": r.get("content", {}).get("title"),
-                "author": r.get("content", {}).get("author"),
-                "rating": r.get("content", {}).get("rating"),
-                "date": r.get("content", {}).get("date"),
-                "url": r.get("content", {}).get("url"),
-                "sentiment_label": r.get("analysis", {}).get("sentiment", {}).get("label"),
-                "sentiment_score": r.get("analysis", {}).get("sentiment", {}).get("score"),
-                "sentiment_confidence": r.get("analysis", {}).get("sentiment", {}).get("confidence"),
-                "primary_emotion": r.get("analysis", {}).get("emotions", {}).get("primary"),
-                "emotion_scores": str(r.get("analysis", {}).get("emotions", {}).get("scores", {})),
-                "created_at": r.get("created_at"),
-            }
-            flat_results.append(flat)
-        return flat_results
+    # Helper function to flatten a result
+    def flatten_result(r: dict) -> dict:
+        return {
+            "id": r.get("id"),
+            "platform": r.get("platform"),
+            "text": r.get("content", {}).get("text"),
+            "title": r.get("content", {}).get("title"),
+            "author": r.get("content", {}).get("author"),
+            "rating": r.get("content", {}).get("rating"),
+            "date": r.get("content", {}).get("date"),
+            "url": r.get("content", {}).get("url"),
+            "sentiment_label": r.get("analysis", {}).get("sentiment", {}).get("label"),
+            "sentiment_score": r.get("analysis", {}).get("sentiment", {}).get("score"),
+            "sentiment_confidence": r.get("analysis", {}).get("sentiment", {}).get("confidence"),
+            "primary_emotion": r.get("analysis", {}).get("emotions", {}).get("primary"),
+            "emotion_scores": str(r.get("analysis", {}).get("emotions", {}).get("scores", {})),
+            "created_at": r.get("created_at"),
+        }
 
     if format == "xlsx":
         # Excel export using openpyxl
         try:
             from openpyxl import Workbook
             from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-            from openpyxl.utils.dataframe import dataframe_to_rows
         except ImportError:
             from fastapi import HTTPException
             raise HTTPException(
@@ -285,9 +286,21 @@ async def export_results(
             cell.alignment = Alignment(horizontal="center")
             cell.border = thin_border
 
-        # Data rows
-        flat_results = flatten_results(results)
-        for row_idx, result in enumerate(flat_results, 2):
+        # Data rows and summary stats, collected in a single pass
+        total_results = 0
+        sentiment_counts = {"positive": 0, "neutral": 0, "negative": 0}
+        platform_counts = {}
+        total_score = 0
+        score_count = 0
+
+        row_idx = 1
+        async for r in result_repo.export_results(
+            project_id=project_id,
+            user_id=current_user.id,
+            projection=EXPORT_COLUMNS_PROJECTION,
+        ):
+            row_idx += 1
+            result = flatten_result(r)
             ws_results.cell(row=row_idx, column=1, value=result.get("id"))
             ws_results.cell(row=row_idx, column=2, value=result.get("platform"))
             ws_results.cell(row=row_idx, column=3, value=result.get("title"))
@@ -302,6 +315,20 @@ async def export_results(
             ws_results.cell(row=row_idx, column=12, value=result.get("primary_emotion"))
             ws_results.cell(row=row_idx, column=13, value=str(result.get("created_at", "")))
 
+            total_results += 1
+
+            sentiment = result.get("sentiment_label") or "unknown"
+            if sentiment in sentiment_counts:
+                sentiment_counts[sentiment] += 1
+
+            platform = r.get("platform", "unknown")
+            platform_counts[platform] = platform_counts.get(platform, 0) + 1
+
+            score = result.get("sentiment_score")
+            if score is not None:
+                total_score += score
+                score_count += 1
+
         # Auto-adjust column widths
         for col in ws_results.columns:
             max_length = 0
@@ -317,26 +344,6 @@ async def export_results(
         # Sheet 2: Summary Statistics
         ws_summary = wb.create_sheet("Summary")
 
-        # Calculate summary stats
-        total_results = len(results)
-        sentiment_counts = {"positive": 0, "neutral": 0, "negative": 0}
-        platform_counts = {}
-        total_score = 0
-        score_count = 0
-
-        for r in results:
-            sentiment = r.get("analysis", {}).get("sentiment", {}).get("label", "unknown")
-            if sentiment in sentiment_counts:
-                sentiment_counts[sentiment] += 1
-
-            platform = r.get("platform", "unknown")
-            platform_counts[platform] = platform_counts.get(platform, 0) + 1
-
-            score = r.get("analysis", {}).get("sentiment", {}).get("score")
-            if score is not None:
-                total_score += score
-                score_count += 1
-
         avg_score = total_score / score_count if score_count > 0 else 0
 
         # Write summary
@@ -378,15 +385,25 @@ async def export_results(
         )
 
     if format == "csv":
-        output = io.StringIO()
-        if results:
-            flat_results = flatten_results(results)
-            writer = csv.DictWriter(output, fieldnames=flat_results[0].keys())
-            writer.writeheader()
-            writer.writerows(flat_results)
+        async def stream_csv() -> AsyncIterator[str]:
+            buffer = io.StringIO()
+            writer = None
+            async for r in result_repo.export_results(
+                project_id=project_id,
+                user_id=current_user.id,
+                projection=EXPORT_COLUMNS_PROJECTION,
+            ):
+                flat = flatten_result(r)
+                if writer is None:
+                    writer = csv.DictWriter(buffer, fieldnames=flat.keys())
+                    writer.writeheader()
+                writer.writerow(flat)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
 
         return StreamingResponse(
-            iter([output.getvalue()]),
+            stream_csv(),
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename={project.name}_results.csv"
@@ -394,8 +411,19 @@ async def export_results(
         )
 
     # Default JSON
+    async def stream_json() -> AsyncIterator[str]:
+        yield "["
+        separator = "\n"
+        async for r in result_repo.export_results(
+            project_id=project_id,
+            user_id=current_user.id,
+        ):
+            yield separator + json.dumps(r, default=str, indent=2)
+            separator = ",\n"
+        yield "\n]"
+
     return StreamingResponse(
-        iter([json.dumps(results, default=str, indent=2)]),
+        stream_json(),
         media_type="application/json",
         headers={
             "Content-Disposition": f"attachment; filename={project.name}_results.json"
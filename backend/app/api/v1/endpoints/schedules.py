@@ -4,7 +4,6 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, status
 
-from app.core.database import get_database
 from app.core.deps import get_current_user
 from app.models.schedule import (
     Schedule,
@@ -16,7 +15,7 @@ from app.models.schedule import (
 from app.models.user import User
 from app.repositories.project import ProjectRepository, get_project_repository
 from app.repositories.schedule import ScheduleRepository, get_schedule_repository
-from app.services.scheduler import get_scheduler
+from app.services.scheduler import SchedulerService, get_scheduler
 
 router = APIRouter()
 
@@ -47,6 +46,7 @@ async def create_schedule(
     current_user: Annotated[User, Depends(get_current_user)],
     project_repo: Annotated[ProjectRepository, Depends(get_project_repository)],
     schedule_repo: Annotated[ScheduleRepository, Depends(get_schedule_repository)],
+    scheduler: Annotated[SchedulerService, Depends(get_scheduler)],
 ) -> Schedule:
     """
     Create a new schedule for a project.
@@ -63,10 +63,12 @@ async def create_schedule(
     # Verify project ownership
     await project_repo.get_project(schedule_data.project_id, current_user.id)
 
-    return await schedule_repo.create_schedule(
+    schedule = await schedule_repo.create_schedule(
         user_id=current_user.id,
         schedule_data=schedule_data,
     )
+    scheduler.notify()
+    return schedule
 
 
 @router.get(
@@ -100,6 +102,7 @@ async def update_schedule(
     current_user: Annotated[User, Depends(get_current_user)],
     project_repo: Annotated[ProjectRepository, Depends(get_project_repository)],
     schedule_repo: Annotated[ScheduleRepository, Depends(get_schedule_repository)],
+    scheduler: Annotated[SchedulerService, Depends(get_scheduler)],
 ) -> Schedule:
     """
     Update the schedule for a project.
@@ -109,11 +112,13 @@ async def update_schedule(
     # Verify project ownership
     await project_repo.get_project(project_id, current_user.id)
 
-    return await schedule_repo.update_schedule(
+    schedule = await schedule_repo.update_schedule(
         project_id=project_id,
         user_id=current_user.id,
         update_data=update_data,
     )
+    scheduler.notify()
+    return schedule
 
 
 @router.delete(
@@ -145,7 +150,7 @@ async def run_schedule_now(
     project_id: str,
     current_user: Annotated[User, Depends(get_current_user)],
     project_repo: Annotated[ProjectRepository, Depends(get_project_repository)],
-    db=Depends(get_database),
+    scheduler: Annotated[SchedulerService, Depends(get_scheduler)],
 ) -> dict:
     """
     Manually trigger a scheduled scrape job immediately.
@@ -153,7 +158,6 @@ async def run_schedule_now(
     # Verify project ownership
     await project_repo.get_project(project_id, current_user.id)
 
-    scheduler = await get_scheduler(db)
     job_id = await scheduler.run_now(project_id, current_user.id)
 
     return {"job_id": job_id, "message": "Scrape job started"}
@@ -171,6 +175,7 @@ async def get_schedule_history(
     schedule_repo: Annotated[ScheduleRepository, Depends(get_schedule_repository)],
     page: int = 1,
     page_size: int = 20,
+    include_total: bool = True,
 ) -> ScheduleExecutionList:
     """
     Get execution history for a schedule.
@@ -185,6 +190,7 @@ async def get_schedule_history(
         schedule_id=schedule.id,
         page=page,
         page_size=page_size,
+        include_total=include_total,
     )
 
 
@@ -198,6 +204,7 @@ async def toggle_schedule(
     current_user: Annotated[User, Depends(get_current_user)],
     project_repo: Annotated[ProjectRepository, Depends(get_project_repository)],
     schedule_repo: Annotated[ScheduleRepository, Depends(get_schedule_repository)],
+    scheduler: Annotated[SchedulerService, Depends(get_scheduler)],
 ) -> Schedule:
     """
     Toggle a schedule on/off.
@@ -207,8 +214,10 @@ async def toggle_schedule(
 
     schedule = await schedule_repo.get_schedule(project_id, current_user.id)
 
-    return await schedule_repo.update_schedule(
+    schedule = await schedule_repo.update_schedule(
         project_id=project_id,
         user_id=current_user.id,
         update_data=ScheduleUpdate(enabled=not schedule.enabled),
     )
+    scheduler.notify()
+    return schedule
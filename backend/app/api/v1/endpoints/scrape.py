@@ -4,7 +4,6 @@ from typing import Annotated
 
 from fastapi import APIRouter, BackgroundTasks, Depends, Query, status
 
-from app.core.database import get_database
 from app.core.deps import get_current_user
 from app.models.scrape_job import (
     ScrapeJob,
@@ -14,7 +13,7 @@ from app.models.scrape_job import (
 from app.models.user import User
 from app.repositories.project import ProjectRepository, get_project_repository
 from app.repositories.scrape_job import ScrapeJobRepository, get_scrape_job_repository
-from app.services.scrape_executor import get_job_queue
+from app.services.scrape_executor import JobQueue, get_job_queue
 
 router = APIRouter()
 
@@ -32,7 +31,7 @@ async def start_scrape(
     current_user: Annotated[User, Depends(get_current_user)],
     project_repo: Annotated[ProjectRepository, Depends(get_project_repository)],
     job_repo: Annotated[ScrapeJobRepository, Depends(get_scrape_job_repository)],
-    db=Depends(get_database),
+    job_queue: Annotated[JobQueue, Depends(get_job_queue)],
 ) -> ScrapeJob:
     """
     Start a new scrape job for a project.
@@ -55,7 +54,6 @@ async def start_scrape(
     )
 
     # Enqueue job for background processing
-    job_queue = await get_job_queue(db)
     await job_queue.enqueue(job, project)
 
     return job
@@ -122,7 +120,7 @@ async def cancel_scrape_job(
     current_user: Annotated[User, Depends(get_current_user)],
     project_repo: Annotated[ProjectRepository, Depends(get_project_repository)],
     job_repo: Annotated[ScrapeJobRepository, Depends(get_scrape_job_repository)],
-    db=Depends(get_database),
+    job_queue: Annotated[JobQueue, Depends(get_job_queue)],
 ) -> ScrapeJob:
     """
     Cancel a running or queued scrape job.
@@ -131,7 +129,6 @@ async def cancel_scrape_job(
     await project_repo.get_project(project_id, current_user.id)
 
     # Try to cancel in job queue
-    job_queue = await get_job_queue(db)
     await job_queue.cancel_job(job_id)
 
     # Update status in database
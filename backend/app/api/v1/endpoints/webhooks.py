@@ -1,8 +1,9 @@
 """Webhook endpoints."""
 
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.core.database import get_database
 from app.core.deps import get_current_user
@@ -15,6 +16,7 @@ from app.models.webhook import (
     WebhookTestResult,
     WebhookUpdate,
 )
+from app.repositories.base import object_id
 from app.repositories.webhook import WebhookRepository, get_webhook_repository
 from app.services.webhook_service import WebhookService
 
@@ -161,12 +163,25 @@ async def get_webhook_deliveries(
     webhook_repo: Annotated[WebhookRepository, Depends(get_webhook_repository)],
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    before: datetime | None = Query(
+        None, description="Keyset cursor: delivered_at of the last item seen"
+    ),
+    before_id: str | None = Query(
+        None, description="Keyset cursor: id of the last item seen, sent with before"
+    ),
+    include_total: bool = Query(True, description="Count all deliveries"),
 ) -> WebhookDeliveryList:
     """
     Get delivery history for a webhook.
 
     Shows recent delivery attempts with status codes, response times, and errors.
     """
+    if (before is None) != (before_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="before and before_id must be given together",
+        )
+
     # Verify ownership
     await webhook_repo.get_webhook(webhook_id, current_user.id)
 
@@ -174,6 +189,8 @@ async def get_webhook_deliveries(
         webhook_id=webhook_id,
         page=page,
         page_size=page_size,
+        before=(before, object_id(before_id)) if before is not None else None,
+        include_total=include_total,
     )
 
 
@@ -30,6 +30,11 @@ class Settings(BaseSettings):
     # MongoDB
     mongodb_url: str = Field(default="mongodb://localhost:27017")
     mongodb_db_name: str = Field(default="sentimatrix_studio")
+    # Size the pool at roughly 1.2x the expected concurrent requests
+    mongodb_max_pool_size: int = Field(default=100)
+    mongodb_min_pool_size: int = Field(default=10)
+    mongodb_wait_queue_timeout_ms: int = Field(default=2000)
+    mongodb_compressors: str = Field(default="zstd,snappy,zlib")
 
     @field_validator("mongodb_url")
     @classmethod
@@ -73,6 +78,10 @@ class Settings(BaseSettings):
     sentimatrix_default_llm_provider: str = Field(default="groq")
     sentimatrix_default_llm_model: str = Field(default="llama-3.3-70b-versatile")
 
+    # Language detection (Optional): path to a fastText language ID model
+    # such as lid.176.ftz; results are stored without a language when unset
+    language_model_path: str | None = Field(default=None)
+
     # OAuth2 (Optional)
     google_client_id: str | None = Field(default=None)
     google_client_secret: str | None = Field(default=None)
@@ -1,9 +1,10 @@
 """Rate limiting middleware and utilities."""
 
+import asyncio
 import time
 from collections import defaultdict
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import Callable, Optional
 
 from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
@@ -103,6 +104,76 @@ class RateLimiter:
             del self._clients[client_key]
 
 
+class AsyncTokenBucket:
+    """Token bucket for outbound calls that waits for capacity instead of rejecting.
+
+    Holds up to ``max_rate`` tokens and refills at ``max_rate / time_period``
+    tokens per second. Waiters are served in arrival order.
+
+    Usage:
+        limiter = AsyncTokenBucket(max_rate=1, time_period=2.0)
+        async with limiter:
+            await client.get(url)
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._refill_rate = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._last_refill = time.monotonic()
+        # Monotonic time of the last acquire, or of creation
+        self.last_used = self._last_refill
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.max_rate, self._tokens + (now - self._last_refill) * self._refill_rate
+        )
+        self._last_refill = now
+
+    def is_full(self) -> bool:
+        """Whether the bucket holds max_rate tokens, i.e. is as good as new."""
+        self._refill()
+        return self._tokens >= self.max_rate
+
+    def try_acquire(self) -> bool:
+        """Take one token if one is available now, without waiting."""
+        self.last_used = time.monotonic()
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def set_max_rate(self, max_rate: float) -> None:
+        """Change the capacity, keeping the tokens already taken spent."""
+        self._refill()
+        spent = self.max_rate - self._tokens
+        self.max_rate = max_rate
+        self._refill_rate = max_rate / self.time_period
+        self._tokens = max(0.0, max_rate - spent)
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        async with self._lock:
+            self.last_used = time.monotonic()
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._refill_rate)
+                self._refill()
+            self._tokens -= 1
+
+    async def __aenter__(self) -> "AsyncTokenBucket":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        return None
+
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """Rate limiting middleware."""
 
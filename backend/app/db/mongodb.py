@@ -3,19 +3,168 @@
 from typing import Any
 
 import structlog
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from pymongo import ASCENDING, DESCENDING, TEXT, AsyncMongoClient, IndexModel
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import ConnectionFailure, OperationFailure, ServerSelectionTimeoutError
 
 from app.core.config import get_settings
 
 logger = structlog.get_logger(__name__)
 
+# Indexes backing repository queries, created in one batch per collection
+INDEXES: dict[str, list[IndexModel]] = {
+    "users": [
+        IndexModel("email", unique=True),
+        IndexModel("created_at"),
+    ],
+    "projects": [
+        IndexModel("user_id"),
+        IndexModel("status"),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("name", TEXT), ("description", TEXT)]),
+        IndexModel(
+            "config.schedule.next_run_at",
+            partialFilterExpression={"config.schedule.enabled": True, "status": "active"},
+        ),
+    ],
+    "targets": [
+        IndexModel("project_id"),
+        IndexModel([("project_id", ASCENDING), ("platform", ASCENDING)]),
+        IndexModel(
+            [("project_id", ASCENDING), ("user_id", ASCENDING), ("created_at", DESCENDING)]
+        ),
+        IndexModel(
+            [
+                ("project_id", ASCENDING),
+                ("user_id", ASCENDING),
+                ("status", ASCENDING),
+                ("created_at", DESCENDING),
+            ]
+        ),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING)]),
+    ],
+    "results": [
+        IndexModel("project_id"),
+        IndexModel("target_id"),
+        IndexModel("sentiment"),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("project_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel(
+            [("project_id", ASCENDING), ("user_id", ASCENDING), ("created_at", DESCENDING)]
+        ),
+        IndexModel(
+            [("target_id", ASCENDING), ("user_id", ASCENDING), ("created_at", DESCENDING)]
+        ),
+        IndexModel(
+            [("scrape_job_id", ASCENDING), ("user_id", ASCENDING), ("created_at", DESCENDING)]
+        ),
+        IndexModel(
+            [
+                ("project_id", ASCENDING),
+                ("user_id", ASCENDING),
+                ("analysis.sentiment.label", ASCENDING),
+            ]
+        ),
+        IndexModel([("project_id", ASCENDING), ("user_id", ASCENDING), ("platform", ASCENDING)]),
+        IndexModel(
+            [("project_id", ASCENDING), ("user_id", ASCENDING), ("content.date", ASCENDING)]
+        ),
+        IndexModel(
+            [
+                ("project_id", ASCENDING),
+                ("user_id", ASCENDING),
+                ("analysis.emotions.detected.emotion", ASCENDING),
+            ]
+        ),
+        IndexModel(
+            [("content.text", TEXT), ("content.title", TEXT)],
+            weights={"content.title": 5, "content.text": 1},
+        ),
+    ],
+    "results_daily_rollup": [
+        IndexModel([("_id.project_id", ASCENDING), ("_id.user_id", ASCENDING)]),
+        IndexModel([("_id.target_id", ASCENDING), ("_id.user_id", ASCENDING)]),
+        IndexModel("refreshed_at"),
+    ],
+    "schedules": [
+        IndexModel([("enabled", ASCENDING), ("next_run", ASCENDING)]),
+    ],
+    "schedule_executions": [
+        IndexModel([("schedule_id", ASCENDING), ("started_at", DESCENDING)]),
+    ],
+    "scrape_jobs": [
+        IndexModel("project_id"),
+        IndexModel("status"),
+        IndexModel([("project_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel(
+            [("project_id", ASCENDING), ("user_id", ASCENDING), ("created_at", DESCENDING)]
+        ),
+        IndexModel(
+            [
+                ("project_id", ASCENDING),
+                ("user_id", ASCENDING),
+                ("status", ASCENDING),
+                ("created_at", DESCENDING),
+            ]
+        ),
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel(
+            [
+                ("project_id", ASCENDING),
+                ("user_id", ASCENDING),
+                ("status", ASCENDING),
+                ("completed_at", DESCENDING),
+            ]
+        ),
+    ],
+    "scrape_job_targets": [
+        IndexModel([("job_id", ASCENDING), ("target_id", ASCENDING)], unique=True),
+        IndexModel([("job_id", ASCENDING), ("status", ASCENDING)]),
+    ],
+    "api_keys": [
+        IndexModel("user_id"),
+        IndexModel("key_hash", unique=True),
+        IndexModel([("user_id", ASCENDING), ("provider", ASCENDING)], unique=True),
+    ],
+    "presets": [
+        IndexModel(
+            [("user_id", ASCENDING), ("name", ASCENDING)],
+            unique=True,
+            name="uniq_preset_name_per_user",
+        ),
+    ],
+    "webhooks": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel(
+            [
+                ("user_id", ASCENDING),
+                ("enabled", ASCENDING),
+                ("events", ASCENDING),
+                ("project_id", ASCENDING),
+            ]
+        ),
+    ],
+    "webhook_deliveries": [
+        IndexModel(
+            [("webhook_id", ASCENDING), ("delivered_at", DESCENDING), ("_id", DESCENDING)]
+        ),
+    ],
+    "refresh_tokens": [
+        IndexModel("user_id"),
+        IndexModel("token_hash", unique=True),
+        IndexModel("expires_at", expireAfterSeconds=0),
+    ],
+}
+
 
 class MongoDB:
     """MongoDB connection manager with connection pooling and lifecycle management."""
 
-    _client: AsyncIOMotorClient | None = None
-    _database: AsyncIOMotorDatabase | None = None
+    _client: AsyncMongoClient | None = None
+    _database: AsyncDatabase | None = None
 
     @classmethod
     async def connect(cls) -> None:
@@ -33,10 +182,13 @@ class MongoDB:
         )
 
         try:
-            cls._client = AsyncIOMotorClient(
+            cls._client = AsyncMongoClient(
                 settings.mongodb_url,
-                maxPoolSize=50,
-                minPoolSize=10,
+                maxPoolSize=settings.mongodb_max_pool_size,
+                minPoolSize=settings.mongodb_min_pool_size,
+                waitQueueTimeoutMS=settings.mongodb_wait_queue_timeout_ms,
+                compressors=settings.mongodb_compressors,
+                retryWrites=True,
                 maxIdleTimeMS=30000,
                 serverSelectionTimeoutMS=5000,
                 connectTimeoutMS=10000,
@@ -63,13 +215,13 @@ class MongoDB:
         """Close MongoDB connection."""
         if cls._client is not None:
             logger.info("Closing MongoDB connection")
-            cls._client.close()
+            await cls._client.close()
             cls._client = None
             cls._database = None
             logger.info("MongoDB connection closed")
 
     @classmethod
-    def get_database(cls) -> AsyncIOMotorDatabase:
+    def get_database(cls) -> AsyncDatabase:
         """Get the database instance."""
         if cls._database is None:
             raise RuntimeError("MongoDB is not connected. Call MongoDB.connect() first.")
@@ -88,47 +240,41 @@ class MongoDB:
 
         logger.info("Creating database indexes")
 
-        # Users collection indexes
-        users = cls._database["users"]
-        await users.create_index("email", unique=True)
-        await users.create_index("created_at")
-
-        # Projects collection indexes
-        projects = cls._database["projects"]
-        await projects.create_index("user_id")
-        await projects.create_index("status")
-        await projects.create_index([("user_id", 1), ("created_at", -1)])
-
-        # Targets collection indexes
-        targets = cls._database["targets"]
-        await targets.create_index("project_id")
-        await targets.create_index([("project_id", 1), ("platform", 1)])
-
-        # Results collection indexes
-        results = cls._database["results"]
-        await results.create_index("project_id")
-        await results.create_index("target_id")
-        await results.create_index("sentiment")
-        await results.create_index([("project_id", 1), ("created_at", -1)])
-
-        # Scrape jobs collection indexes
-        scrape_jobs = cls._database["scrape_jobs"]
-        await scrape_jobs.create_index("project_id")
-        await scrape_jobs.create_index("status")
-        await scrape_jobs.create_index([("project_id", 1), ("created_at", -1)])
-
-        # API keys collection indexes
-        api_keys = cls._database["api_keys"]
-        await api_keys.create_index("user_id")
-        await api_keys.create_index("key_hash", unique=True)
-
-        # Refresh tokens collection indexes
-        refresh_tokens = cls._database["refresh_tokens"]
-        await refresh_tokens.create_index("user_id")
-        await refresh_tokens.create_index("token_hash", unique=True)
-        await refresh_tokens.create_index("expires_at", expireAfterSeconds=0)
-
-        logger.info("Database indexes created successfully")
+        failed = 0
+        for collection_name, indexes in INDEXES.items():
+            try:
+                await cls._database[collection_name].create_indexes(indexes)
+            except OperationFailure:
+                failed += await cls._create_indexes_singly(collection_name, indexes)
+
+        if failed:
+            logger.warning("Database indexes created with failures", failed=failed)
+        else:
+            logger.info("Database indexes created successfully")
+
+    @classmethod
+    async def _create_indexes_singly(cls, collection_name: str, indexes: list[IndexModel]) -> int:
+        """
+        Create a collection's indexes one at a time, logging any that fail.
+
+        One index that cannot be built fails the whole batch, e.g. a unique
+        index over existing duplicates. Building the rest individually keeps
+        the app starting. Returns the number of indexes that failed.
+        """
+        collection = cls._database[collection_name]
+        failed = 0
+        for index in indexes:
+            try:
+                await collection.create_indexes([index])
+            except OperationFailure as e:
+                failed += 1
+                logger.error(
+                    "Failed to create index",
+                    collection=collection_name,
+                    index=index.document["name"],
+                    error=str(e),
+                )
+        return failed
 
     @classmethod
     async def health_check(cls) -> dict[str, Any]:
@@ -147,6 +293,6 @@ class MongoDB:
             return {"status": "error", "healthy": False, "error": str(e)}
 
 
-async def get_database() -> AsyncIOMotorDatabase:
+async def get_database() -> AsyncDatabase:
     """FastAPI dependency to get the database instance."""
     return MongoDB.get_database()
@@ -1,6 +1,6 @@
 """Main FastAPI application entry point."""
 
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import AsyncGenerator
 
 import structlog
@@ -14,6 +14,11 @@ from app.core.error_handler import register_exception_handlers
 from app.core.logging import setup_logging
 from app.db.mongodb import MongoDB
 from app.middleware import RequestIDMiddleware
+from app.repositories.project import get_stats_buffer
+from app.repositories.scrape_job import get_job_stats_buffer
+from app.repositories.webhook import get_delivery_buffer
+from app.services.scheduler import SchedulerService
+from app.services.scrape_executor import JobQueue
 
 logger = structlog.get_logger(__name__)
 
@@ -25,13 +30,28 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     setup_logging()
     logger.info("Starting Sentimatrix Studio", version=__version__)
 
-    await MongoDB.connect()
-
-    yield
-
-    # Shutdown
-    logger.info("Shutting down Sentimatrix Studio")
-    await MongoDB.disconnect()
+    # Each step registers its shutdown as soon as it has started, so a
+    # failure part-way through startup still stops what was already running
+    async with AsyncExitStack() as stack:
+        await MongoDB.connect()
+        stack.push_async_callback(MongoDB.disconnect)
+        for buffer in (get_stats_buffer(), get_job_stats_buffer(), get_delivery_buffer()):
+            await buffer.start()
+            stack.push_async_callback(buffer.stop)
+
+        # Background workers live on app.state so they belong to this event loop
+        db = MongoDB.get_database()
+        app.state.job_queue = JobQueue(db)
+        await app.state.job_queue.start()
+        stack.push_async_callback(app.state.job_queue.stop)
+        app.state.scheduler = SchedulerService(db, app.state.job_queue)
+        await app.state.scheduler.start()
+        stack.push_async_callback(app.state.scheduler.stop)
+
+        yield
+
+        # Shutdown runs the callbacks above in reverse order
+        logger.info("Shutting down Sentimatrix Studio")
 
 
 def create_app() -> FastAPI:
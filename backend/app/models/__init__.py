@@ -23,6 +23,7 @@ from app.models.scrape_job import (
     ScrapeJobCreate,
     ScrapeJobInDB,
     ScrapeJobList,
+    ScrapeJobSummary,
 )
 from app.models.result import (
     Result,
@@ -58,6 +59,7 @@ __all__ = [
     "ScrapeJobCreate",
     "ScrapeJobInDB",
     "ScrapeJobList",
+    "ScrapeJobSummary",
     # Result
     "Result",
     "ResultInDB",
@@ -155,6 +155,7 @@ class LimitsConfig(StudioBaseModel):
     max_reviews_per_target: int = Field(default=100, ge=10, le=1000)
     max_requests_per_day: int = Field(default=500, ge=10, le=10000)
     rate_limit_delay: float = Field(default=1.0, ge=0.1, le=10.0)
+    max_concurrent_targets: int = Field(default=3, ge=1, le=20)
 
 
 class ProjectConfig(StudioBaseModel):
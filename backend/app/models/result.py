@@ -114,7 +114,7 @@ class ResultList(StudioBaseModel):
     """Paginated result list response."""
 
     items: list[Result]
-    total: int
+    total: int | None = None  # None when the count was skipped
     page: int
     page_size: int
 
@@ -127,6 +127,8 @@ class ResultFilter(StudioBaseModel):
     date_from: datetime | None = None
     date_to: datetime | None = None
     search: str | None = None
+    substring_search: bool = False  # Match search as a substring instead of words
+    sort_by_relevance: bool = False  # Order word searches by text score
     target_id: str | None = None
 
 
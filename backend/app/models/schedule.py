@@ -96,6 +96,6 @@ class ScheduleExecutionList(StudioBaseModel):
     """Paginated schedule execution list."""
 
     items: list[ScheduleExecution]
-    total: int
+    total: int | None = None  # None when the count was skipped
     page: int
     page_size: int
@@ -61,6 +61,16 @@ class ScrapeJob(MongoBaseModel, TimestampMixin):
     error_message: str | None = None
 
 
+class ScrapeJobSummary(MongoBaseModel):
+    """Fields of a scrape job needed to schedule it."""
+
+    project_id: str
+    user_id: str
+    status: Literal["queued", "running", "completed", "failed", "cancelled"] = "queued"
+    trigger: Literal["manual", "scheduled", "api"] = "manual"
+    created_at: datetime | None = None
+
+
 class ScrapeJobInDB(ScrapeJob):
     """Scrape job model with all database fields."""
 
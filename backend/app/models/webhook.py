@@ -1,18 +1,34 @@
 """Webhook model definitions."""
 
 from datetime import datetime
-from typing import Any, Literal
+from typing import Annotated, Any, Literal
 
-from pydantic import Field, HttpUrl, field_validator
+from pydantic import AfterValidator, Field, HttpUrl
 
 from app.models.base import MongoBaseModel, StudioBaseModel, TimestampMixin
 
+# Event types a webhook can subscribe to, checked by pydantic-core
+WebhookEvent = Literal[
+    "job.started",
+    "job.completed",
+    "job.failed",
+    "analysis.completed",
+    "schedule.triggered",
+    "schedule.failed",
+    "target.added",
+    "target.error",
+]
+
+# http(s) URL checked by pydantic-core's URL parser, kept as a plain string so
+# it can be stored in MongoDB and compared without conversion.
+WebhookUrl = Annotated[HttpUrl, AfterValidator(str)]
+
 
 class WebhookCreate(StudioBaseModel):
     """Model for creating a webhook."""
 
-    url: str
-    events: list[str] = Field(
+    url: WebhookUrl
+    events: list[WebhookEvent] = Field(
         default_factory=lambda: ["job.completed"],
         description="Events to trigger webhook",
     )
@@ -20,39 +36,12 @@ class WebhookCreate(StudioBaseModel):
     enabled: bool = True
     headers: dict[str, str] = Field(default_factory=dict)
 
-    @field_validator("url")
-    @classmethod
-    def validate_url(cls, v: str) -> str:
-        """Validate URL format."""
-        if not v.startswith(("http://", "https://")):
-            raise ValueError("URL must start with http:// or https://")
-        return v
-
-    @field_validator("events")
-    @classmethod
-    def validate_events(cls, v: list[str]) -> list[str]:
-        """Validate event types."""
-        valid_events = {
-            "job.started",
-            "job.completed",
-            "job.failed",
-            "analysis.completed",
-            "schedule.triggered",
-            "schedule.failed",
-            "target.added",
-            "target.error",
-        }
-        for event in v:
-            if event not in valid_events:
-                raise ValueError(f"Invalid event: {event}. Valid events: {valid_events}")
-        return v
-
 
 class WebhookUpdate(StudioBaseModel):
     """Model for updating a webhook."""
 
-    url: str | None = None
-    events: list[str] | None = None
+    url: WebhookUrl | None = None
+    events: list[WebhookEvent] | None = None
     secret: str | None = None
     enabled: bool | None = None
     headers: dict[str, str] | None = None
@@ -104,7 +93,7 @@ class WebhookDeliveryList(StudioBaseModel):
     """Paginated webhook delivery list."""
 
     items: list[WebhookDelivery]
-    total: int
+    total: int | None = None  # None when the count was skipped
     page: int
     page_size: int
 
@@ -5,7 +5,7 @@ from typing import Any
 
 from bson import ObjectId
 from fastapi import Depends, HTTPException, status
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.core.database import get_database
 from app.core.encryption import encrypt_api_key, decrypt_api_key, mask_api_key, hash_api_key
@@ -24,7 +24,7 @@ class APIKeyRepository(BaseRepository):
     collection_name = "api_keys"
     model_class = APIKey
 
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncDatabase):
         super().__init__()
 
     async def create_api_key(
@@ -161,16 +161,19 @@ class APIKeyRepository(BaseRepository):
 
     async def get_configured_providers(self, user_id: str) -> list[str]:
         """Get list of providers that user has configured."""
-        cursor = self.collection.find(
-            {"user_id": user_id},
-            {"provider": 1},
-        )
-        keys = await cursor.to_list(length=None)
-        return [k["provider"] for k in keys]
+        return await self.collection.distinct("provider", {"user_id": user_id})
+
+
+# Shared repository instances keyed by database identity
+_api_key_repositories: dict[int, APIKeyRepository] = {}
 
 
 def get_api_key_repository(
-    db: AsyncIOMotorDatabase = Depends(get_database),
+    db: AsyncDatabase = Depends(get_database),
 ) -> APIKeyRepository:
-    """Dependency for getting API key repository."""
-    return APIKeyRepository(db)
+    """Dependency for getting the shared API key repository."""
+    repo = _api_key_repositories.get(id(db))
+    if repo is None:
+        _api_key_repositories.clear()
+        repo = _api_key_repositories[id(db)] = APIKeyRepository(db)
+    return repo
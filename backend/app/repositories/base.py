@@ -1,15 +1,280 @@
 """Base repository with common CRUD operations."""
 
-from datetime import datetime
-from typing import Any, Generic, TypeVar
+import asyncio
+from collections import Counter, defaultdict
+from contextlib import suppress
+from datetime import datetime, timezone
+from functools import cache, lru_cache
+from types import NoneType, UnionType
+from typing import Any, Generic, TypeVar, Union, get_args, get_origin
 
+import structlog
 from bson import ObjectId
-from motor.motor_asyncio import AsyncIOMotorCollection
+from bson.errors import InvalidId
 from pydantic import BaseModel
+from pymongo import UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.errors import BulkWriteError
 
+from app.core.exceptions import ValidationError
 from app.db.mongodb import MongoDB
 
+logger = structlog.get_logger(__name__)
+
 T = TypeVar("T", bound=BaseModel)
+M = TypeVar("M", bound=BaseModel)
+
+
+@lru_cache(maxsize=1024)
+def object_id(value: str) -> ObjectId:
+    """Parse a client-supplied ID, rejecting malformed IDs with a 400."""
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        raise ValidationError("Invalid id") from None
+
+
+def _model_type(annotation: Any) -> tuple[type[BaseModel] | None, bool]:
+    """Find the model class held by a field annotation, and whether it is a list."""
+    origin = get_origin(annotation)
+    if origin is list:
+        model, _ = _model_type(get_args(annotation)[0])
+        return model, model is not None
+    if origin in (Union, UnionType):
+        for arg in get_args(annotation):
+            if arg is not NoneType:
+                model, many = _model_type(arg)
+                if model is not None:
+                    return model, many
+        return None, False
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+@cache
+def _nested_models(model_class: type[BaseModel]) -> dict[str, tuple[type[BaseModel], bool]]:
+    """Map each field of model_class holding models to that model class."""
+    nested = {}
+    for name, field in model_class.model_fields.items():
+        model, many = _model_type(field.annotation)
+        if model is not None:
+            nested[name] = (model, many)
+    return nested
+
+
+def construct_model(model_class: type[T], data: dict[str, Any]) -> T:
+    """Build a model and its nested models from trusted data without validation."""
+    values = dict(data)
+    for name, (model, many) in _nested_models(model_class).items():
+        value = values.get(name)
+        if many and isinstance(value, list):
+            values[name] = [
+                construct_model(model, item) if isinstance(item, dict) else item
+                for item in value
+            ]
+        elif isinstance(value, dict):
+            values[name] = construct_model(model, value)
+    return model_class.model_construct(**values)
+
+
+class StatsBuffer:
+    """Coalesces stats counter increments into periodic bulk writes."""
+
+    def __init__(
+        self,
+        collection_name: str,
+        flush_interval: float = 0.1,
+        touch_updated_at: bool = False,
+    ) -> None:
+        self.collection_name = collection_name
+        self.flush_interval = flush_interval
+        # Also stamp updated_at server-side on every flushed document
+        self.touch_updated_at = touch_updated_at
+        self._pending: defaultdict[ObjectId, Counter[str]] = defaultdict(Counter)
+        self._stopping = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flush task is active."""
+        return self._task is not None
+
+    def add(self, doc_id: ObjectId, field: str, amount: int = 1) -> None:
+        """Queue an increment for the next flush."""
+        self._pending[doc_id][f"stats.{field}"] += amount
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None:
+            # A fresh event binds to the loop now running, so the buffer can
+            # be restarted after a previous loop has closed
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write any pending increments.
+
+        The task is asked to exit rather than cancelled, so a flush already
+        in flight finishes instead of losing the increments it took.
+        """
+        if self._task:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush_now()
+
+    async def flush_now(self) -> None:
+        """Write all pending increments in one unordered bulk write.
+
+        If the write fails outright the increments are merged back into the
+        pending map for the next flush. Per-document write errors are not
+        retryable and are dropped.
+        """
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, defaultdict(Counter)
+        operations = []
+        for doc_id, increments in pending.items():
+            inc = {path: amount for path, amount in increments.items() if amount}
+            if not inc:
+                continue
+            update: dict[str, Any] = {"$inc": inc}
+            if self.touch_updated_at:
+                update["$currentDate"] = {"updated_at": True}
+            operations.append(UpdateOne({"_id": doc_id}, update))
+
+        if not operations:
+            return
+        try:
+            await MongoDB.get_collection(self.collection_name).bulk_write(
+                operations, ordered=False
+            )
+        except BulkWriteError:
+            raise
+        except BaseException:
+            for doc_id, increments in pending.items():
+                self._pending[doc_id].update(increments)
+            raise
+
+    async def _run(self) -> None:
+        """Flush pending increments every interval until stopped."""
+        while not self._stopping.is_set():
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stopping.wait(), self.flush_interval)
+            try:
+                await self.flush_now()
+            except Exception as e:
+                logger.error(
+                    "Failed to flush stats",
+                    collection=self.collection_name,
+                    error=str(e),
+                )
+
+
+class InsertBuffer:
+    """Collects documents and writes them with periodic insert_many calls."""
+
+    def __init__(
+        self,
+        collection_name: str,
+        max_batch: int = 500,
+        flush_interval: float = 0.1,
+    ) -> None:
+        self.collection_name = collection_name
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._pending: list[dict[str, Any]] = []
+        self._full = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flush task is active."""
+        return self._task is not None
+
+    def add(self, doc: dict[str, Any]) -> None:
+        """Queue a document for the next flush."""
+        self._pending.append(doc)
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None:
+            # Fresh events bind to the loop now running, so the buffer can be
+            # restarted after a previous loop has closed
+            full = self._full.is_set()
+            self._full, self._stopping = asyncio.Event(), asyncio.Event()
+            if full:
+                self._full.set()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write any pending documents.
+
+        The task is asked to exit rather than cancelled, so a flush already
+        in flight finishes instead of losing the batch it took.
+        """
+        if self._task:
+            self._stopping.set()
+            self._full.set()
+            await self._task
+            self._task = None
+        await self.flush_now()
+
+    async def flush_now(self) -> None:
+        """Write all pending documents in unordered batches of max_batch.
+
+        If a batch fails outright, it and the batches after it go back to
+        the front of the queue for the next flush. Per-document write errors,
+        such as a duplicate _id from a retried insert, are not retryable
+        and are dropped.
+        """
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        self._full.clear()
+        collection = MongoDB.get_collection(self.collection_name)
+        for start in range(0, len(pending), self.max_batch):
+            try:
+                await collection.insert_many(
+                    pending[start:start + self.max_batch], ordered=False
+                )
+            except BulkWriteError:
+                if start + self.max_batch < len(pending):
+                    self._requeue(pending[start + self.max_batch:])
+                raise
+            except BaseException:
+                self._requeue(pending[start:])
+                raise
+
+    def _requeue(self, docs: list[dict[str, Any]]) -> None:
+        """Put unwritten documents back ahead of any added since."""
+        self._pending[:0] = docs
+
+    async def _run(self) -> None:
+        """Flush every interval, or as soon as a full batch is waiting."""
+        while not self._stopping.is_set():
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            try:
+                await self.flush_now()
+            except Exception as e:
+                logger.error(
+                    "Failed to flush inserts",
+                    collection=self.collection_name,
+                    error=str(e),
+                )
+                # Back off before retrying requeued documents, even if a
+                # full batch is already waiting
+                self._full.clear()
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._stopping.wait(), self.flush_interval)
 
 
 class BaseRepository(Generic[T]):
@@ -17,21 +282,71 @@ class BaseRepository(Generic[T]):
 
     collection_name: str
     model_class: type[T]
+    # Documents read back from our own collections are trusted, so reads skip
+    # Pydantic validation. Set to True where stored data may be stale or is
+    # stored with types that differ from the model's.
+    validate_reads: bool = False
 
     def __init__(self) -> None:
-        self._collection: AsyncIOMotorCollection | None = None
+        self._collection: AsyncCollection | None = None
 
     @property
-    def collection(self) -> AsyncIOMotorCollection:
-        """Get the MongoDB collection."""
-        if self._collection is None:
-            self._collection = MongoDB.get_collection(self.collection_name)
+    def collection(self) -> AsyncCollection:
+        """Get the MongoDB collection, refreshing it after a reconnect."""
+        database = MongoDB.get_database()
+        if self._collection is None or self._collection.database is not database:
+            self._collection = database[self.collection_name]
         return self._collection
 
+    @staticmethod
+    def _coerce_id(id: str) -> ObjectId | None:
+        """Parse a document ID, returning None if it is not a valid ObjectId."""
+        if id is None:
+            return None
+        try:
+            return ObjectId(id)
+        except (InvalidId, TypeError):
+            return None
+
+    @staticmethod
+    def _doc_to_model(doc: dict[str, Any], model_class: type[M]) -> M:
+        """Build a validated model from a document."""
+        return model_class.model_validate(doc)
+
+    @staticmethod
+    def _doc_to_model_trusted(doc: dict[str, Any], model_class: type[M]) -> M:
+        """Build a model from a document read from our own collection.
+
+        Validation is skipped, so this must not be used for client input.
+        """
+        if "_id" in doc:
+            doc["id"] = str(doc.pop("_id"))
+        return construct_model(model_class, doc)
+
+    async def _collect_trusted(
+        self,
+        cursor: AsyncCursor,
+        model_class: type[M],
+        batch_size: int,
+    ) -> list[M]:
+        """Build models from a cursor as documents arrive, one batch per page."""
+        cursor.batch_size(batch_size)
+        return [self._doc_to_model_trusted(doc, model_class) async for doc in cursor]
+
+    def _construct(self, doc: dict[str, Any]) -> T:
+        """Build a model from a trusted document without validation."""
+        return self._doc_to_model_trusted(doc, self.model_class)
+
+    def _read(self, doc: dict[str, Any]) -> T:
+        """Build a model from a stored document, validating only if configured."""
+        if self.validate_reads:
+            return self.model_class(**doc)
+        return self._construct(doc)
+
     async def create(self, data: dict[str, Any]) -> T:
         """Create a new document."""
-        data["created_at"] = datetime.utcnow()
-        data["updated_at"] = datetime.utcnow()
+        now = datetime.now(timezone.utc)
+        data["created_at"] = data["updated_at"] = now
 
         result = await self.collection.insert_one(data)
         data["_id"] = result.inserted_id
@@ -40,19 +355,20 @@ class BaseRepository(Generic[T]):
 
     async def get_by_id(self, id: str) -> T | None:
         """Get a document by ID."""
-        if not ObjectId.is_valid(id):
+        oid = self._coerce_id(id)
+        if oid is None:
             return None
 
-        doc = await self.collection.find_one({"_id": ObjectId(id)})
+        doc = await self.collection.find_one({"_id": oid})
         if doc:
-            return self.model_class(**doc)
+            return self._read(doc)
         return None
 
     async def get_one(self, filter: dict[str, Any]) -> T | None:
         """Get a single document matching the filter."""
         doc = await self.collection.find_one(filter)
         if doc:
-            return self.model_class(**doc)
+            return self._read(doc)
         return None
 
     async def get_many(
@@ -70,18 +386,25 @@ class BaseRepository(Generic[T]):
             cursor = cursor.sort(sort)
 
         docs = await cursor.to_list(length=limit)
-        return [self.model_class(**doc) for doc in docs]
+        return [self._read(doc) for doc in docs]
 
-    async def update(self, id: str, data: dict[str, Any]) -> T | None:
-        """Update a document by ID."""
-        if not ObjectId.is_valid(id):
+    async def update(
+        self,
+        id: str,
+        data: dict[str, Any],
+        filter: dict[str, Any] | None = None,
+    ) -> T | None:
+        """Update a document by ID, optionally only if it also matches filter."""
+        oid = self._coerce_id(id)
+        if oid is None:
             return None
 
-        data["updated_at"] = datetime.utcnow()
+        # The server stamps updated_at; a client value would conflict with it
+        data.pop("updated_at", None)
 
         result = await self.collection.find_one_and_update(
-            {"_id": ObjectId(id)},
-            {"$set": data},
+            {**(filter or {}), "_id": oid},
+            {"$set": data, "$currentDate": {"updated_at": True}},
             return_document=True,
         )
 
@@ -89,12 +412,13 @@ class BaseRepository(Generic[T]):
             return self.model_class(**result)
         return None
 
-    async def delete(self, id: str) -> bool:
-        """Delete a document by ID."""
-        if not ObjectId.is_valid(id):
+    async def delete(self, id: str, filter: dict[str, Any] | None = None) -> bool:
+        """Delete a document by ID, optionally only if it also matches filter."""
+        oid = self._coerce_id(id)
+        if oid is None:
             return False
 
-        result = await self.collection.delete_one({"_id": ObjectId(id)})
+        result = await self.collection.delete_one({**(filter or {}), "_id": oid})
         return result.deleted_count > 0
 
     async def count(self, filter: dict[str, Any] | None = None) -> int:
@@ -1,6 +1,9 @@
 """Custom preset repository for database operations."""
 
+from functools import lru_cache
+
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
 from app.core.exceptions import NotFoundError, ConflictError
 from app.models.preset import Preset, PresetCreate, PresetUpdate, PresetList
@@ -12,6 +15,8 @@ class PresetRepository(BaseRepository[Preset]):
 
     collection_name = "presets"
     model_class = Preset
+    # user_id is stored as an ObjectId and must be coerced to str on read
+    validate_reads = True
 
     async def create_preset(
         self,
@@ -19,14 +24,6 @@ class PresetRepository(BaseRepository[Preset]):
         preset_data: PresetCreate,
     ) -> Preset:
         """Create a new custom preset."""
-        # Check for duplicate name
-        existing = await self.get_one({
-            "user_id": ObjectId(user_id),
-            "name": preset_data.name,
-        })
-        if existing:
-            raise ConflictError(f"Preset with name '{preset_data.name}' already exists")
-
         data = {
             "user_id": ObjectId(user_id),
             "name": preset_data.name,
@@ -35,7 +32,11 @@ class PresetRepository(BaseRepository[Preset]):
             "is_system": False,
         }
 
-        return await self.create(data)
+        # Name uniqueness per user is enforced by the unique index
+        try:
+            return await self.create(data)
+        except DuplicateKeyError:
+            raise ConflictError(f"Preset with name '{preset_data.name}' already exists")
 
     async def get_preset(self, preset_id: str, user_id: str) -> Preset:
         """Get a preset by ID."""
@@ -76,16 +77,6 @@ class PresetRepository(BaseRepository[Preset]):
         if preset.is_system:
             raise ConflictError("Cannot modify system presets")
 
-        # Check for duplicate name if name is being changed
-        if update_data.name and update_data.name != preset.name:
-            existing = await self.get_one({
-                "user_id": ObjectId(user_id),
-                "name": update_data.name,
-                "_id": {"$ne": ObjectId(preset_id)},
-            })
-            if existing:
-                raise ConflictError(f"Preset with name '{update_data.name}' already exists")
-
         # Build update dict
         update_dict = {}
         if update_data.name is not None:
@@ -98,7 +89,10 @@ class PresetRepository(BaseRepository[Preset]):
         if not update_dict:
             return preset
 
-        updated = await self.update(preset_id, update_dict)
+        try:
+            updated = await self.update(preset_id, update_dict)
+        except DuplicateKeyError:
+            raise ConflictError(f"Preset with name '{update_data.name}' already exists")
         if not updated:
             raise NotFoundError("Preset not found")
 
@@ -135,9 +129,13 @@ class PresetRepository(BaseRepository[Preset]):
             "is_system": False,
         }
 
-        return await self.create(data)
+        try:
+            return await self.create(data)
+        except DuplicateKeyError:
+            raise ConflictError(f"Preset with name '{name}' already exists")
 
 
+@lru_cache(maxsize=1)
 def get_preset_repository() -> PresetRepository:
-    """FastAPI dependency to get preset repository."""
+    """FastAPI dependency to get the shared preset repository."""
     return PresetRepository()
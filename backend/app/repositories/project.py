@@ -1,6 +1,8 @@
 """Project repository for database operations."""
 
+import copy
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
 from bson import ObjectId
@@ -16,8 +18,21 @@ from app.models.project import (
     ProjectStats,
     PlatformLinks,
 )
-from app.repositories.base import BaseRepository
-from app.services.presets import get_preset_config
+from app.repositories.base import BaseRepository, StatsBuffer
+
+# Default sub-documents, dumped once and deep-copied per new project
+_DEFAULT_CONFIG_DUMP = ProjectConfig().model_dump()
+_DEFAULT_STATS_DUMP = ProjectStats().model_dump()
+_DEFAULT_PLATFORM_LINKS_DUMP = PlatformLinks().model_dump()
+
+
+# Global stats buffer instance
+_stats_buffer = StatsBuffer("projects")
+
+
+def get_stats_buffer() -> StatsBuffer:
+    """Get the process-wide project stats buffer."""
+    return _stats_buffer
 
 
 class ProjectRepository(BaseRepository[ProjectInDB]):
@@ -25,28 +40,36 @@ class ProjectRepository(BaseRepository[ProjectInDB]):
 
     collection_name = "projects"
     model_class = ProjectInDB
+    # Reads are validated once into ProjectInDB so that _to_project can re-tag
+    # the already-built nested config/stats models without revalidating.
+    validate_reads = True
 
     async def create_project(
         self, user_id: str, project_data: ProjectCreate
     ) -> Project:
         """Create a new project with preset configuration."""
+        from app.services.presets import get_preset_config
+
         # Get preset configuration if not custom
         config = project_data.config
         if config is None and project_data.preset != "custom":
             config = get_preset_config(project_data.preset)
 
-        if config is None:
-            config = ProjectConfig()
+        config_dump = (
+            config.model_dump() if config is not None else copy.deepcopy(_DEFAULT_CONFIG_DUMP)
+        )
 
-        # Handle product info
+        # Handle product info. ProductInfo holds only plain values, so a
+        # shallow copy of its fields is equivalent to model_dump().
         product = None
         if project_data.product:
-            product = project_data.product.model_dump()
+            product = dict(project_data.product.__dict__)
 
         # Handle platform links
-        platform_links = PlatformLinks()
         if project_data.platform_links:
-            platform_links = project_data.platform_links
+            platform_links = project_data.platform_links.model_dump()
+        else:
+            platform_links = copy.deepcopy(_DEFAULT_PLATFORM_LINKS_DUMP)
 
         data = {
             "user_id": user_id,
@@ -55,9 +78,9 @@ class ProjectRepository(BaseRepository[ProjectInDB]):
             "preset": project_data.preset,
             "status": "active",
             "product": product,
-            "platform_links": platform_links.model_dump(),
-            "config": config.model_dump(),
-            "stats": ProjectStats().model_dump(),
+            "platform_links": platform_links,
+            "config": config_dump,
+            "stats": copy.deepcopy(_DEFAULT_STATS_DUMP),
             "archived_at": None,
         }
 
@@ -91,25 +114,33 @@ class ProjectRepository(BaseRepository[ProjectInDB]):
             filter_dict["status"] = status
 
         if search:
-            filter_dict["$or"] = [
-                {"name": {"$regex": search, "$options": "i"}},
-                {"description": {"$regex": search, "$options": "i"}},
-            ]
-
-        # Get total count
-        total = await self.count(filter_dict)
+            # Served by the text index on name/description
+            filter_dict["$text"] = {"$search": search}
 
-        # Calculate pagination
         skip = (page - 1) * page_size
+
+        # Fetch the page and the total count in a single round trip
+        pipeline = [
+            {"$match": filter_dict},
+            {
+                "$facet": {
+                    "items": [
+                        {"$sort": {"created_at": -1}},
+                        {"$skip": skip},
+                        {"$limit": page_size},
+                    ],
+                    "total": [{"$count": "n"}],
+                }
+            },
+        ]
+        cursor = await self.collection.aggregate(pipeline)
+        facets = await cursor.to_list(length=1)
+        facet = facets[0] if facets else {"items": [], "total": []}
+
+        total = facet["total"][0]["n"] if facet["total"] else 0
         pages = (total + page_size - 1) // page_size if total > 0 else 1
 
-        # Get projects
-        projects_in_db = await self.get_many(
-            filter_dict,
-            skip=skip,
-            limit=page_size,
-            sort=[("created_at", -1)],
-        )
+        projects_in_db = [self.model_class(**doc) for doc in facet["items"]]
 
         return ProjectList(
             items=[self._to_project(p) for p in projects_in_db],
@@ -168,7 +199,15 @@ class ProjectRepository(BaseRepository[ProjectInDB]):
     async def increment_stats(
         self, project_id: str, field: str, amount: int = 1
     ) -> None:
-        """Increment a stats field."""
+        """Increment a stats field.
+
+        Increments are coalesced by the stats buffer while it is running and
+        written directly otherwise.
+        """
+        if _stats_buffer.running:
+            _stats_buffer.add(ObjectId(project_id), field, amount)
+            return
+
         await self.collection.update_one(
             {"_id": ObjectId(project_id)},
             {"$inc": {f"stats.{field}": amount}},
@@ -186,24 +225,14 @@ class ProjectRepository(BaseRepository[ProjectInDB]):
         return [self._to_project(p) for p in projects_in_db]
 
     def _to_project(self, project_in_db: ProjectInDB) -> Project:
-        """Convert ProjectInDB to Project."""
-        return Project(
-            id=project_in_db.id,
-            user_id=project_in_db.user_id,
-            name=project_in_db.name,
-            description=project_in_db.description,
-            status=project_in_db.status,
-            preset=project_in_db.preset,
-            product=project_in_db.product,
-            platform_links=project_in_db.platform_links,
-            config=project_in_db.config,
-            stats=project_in_db.stats,
-            archived_at=project_in_db.archived_at,
-            created_at=project_in_db.created_at,
-            updated_at=project_in_db.updated_at,
+        """Convert ProjectInDB to Project without revalidating its fields."""
+        return Project.model_construct(
+            _fields_set=project_in_db.model_fields_set,
+            **project_in_db.__dict__,
         )
 
 
+@lru_cache(maxsize=1)
 def get_project_repository() -> ProjectRepository:
-    """FastAPI dependency to get project repository."""
+    """FastAPI dependency to get the shared project repository."""
     return ProjectRepository()
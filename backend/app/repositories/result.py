@@ -1,11 +1,16 @@
 """Result repository for database operations."""
 
+import asyncio
+import re
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
 from bson import ObjectId
 from fastapi import Depends, HTTPException, status
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.core.database import get_database
 from app.models.result import (
@@ -14,19 +19,78 @@ from app.models.result import (
     ResultFilter,
     ResultList,
 )
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, object_id
+
+# Labels for the $dateTrunc bucket of each get_sentiment_over_time interval
+# (the interval names double as $dateTrunc units)
+DATE_LABEL_FORMAT = MappingProxyType({
+    "hour": "%Y-%m-%dT%H:00:00",
+    "day": "%Y-%m-%d",
+    "week": "%G-W%V",
+    "month": "%Y-%m",
+})
+
+# Per-(project, user, target, day) sentiment totals maintained by $merge
+DAILY_ROLLUP_COLLECTION = "results_daily_rollup"
+
+# Fields of a result that identify and update its daily rollup row
+ROLLUP_FIELDS_PROJECTION: dict[str, Any] = {
+    "project_id": 1,
+    "user_id": 1,
+    "target_id": 1,
+    "content.date": 1,
+    "analysis.sentiment.score": 1,
+}
+
+# Long-form LLM output not shown in result listings; fetch single results for it
+RESULT_LIST_PROJECTION: dict[str, Any] = {
+    "analysis.summary": 0,
+    "analysis.insights": 0,
+}
+
+# Number of documents fetched per cursor batch while exporting
+EXPORT_BATCH_SIZE = 500
+
+# Fields read by the flattened (CSV/XLSX) export columns
+EXPORT_COLUMNS_PROJECTION: dict[str, Any] = {
+    "platform": 1,
+    "content.text": 1,
+    "content.title": 1,
+    "content.author": 1,
+    "content.rating": 1,
+    "content.date": 1,
+    "content.url": 1,
+    "analysis.sentiment": 1,
+    "analysis.emotions.primary": 1,
+    "analysis.emotions.scores": 1,
+    "created_at": 1,
+}
+
+
+@lru_cache(maxsize=256)
+def substring_pattern(search: str) -> str:
+    """Escape user search input for use as a literal MongoDB $regex."""
+    return re.escape(search)
 
 
 class ResultRepository(BaseRepository):
     """Repository for result database operations."""
 
-    def __init__(self, db: AsyncIOMotorDatabase):
-        super().__init__(db, "results")
+    collection_name = "results"
+    model_class = Result
+
+    def __init__(self, db: AsyncDatabase):
+        super().__init__()
+
+    @property
+    def rollup_collection(self):
+        """Collection holding the daily sentiment rollup."""
+        return self.collection.database[DAILY_ROLLUP_COLLECTION]
 
     async def get_result(self, result_id: str, user_id: str) -> Result:
         """Get a result by ID."""
         result = await self.collection.find_one(
-            {"_id": ObjectId(result_id), "user_id": user_id}
+            {"_id": object_id(result_id), "user_id": user_id}
         )
         if not result:
             raise HTTPException(
@@ -42,9 +106,11 @@ class ResultRepository(BaseRepository):
         filters: ResultFilter | None = None,
         page: int = 1,
         page_size: int = 20,
+        include_total: bool = True,
     ) -> ResultList:
         """Get paginated results for a project."""
         query: dict[str, Any] = {"project_id": project_id, "user_id": user_id}
+        sort: list[tuple[str, Any]] | None = None
 
         if filters:
             if filters.sentiment:
@@ -53,36 +119,29 @@ class ResultRepository(BaseRepository):
                 query["platform"] = filters.platform
             if filters.target_id:
                 query["target_id"] = filters.target_id
+
+            date_range: dict[str, datetime] = {}
             if filters.date_from:
-                query["content.date"] = {"$gte": filters.date_from}
+                date_range["$gte"] = filters.date_from
             if filters.date_to:
-                if "content.date" in query:
-                    query["content.date"]["$lte"] = filters.date_to
-                else:
-                    query["content.date"] = {"$lte": filters.date_to}
-            if filters.search:
-                query["$or"] = [
-                    {"content.text": {"$regex": filters.search, "$options": "i"}},
-                    {"content.title": {"$regex": filters.search, "$options": "i"}},
-                ]
+                date_range["$lte"] = filters.date_to
+            if date_range:
+                query["content.date"] = date_range
 
-        total = await self.collection.count_documents(query)
-        skip = (page - 1) * page_size
-
-        cursor = (
-            self.collection.find(query)
-            .sort("created_at", -1)
-            .skip(skip)
-            .limit(page_size)
-        )
-        results = await cursor.to_list(length=page_size)
+            if filters.search:
+                if filters.substring_search:
+                    pattern = substring_pattern(filters.search)
+                    query["$or"] = [
+                        {"content.text": {"$regex": pattern, "$options": "i"}},
+                        {"content.title": {"$regex": pattern, "$options": "i"}},
+                    ]
+                else:
+                    # Served by the weighted text index on content text/title
+                    query["$text"] = {"$search": filters.search}
+                    if filters.sort_by_relevance:
+                        sort = [("score", {"$meta": "textScore"})]
 
-        return ResultList(
-            items=[self._doc_to_model(r, Result) for r in results],
-            total=total,
-            page=page,
-            page_size=page_size,
-        )
+        return await self._paginate(query, page, page_size, include_total, sort)
 
     async def get_results_by_target(
         self,
@@ -90,27 +149,12 @@ class ResultRepository(BaseRepository):
         user_id: str,
         page: int = 1,
         page_size: int = 20,
+        include_total: bool = True,
     ) -> ResultList:
         """Get paginated results for a target."""
         query = {"target_id": target_id, "user_id": user_id}
 
-        total = await self.collection.count_documents(query)
-        skip = (page - 1) * page_size
-
-        cursor = (
-            self.collection.find(query)
-            .sort("created_at", -1)
-            .skip(skip)
-            .limit(page_size)
-        )
-        results = await cursor.to_list(length=page_size)
-
-        return ResultList(
-            items=[self._doc_to_model(r, Result) for r in results],
-            total=total,
-            page=page,
-            page_size=page_size,
-        )
+        return await self._paginate(query, page, page_size, include_total)
 
     async def get_results_by_job(
         self,
@@ -118,50 +162,105 @@ class ResultRepository(BaseRepository):
         user_id: str,
         page: int = 1,
         page_size: int = 20,
+        include_total: bool = True,
     ) -> ResultList:
         """Get paginated results for a scrape job."""
         query = {"scrape_job_id": job_id, "user_id": user_id}
 
-        total = await self.collection.count_documents(query)
+        return await self._paginate(query, page, page_size, include_total)
+
+    async def _paginate(
+        self,
+        query: dict[str, Any],
+        page: int,
+        page_size: int,
+        include_total: bool = True,
+        sort: list[tuple[str, Any]] | None = None,
+    ) -> ResultList:
+        """Fetch one page of results, counting the total concurrently.
+
+        When include_total is False the count is skipped and total is None,
+        which suits infinite-scroll clients that never show a page count.
+        Results are newest first unless another sort is given.
+        """
         skip = (page - 1) * page_size
 
         cursor = (
-            self.collection.find(query)
-            .sort("created_at", -1)
+            self.collection.find(query, RESULT_LIST_PROJECTION)
+            .sort(sort or [("created_at", -1)])
             .skip(skip)
             .limit(page_size)
         )
-        results = await cursor.to_list(length=page_size)
+        items = self._collect_trusted(cursor, Result, page_size)
+        if include_total:
+            total, items = await asyncio.gather(
+                self.collection.count_documents(query), items
+            )
+        else:
+            total, items = None, await items
 
         return ResultList(
-            items=[self._doc_to_model(r, Result) for r in results],
+            items=items,
             total=total,
             page=page,
             page_size=page_size,
         )
 
     async def delete_result(self, result_id: str, user_id: str) -> None:
-        """Delete a result."""
-        result = await self.collection.delete_one(
-            {"_id": ObjectId(result_id), "user_id": user_id}
+        """Delete a result and take it out of the daily rollup."""
+        doc = await self.collection.find_one_and_delete(
+            {"_id": object_id(result_id), "user_id": user_id},
+            projection=ROLLUP_FIELDS_PROJECTION,
         )
-        if result.deleted_count == 0:
+        if doc is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Result not found",
             )
+        await self._remove_from_rollup(doc)
+
+    async def _remove_from_rollup(self, doc: dict[str, Any]) -> None:
+        """Subtract a deleted result from its daily rollup row."""
+        date = (doc.get("content") or {}).get("date")
+        # Same key, in the same field order, as the $group in refresh_daily_rollup
+        rollup_id = {
+            "project_id": doc.get("project_id"),
+            "user_id": doc.get("user_id"),
+            "target_id": doc.get("target_id"),
+            "day": (
+                date.replace(hour=0, minute=0, second=0, microsecond=0)
+                if isinstance(date, datetime)
+                else None
+            ),
+        }
+        inc: dict[str, Any] = {"count": -1}
+        score = ((doc.get("analysis") or {}).get("sentiment") or {}).get("score")
+        if isinstance(score, (int, float)) and not isinstance(score, bool):
+            inc["scored"] = -1
+            inc["score_sum"] = -score
+
+        await self.rollup_collection.update_one({"_id": rollup_id}, {"$inc": inc})
+        await self.rollup_collection.delete_one({"_id": rollup_id, "count": {"$lte": 0}})
 
     async def delete_results_by_project(self, project_id: str, user_id: str) -> int:
         """Delete all results for a project."""
         result = await self.collection.delete_many(
-            {"project_id": project_id, "user_id": user_id}
+            {"project_id": project_id, "user_id": user_id},
+            hint=[("project_id", 1), ("user_id", 1), ("created_at", -1)],
+        )
+        await self.rollup_collection.delete_many(
+            {"_id.project_id": project_id, "_id.user_id": user_id}
         )
         return result.deleted_count
 
     async def delete_results_by_target(self, target_id: str, user_id: str) -> int:
         """Delete all results for a target."""
         result = await self.collection.delete_many(
-            {"target_id": target_id, "user_id": user_id}
+            {"target_id": target_id, "user_id": user_id},
+            hint=[("target_id", 1), ("user_id", 1), ("created_at", -1)],
+        )
+        await self.rollup_collection.delete_many(
+            {"_id.target_id": target_id, "_id.user_id": user_id}
         )
         return result.deleted_count
 
@@ -176,49 +275,41 @@ class ResultRepository(BaseRepository):
         if target_id:
             match_query["target_id"] = target_id
 
+        # Totals and both distributions share one scan of the matched set
         pipeline = [
             {"$match": match_query},
             {
-                "$group": {
-                    "_id": None,
-                    "total_results": {"$sum": 1},
-                    "avg_sentiment_score": {"$avg": "$analysis.sentiment.score"},
-                    "avg_rating": {"$avg": "$content.rating"},
-                    "min_date": {"$min": "$content.date"},
-                    "max_date": {"$max": "$content.date"},
+                "$facet": {
+                    "totals": [
+                        {
+                            "$group": {
+                                "_id": None,
+                                "total_results": {"$sum": 1},
+                                "avg_sentiment_score": {"$avg": "$analysis.sentiment.score"},
+                                "avg_rating": {"$avg": "$content.rating"},
+                                "min_date": {"$min": "$content.date"},
+                                "max_date": {"$max": "$content.date"},
+                            }
+                        }
+                    ],
+                    "sentiment": [
+                        {"$group": {"_id": "$analysis.sentiment.label", "count": {"$sum": 1}}}
+                    ],
+                    "platform": [{"$group": {"_id": "$platform", "count": {"$sum": 1}}}],
                 }
             },
         ]
 
-        cursor = self.collection.aggregate(pipeline)
-        agg_results = await cursor.to_list(length=1)
+        cursor = await self.collection.aggregate(pipeline)
+        facets = await cursor.to_list(length=1)
 
-        if not agg_results:
+        if not facets or not facets[0]["totals"]:
             return ResultAggregation()
 
-        agg = agg_results[0]
-
-        # Get sentiment distribution
-        sentiment_pipeline = [
-            {"$match": match_query},
-            {"$group": {"_id": "$analysis.sentiment.label", "count": {"$sum": 1}}},
-        ]
-        sentiment_cursor = self.collection.aggregate(sentiment_pipeline)
-        sentiment_results = await sentiment_cursor.to_list(length=10)
-        sentiment_dist = {
-            s["_id"]: s["count"] for s in sentiment_results if s["_id"]
-        }
-
-        # Get platform distribution
-        platform_pipeline = [
-            {"$match": match_query},
-            {"$group": {"_id": "$platform", "count": {"$sum": 1}}},
-        ]
-        platform_cursor = self.collection.aggregate(platform_pipeline)
-        platform_results = await platform_cursor.to_list(length=20)
-        platform_dist = {
-            p["_id"]: p["count"] for p in platform_results if p["_id"]
-        }
+        facet = facets[0]
+        agg = facet["totals"][0]
+        sentiment_dist = {s["_id"]: s["count"] for s in facet["sentiment"] if s["_id"]}
+        platform_dist = {p["_id"]: p["count"] for p in facet["platform"] if p["_id"]}
 
         return ResultAggregation(
             total_results=agg.get("total_results", 0),
@@ -232,51 +323,166 @@ class ResultRepository(BaseRepository):
             },
         )
 
-    async def get_sentiment_over_time(
-        self,
-        project_id: str,
-        user_id: str,
-        target_id: str | None = None,
-        interval: str = "day",
-    ) -> list[dict[str, Any]]:
-        """Get sentiment score over time."""
-        match_query: dict[str, Any] = {"project_id": project_id, "user_id": user_id}
-        if target_id:
-            match_query["target_id"] = target_id
+    async def refresh_daily_rollup(self, project_id: str | None = None) -> None:
+        """
+        Rebuild the daily sentiment rollup for one project, or for all projects.
 
-        # Date truncation based on interval
-        date_format = {
-            "hour": "%Y-%m-%dT%H:00:00",
-            "day": "%Y-%m-%d",
-            "week": "%Y-W%V",
-            "month": "%Y-%m",
-        }.get(interval, "%Y-%m-%d")
+        Days that no longer have any results are removed once the merge completes.
+        """
+        refreshed_at = datetime.now(timezone.utc)
+        match_query: dict[str, Any] = {}
+        if project_id:
+            match_query["project_id"] = project_id
 
         pipeline = [
             {"$match": match_query},
             {
-                "$project": {
-                    "date_bucket": {
-                        "$dateToString": {"format": date_format, "date": "$content.date"}
+                "$group": {
+                    "_id": {
+                        "project_id": "$project_id",
+                        "user_id": "$user_id",
+                        "target_id": "$target_id",
+                        "day": {"$dateTrunc": {"date": "$content.date", "unit": "day"}},
+                    },
+                    "count": {"$sum": 1},
+                    "scored": {
+                        "$sum": {
+                            "$cond": [{"$isNumber": "$analysis.sentiment.score"}, 1, 0]
+                        }
                     },
-                    "sentiment_score": "$analysis.sentiment.score",
+                    "score_sum": {"$sum": "$analysis.sentiment.score"},
                 }
             },
+            {"$set": {"refreshed_at": refreshed_at}},
             {
-                "$group": {
-                    "_id": "$date_bucket",
-                    "avg_score": {"$avg": "$sentiment_score"},
-                    "count": {"$sum": 1},
+                "$merge": {
+                    "into": DAILY_ROLLUP_COLLECTION,
+                    "on": "_id",
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert",
                 }
             },
-            {"$sort": {"_id": 1}},
         ]
+        cursor = await self.collection.aggregate(pipeline)
+        await cursor.to_list(length=None)
+
+        stale_query: dict[str, Any] = {"refreshed_at": {"$lt": refreshed_at}}
+        if project_id:
+            stale_query["_id.project_id"] = project_id
+        await self.rollup_collection.delete_many(stale_query)
+
+    async def refresh_changed_rollups(self, since: datetime) -> int:
+        """
+        Rebuild the daily rollup for projects with results inserted since a time.
+
+        Result IDs are generated at insert time, so the _id index finds the new
+        results without scanning the collection. Returns the number of projects
+        refreshed.
+        """
+        project_ids = await self.collection.distinct(
+            "project_id", {"_id": {"$gte": ObjectId.from_datetime(since)}}
+        )
+        for project_id in project_ids:
+            await self.refresh_daily_rollup(project_id)
+        return len(project_ids)
+
+    async def get_rollup_refreshed_at(self) -> datetime | None:
+        """Get when the daily rollup was last written, or None if it is empty."""
+        doc = await self.rollup_collection.find_one(
+            {}, {"refreshed_at": 1}, sort=[("refreshed_at", -1)]
+        )
+        return doc["refreshed_at"].replace(tzinfo=timezone.utc) if doc else None
 
-        cursor = self.collection.aggregate(pipeline)
-        results = await cursor.to_list(length=1000)
-
+    async def get_sentiment_over_time(
+        self,
+        project_id: str,
+        user_id: str,
+        target_id: str | None = None,
+        interval: str = "day",
+    ) -> list[dict[str, Any]]:
+        """
+        Get sentiment score over time.
+
+        Day and coarser buckets are read from the daily rollup; hourly buckets,
+        and projects whose rollup has not been built yet, are computed from the
+        results themselves.
+        """
+        # Bucket by truncated date; unknown intervals fall back to days
+        unit = interval if interval in DATE_LABEL_FORMAT else "day"
+
+        results = []
+        if unit != "hour":
+            match_query: dict[str, Any] = {
+                "_id.project_id": project_id,
+                "_id.user_id": user_id,
+            }
+            if target_id:
+                match_query["_id.target_id"] = target_id
+
+            pipeline = [
+                {"$match": match_query},
+                {
+                    "$group": {
+                        "_id": {
+                            "$dateTrunc": {
+                                "date": "$_id.day",
+                                "unit": unit,
+                                "startOfWeek": "monday",
+                            }
+                        },
+                        "score_sum": {"$sum": "$score_sum"},
+                        "scored": {"$sum": "$scored"},
+                        "count": {"$sum": "$count"},
+                    }
+                },
+                {
+                    "$set": {
+                        "avg_score": {
+                            "$cond": [
+                                {"$gt": ["$scored", 0]},
+                                {"$divide": ["$score_sum", "$scored"]},
+                                None,
+                            ]
+                        }
+                    }
+                },
+                {"$sort": {"_id": 1}},
+            ]
+            cursor = await self.rollup_collection.aggregate(pipeline)
+            results = await cursor.to_list(length=1000)
+
+        if not results:
+            match_query = {"project_id": project_id, "user_id": user_id}
+            if target_id:
+                match_query["target_id"] = target_id
+
+            pipeline = [
+                {"$match": match_query},
+                {
+                    "$group": {
+                        "_id": {
+                            "$dateTrunc": {
+                                "date": "$content.date",
+                                "unit": unit,
+                                "startOfWeek": "monday",
+                            }
+                        },
+                        "avg_score": {"$avg": "$analysis.sentiment.score"},
+                        "count": {"$sum": 1},
+                    }
+                },
+                {"$sort": {"_id": 1}},
+            ]
+            cursor = await self.collection.aggregate(pipeline)
+            results = await cursor.to_list(length=1000)
+
+        date_format = DATE_LABEL_FORMAT[unit]
         return [
-            {"date": r["_id"], "avg_score": r["avg_score"], "count": r["count"]}
+            {
+                "date": r["_id"].strftime(date_format),
+                "avg_score": r["avg_score"],
+                "count": r["count"],
+            }
             for r in results
             if r["_id"]
         ]
@@ -292,6 +498,8 @@ class ResultRepository(BaseRepository):
 
         pipeline = [
             {"$match": match_query},
+            # Drop everything but the emotions array before unwinding
+            {"$project": {"_id": 0, "analysis.emotions.detected": 1}},
             {"$unwind": "$analysis.emotions.detected"},
             {
                 "$group": {
@@ -304,7 +512,7 @@ class ResultRepository(BaseRepository):
             {"$limit": limit},
         ]
 
-        cursor = self.collection.aggregate(pipeline)
+        cursor = await self.collection.aggregate(pipeline)
         results = await cursor.to_list(length=limit)
 
         return [
@@ -316,24 +524,27 @@ class ResultRepository(BaseRepository):
         self,
         project_id: str,
         user_id: str,
-        format: str = "json",
-    ) -> list[dict[str, Any]]:
-        """Export all results for a project."""
-        query = {"project_id": project_id, "user_id": user_id}
+        projection: dict[str, Any] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream all results for a project, newest first.
 
-        cursor = self.collection.find(query).sort("created_at", -1)
-        results = await cursor.to_list(length=None)
-
-        export_data = []
-        for r in results:
-            r["id"] = str(r.pop("_id"))
-            export_data.append(r)
+        Documents are yielded as each cursor batch arrives, so memory stays
+        bounded by the batch size rather than the project size.
+        """
+        query = {"project_id": project_id, "user_id": user_id}
 
-        return export_data
+        cursor = (
+            self.collection.find(query, projection)
+            .sort("created_at", -1)
+            .batch_size(EXPORT_BATCH_SIZE)
+        )
+        async for doc in cursor:
+            doc["id"] = str(doc.pop("_id"))
+            yield doc
 
 
 def get_result_repository(
-    db: AsyncIOMotorDatabase = Depends(get_database),
+    db: AsyncDatabase = Depends(get_database),
 ) -> ResultRepository:
     """Dependency for getting result repository."""
     return ResultRepository(db)
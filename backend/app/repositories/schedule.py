@@ -1,11 +1,14 @@
 """Schedule repository for database operations."""
 
+import asyncio
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from typing import Any
+from zoneinfo import ZoneInfo
 
-from bson import ObjectId
 from fastapi import Depends, HTTPException, status
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import InsertOne, ReturnDocument, UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.core.database import get_database
 from app.models.schedule import (
@@ -16,14 +19,23 @@ from app.models.schedule import (
     ScheduleExecution,
     ScheduleExecutionList,
 )
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, object_id
+
+
+@lru_cache(maxsize=64)
+def _get_timezone(name: str) -> ZoneInfo:
+    """Get a cached timezone by IANA name."""
+    return ZoneInfo(name)
 
 
 class ScheduleRepository(BaseRepository):
     """Repository for schedule database operations."""
 
-    def __init__(self, db: AsyncIOMotorDatabase):
-        super().__init__(db, "schedules")
+    collection_name = "schedules"
+    model_class = Schedule
+
+    def __init__(self, db: AsyncDatabase):
+        super().__init__()
         self.executions_collection = db["schedule_executions"]
 
     def _calculate_next_run(
@@ -35,10 +47,7 @@ class ScheduleRepository(BaseRepository):
         tz_name: str = "UTC",
     ) -> datetime:
         """Calculate the next run time based on schedule configuration."""
-        import pytz
-
-        tz = pytz.timezone(tz_name)
-        now = datetime.now(tz)
+        now = datetime.now(_get_timezone(tz_name))
 
         # Parse time if provided
         if schedule_time:
@@ -79,7 +88,7 @@ class ScheduleRepository(BaseRepository):
         else:
             next_run = now + timedelta(days=1)
 
-        return next_run.astimezone(pytz.UTC).replace(tzinfo=None)
+        return next_run.astimezone(timezone.utc).replace(tzinfo=None)
 
     async def create_schedule(
         self,
@@ -149,7 +158,7 @@ class ScheduleRepository(BaseRepository):
     async def get_schedule_by_id(self, schedule_id: str, user_id: str) -> Schedule:
         """Get schedule by ID."""
         doc = await self.collection.find_one(
-            {"_id": ObjectId(schedule_id), "user_id": user_id}
+            {"_id": object_id(schedule_id), "user_id": user_id}
         )
         if not doc:
             raise HTTPException(
@@ -164,7 +173,7 @@ class ScheduleRepository(BaseRepository):
         schedules = await cursor.to_list(length=None)
 
         return ScheduleList(
-            items=[self._doc_to_model(s, Schedule) for s in schedules],
+            items=[self._doc_to_model_trusted(s, Schedule) for s in schedules],
             total=len(schedules),
         )
 
@@ -174,39 +183,49 @@ class ScheduleRepository(BaseRepository):
         user_id: str,
         update_data: ScheduleUpdate,
     ) -> Schedule:
-        """Update a schedule."""
-        schedule = await self.get_schedule(project_id, user_id)
+        """Update a schedule.
 
+        The update is applied first and the next run time is derived from the
+        updated document, saving a read before the write.
+        """
         update_dict = update_data.model_dump(exclude_none=True)
         if not update_dict:
-            return schedule
+            return await self.get_schedule(project_id, user_id)
 
         update_dict["updated_at"] = datetime.now(timezone.utc)
 
+        doc = await self.collection.find_one_and_update(
+            {"project_id": project_id, "user_id": user_id},
+            {"$set": update_dict},
+            return_document=ReturnDocument.AFTER,
+        )
+        if not doc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Schedule not found",
+            )
+
         # Recalculate next run if relevant fields changed
         if any(k in update_dict for k in ["enabled", "frequency", "time", "day_of_week", "day_of_month", "timezone"]):
-            # Merge with existing values
-            frequency = update_dict.get("frequency", schedule.frequency)
-            time = update_dict.get("time", schedule.time)
-            day_of_week = update_dict.get("day_of_week", schedule.day_of_week)
-            day_of_month = update_dict.get("day_of_month", schedule.day_of_month)
-            tz = update_dict.get("timezone", schedule.timezone)
-            enabled = update_dict.get("enabled", schedule.enabled)
-
-            if enabled:
-                update_dict["next_run"] = self._calculate_next_run(
-                    frequency, time, day_of_week, day_of_month, tz
+            if doc.get("enabled"):
+                next_run = self._calculate_next_run(
+                    doc.get("frequency", "daily"),
+                    doc.get("time"),
+                    doc.get("day_of_week"),
+                    doc.get("day_of_month"),
+                    doc.get("timezone", "UTC"),
                 )
             else:
-                update_dict["next_run"] = None
+                next_run = None
 
-        result = await self.collection.find_one_and_update(
-            {"project_id": project_id, "user_id": user_id},
-            {"$set": update_dict},
-            return_document=True,
-        )
+            if next_run != doc.get("next_run"):
+                await self.collection.update_one(
+                    {"_id": doc["_id"]},
+                    {"$set": {"next_run": next_run}},
+                )
+                doc["next_run"] = next_run
 
-        return self._doc_to_model(result, Schedule)
+        return self._doc_to_model(doc, Schedule)
 
     async def delete_schedule(self, project_id: str, user_id: str) -> None:
         """Delete a schedule."""
@@ -233,6 +252,46 @@ class ScheduleRepository(BaseRepository):
         schedules = await cursor.to_list(length=limit)
         return [self._doc_to_model(s, Schedule) for s in schedules]
 
+    async def claim_due_schedule(self, lease_seconds: int = 60) -> Schedule | None:
+        """Atomically claim the most overdue schedule.
+
+        The claimed schedule is leased for lease_seconds so concurrent
+        scheduler workers cannot run it twice. Returns None when nothing
+        is due.
+        """
+        now = datetime.now(timezone.utc)
+
+        doc = await self.collection.find_one_and_update(
+            {
+                "enabled": True,
+                "next_run": {"$lte": now},
+                "lease_until": {"$not": {"$gt": now}},
+            },
+            {"$set": {"lease_until": now + timedelta(seconds=lease_seconds)}},
+            sort=[("next_run", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if not doc:
+            return None
+        return self._doc_to_model(doc, Schedule)
+
+    async def get_next_due_at(self) -> datetime | None:
+        """Get when the next unleased enabled schedule is due, if any."""
+        now = datetime.now(timezone.utc)
+
+        doc = await self.collection.find_one(
+            {"enabled": True, "lease_until": {"$not": {"$gt": now}}},
+            {"_id": 0, "next_run": 1},
+            sort=[("next_run", 1)],
+        )
+        if not doc or doc.get("next_run") is None:
+            return None
+
+        next_run = doc["next_run"]
+        if next_run.tzinfo is None:
+            next_run = next_run.replace(tzinfo=timezone.utc)
+        return next_run
+
     async def record_execution(
         self,
         schedule_id: str,
@@ -240,66 +299,148 @@ class ScheduleRepository(BaseRepository):
         status: str,
         results_count: int = 0,
         error: str | None = None,
+        schedule: Schedule | None = None,
     ) -> None:
-        """Record a schedule execution."""
+        """Record a schedule execution.
+
+        The schedule is updated with a single pipeline update, so failure
+        counting and auto-disabling happen server-side without a prior read.
+        For completed runs the next run time is computed from schedule,
+        which is fetched only if the caller does not pass it.
+        """
+        await self.record_executions_bulk(
+            [
+                {
+                    "schedule_id": schedule_id,
+                    "job_id": job_id,
+                    "status": status,
+                    "results_count": results_count,
+                    "error": error,
+                    "schedule": schedule,
+                }
+            ]
+        )
+
+    async def record_executions_bulk(self, records: list[dict[str, Any]]) -> None:
+        """Record several schedule executions in two bulk writes.
+
+        Each record takes the keyword arguments of record_execution.
+        Schedules missing from completed records are fetched with one query.
+        """
+        if not records:
+            return
+
         now = datetime.now(timezone.utc)
 
-        # Create execution record
-        execution_doc = {
-            "schedule_id": schedule_id,
-            "job_id": job_id,
-            "status": status,
-            "started_at": now,
-            "completed_at": now if status in ("completed", "failed", "skipped") else None,
-            "results_count": results_count,
-            "error": error,
-            "retry_count": 0,
+        missing_ids = {
+            record["schedule_id"]
+            for record in records
+            if record["status"] == "completed" and record.get("schedule") is None
         }
-        await self.executions_collection.insert_one(execution_doc)
-
-        # Update schedule
-        schedule = await self.collection.find_one({"_id": ObjectId(schedule_id)})
-        if schedule:
-            update = {
-                "last_run": now,
-                "last_status": status,
-                "updated_at": now,
-            }
+        schedules: dict[str, Schedule] = {}
+        if missing_ids:
+            cursor = self.collection.find(
+                {"_id": {"$in": [object_id(sid) for sid in missing_ids]}}
+            )
+            async for doc in cursor:
+                schedules[str(doc["_id"])] = self._doc_to_model(doc, Schedule)
+
+        execution_ops: list[InsertOne] = []
+        schedule_ops: list[UpdateOne] = []
+        for record in records:
+            schedule_id = record["schedule_id"]
+            status = record["status"]
+            execution_ops.append(
+                InsertOne(
+                    {
+                        "schedule_id": schedule_id,
+                        "job_id": record.get("job_id"),
+                        "status": status,
+                        "started_at": now,
+                        "completed_at": (
+                            now if status in ("completed", "failed", "skipped") else None
+                        ),
+                        "results_count": record.get("results_count", 0),
+                        "error": record.get("error"),
+                        "retry_count": 0,
+                    }
+                )
+            )
 
+            next_run = None
             if status == "completed":
-                update["consecutive_failures"] = 0
-                # Calculate next run
-                update["next_run"] = self._calculate_next_run(
-                    schedule["frequency"],
-                    schedule.get("time"),
-                    schedule.get("day_of_week"),
-                    schedule.get("day_of_month"),
-                    schedule.get("timezone", "UTC"),
+                schedule = record.get("schedule") or schedules.get(schedule_id)
+                if schedule is None:
+                    continue
+                next_run = self._calculate_next_run(
+                    schedule.frequency,
+                    schedule.time,
+                    schedule.day_of_week,
+                    schedule.day_of_month,
+                    schedule.timezone,
                 )
-            elif status == "failed":
-                update["consecutive_failures"] = schedule.get("consecutive_failures", 0) + 1
-                # Disable if too many failures
-                if update["consecutive_failures"] >= schedule.get("max_retries", 3):
-                    update["enabled"] = False
-                    update["next_run"] = None
-                else:
-                    # Retry in 5 minutes
-                    update["next_run"] = now + timedelta(minutes=5)
 
-            await self.collection.update_one(
-                {"_id": ObjectId(schedule_id)},
-                {"$set": update},
+            schedule_ops.append(
+                UpdateOne(
+                    {"_id": object_id(schedule_id)},
+                    self._execution_update(status, now, next_run),
+                )
             )
 
+        writes = [self.executions_collection.bulk_write(execution_ops, ordered=False)]
+        if schedule_ops:
+            writes.append(self.collection.bulk_write(schedule_ops, ordered=False))
+        await asyncio.gather(*writes)
+
+    def _execution_update(
+        self,
+        status: str,
+        now: datetime,
+        next_run: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """Build the pipeline update applied to a schedule after a run."""
+        update: dict[str, Any] = {
+            "last_run": now,
+            "last_status": {"$literal": status},
+            "updated_at": now,
+        }
+
+        if status == "completed":
+            update["consecutive_failures"] = 0
+            update["next_run"] = next_run
+            return [{"$set": update}]
+
+        if status == "failed":
+            update["consecutive_failures"] = {
+                "$add": [{"$ifNull": ["$consecutive_failures", 0]}, 1]
+            }
+            # Disable if too many failures, otherwise retry in 5 minutes
+            exhausted = {
+                "$gte": ["$consecutive_failures", {"$ifNull": ["$max_retries", 3]}]
+            }
+            return [
+                {"$set": update},
+                {
+                    "$set": {
+                        "enabled": {"$cond": [exhausted, False, "$enabled"]},
+                        "next_run": {
+                            "$cond": [exhausted, None, now + timedelta(minutes=5)]
+                        },
+                    }
+                },
+            ]
+
+        return [{"$set": update}]
+
     async def get_executions(
         self,
         schedule_id: str,
         page: int = 1,
         page_size: int = 20,
+        include_total: bool = True,
     ) -> ScheduleExecutionList:
         """Get execution history for a schedule."""
         query = {"schedule_id": schedule_id}
-        total = await self.executions_collection.count_documents(query)
         skip = (page - 1) * page_size
 
         cursor = (
@@ -308,10 +449,16 @@ class ScheduleRepository(BaseRepository):
             .skip(skip)
             .limit(page_size)
         )
-        executions = await cursor.to_list(length=page_size)
+        items = self._collect_trusted(cursor, ScheduleExecution, page_size)
+        if include_total:
+            total, items = await asyncio.gather(
+                self.executions_collection.count_documents(query), items
+            )
+        else:
+            total, items = None, await items
 
         return ScheduleExecutionList(
-            items=[ScheduleExecution(**e) for e in executions],
+            items=items,
             total=total,
             page=page,
             page_size=page_size,
@@ -319,7 +466,7 @@ class ScheduleRepository(BaseRepository):
 
 
 def get_schedule_repository(
-    db: AsyncIOMotorDatabase = Depends(get_database),
+    db: AsyncDatabase = Depends(get_database),
 ) -> ScheduleRepository:
     """Dependency for getting schedule repository."""
     return ScheduleRepository(db)
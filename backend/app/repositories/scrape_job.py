@@ -1,11 +1,13 @@
 """Scrape job repository for database operations."""
 
+import asyncio
 from datetime import datetime, timezone
 from typing import Any
 
 from bson import ObjectId
 from fastapi import Depends, HTTPException, status
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.core.database import get_database
 from app.models.scrape_job import (
@@ -13,17 +15,31 @@ from app.models.scrape_job import (
     ScrapeJobCreate,
     ScrapeJobList,
     ScrapeJobStats,
+    ScrapeJobSummary,
     TargetJobStatus,
 )
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, StatsBuffer
+
+# Global buffer for job stats increments reported while scraping
+_job_stats_buffer = StatsBuffer("scrape_jobs", touch_updated_at=True)
+
+
+def get_job_stats_buffer() -> StatsBuffer:
+    """Get the process-wide scrape job stats buffer."""
+    return _job_stats_buffer
 
 
 class ScrapeJobRepository(BaseRepository):
     """Repository for scrape job database operations."""
 
-    def __init__(self, db: AsyncIOMotorDatabase):
-        super().__init__(db, "scrape_jobs")
+    collection_name = "scrape_jobs"
+    model_class = ScrapeJob
+
+    def __init__(self, db: AsyncDatabase):
+        super().__init__()
         self.targets_collection = db["targets"]
+        # Per-target job state, one document per (job_id, target_id)
+        self.job_targets_collection = db["scrape_job_targets"]
 
     async def create_job(
         self,
@@ -37,7 +53,7 @@ class ScrapeJobRepository(BaseRepository):
         if job_data.target_ids:
             target_ids = job_data.target_ids
         else:
-            # Get all active targets for the project
+            # Get all active targets for the project, building IDs as batches arrive
             cursor = self.targets_collection.find(
                 {
                     "project_id": project_id,
@@ -45,9 +61,8 @@ class ScrapeJobRepository(BaseRepository):
                     "status": "active",
                 },
                 {"_id": 1},
-            )
-            targets = await cursor.to_list(length=None)
-            target_ids = [str(t["_id"]) for t in targets]
+            ).batch_size(500)
+            target_ids = [str(t["_id"]) async for t in cursor]
 
         if not target_ids:
             raise HTTPException(
@@ -56,9 +71,7 @@ class ScrapeJobRepository(BaseRepository):
             )
 
         # Create target job statuses
-        target_statuses = [
-            TargetJobStatus(target_id=tid).model_dump() for tid in target_ids
-        ]
+        target_statuses = [TargetJobStatus(target_id=tid) for tid in target_ids]
 
         now = datetime.now(timezone.utc)
         job_doc = {
@@ -66,7 +79,6 @@ class ScrapeJobRepository(BaseRepository):
             "user_id": user_id,
             "status": "queued",
             "progress": 0,
-            "targets": target_statuses,
             "options": job_data.options.model_dump(),
             "stats": ScrapeJobStats(targets_total=len(target_ids)).model_dump(),
             "trigger": trigger,
@@ -79,23 +91,54 @@ class ScrapeJobRepository(BaseRepository):
         }
 
         result = await self.collection.insert_one(job_doc)
+
+        # Target statuses live in their own collection so the job document
+        # stays small and each status update is a single indexed write
+        await self.job_targets_collection.insert_many(
+            [
+                {**target.model_dump(), "job_id": result.inserted_id, "position": i}
+                for i, target in enumerate(target_statuses)
+            ],
+            ordered=False,
+        )
+
         job_doc["id"] = str(result.inserted_id)
         if "_id" in job_doc:
             del job_doc["_id"]
 
-        return ScrapeJob(**job_doc)
+        return ScrapeJob(**job_doc, targets=target_statuses)
 
     async def get_job(self, job_id: str, user_id: str) -> ScrapeJob:
-        """Get a scrape job by ID."""
-        job = await self.collection.find_one(
-            {"_id": ObjectId(job_id), "user_id": user_id}
-        )
-        if not job:
+        """Get a scrape job by ID, with its target statuses."""
+        pipeline = [
+            {"$match": {"_id": ObjectId(job_id), "user_id": user_id}},
+            {
+                "$lookup": {
+                    "from": "scrape_job_targets",
+                    "let": {"job_id": "$_id"},
+                    "pipeline": [
+                        {"$match": {"$expr": {"$eq": ["$job_id", "$$job_id"]}}},
+                        {"$sort": {"position": 1}},
+                        {"$project": {"_id": 0, "job_id": 0, "position": 0}},
+                    ],
+                    "as": "job_targets",
+                }
+            },
+        ]
+        cursor = await self.collection.aggregate(pipeline)
+        jobs = await cursor.to_list(length=1)
+        if not jobs:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Scrape job not found",
             )
-        return self._doc_to_model(job, ScrapeJob)
+
+        job = jobs[0]
+        # Jobs created before the split still embed their targets
+        job_targets = job.pop("job_targets")
+        if job_targets:
+            job["targets"] = job_targets
+        return self._doc_to_model_trusted(job, ScrapeJob)
 
     async def get_jobs_by_project(
         self,
@@ -110,14 +153,30 @@ class ScrapeJobRepository(BaseRepository):
         if status_filter:
             query["status"] = status_filter
 
-        total = await self.collection.count_documents(query)
         skip = (page - 1) * page_size
 
-        cursor = self.collection.find(query).sort("created_at", -1).skip(skip).limit(page_size)
-        jobs = await cursor.to_list(length=page_size)
+        # One round trip returns the page and the total
+        pipeline = [
+            {"$match": query},
+            {
+                "$facet": {
+                    "items": [
+                        {"$sort": {"created_at": -1}},
+                        {"$skip": skip},
+                        {"$limit": page_size},
+                    ],
+                    "total": [{"$count": "n"}],
+                }
+            },
+        ]
+        cursor = await self.collection.aggregate(pipeline)
+        facets = await cursor.to_list(length=1)
+        facet = facets[0] if facets else {"items": [], "total": []}
+
+        total = facet["total"][0]["n"] if facet["total"] else 0
 
         return ScrapeJobList(
-            items=[self._doc_to_model(j, ScrapeJob) for j in jobs],
+            items=[self._doc_to_model_trusted(j, ScrapeJob) for j in facet["items"]],
             total=total,
             page=page,
             page_size=page_size,
@@ -129,24 +188,28 @@ class ScrapeJobRepository(BaseRepository):
         status: str,
         error_message: str | None = None,
     ) -> ScrapeJob:
-        """Update job status."""
+        """Update job status.
+
+        Timestamps are stamped by the server with $$NOW, so updated_at and
+        started_at or completed_at carry the same instant.
+        """
         update_doc: dict[str, Any] = {
-            "status": status,
-            "updated_at": datetime.now(timezone.utc),
+            "status": {"$literal": status},
+            "updated_at": "$$NOW",
         }
 
         if status == "running":
-            update_doc["started_at"] = datetime.now(timezone.utc)
+            update_doc["started_at"] = "$$NOW"
         elif status in ("completed", "failed", "cancelled"):
-            update_doc["completed_at"] = datetime.now(timezone.utc)
+            update_doc["completed_at"] = "$$NOW"
 
         if error_message:
-            update_doc["error_message"] = error_message
+            update_doc["error_message"] = {"$literal": error_message}
 
         result = await self.collection.find_one_and_update(
             {"_id": ObjectId(job_id)},
-            {"$set": update_doc},
-            return_document=True,
+            [{"$set": update_doc}],
+            return_document=ReturnDocument.AFTER,
         )
 
         if not result:
@@ -164,10 +227,7 @@ class ScrapeJobRepository(BaseRepository):
         stats: dict[str, Any] | None = None,
     ) -> None:
         """Update job progress and optionally stats."""
-        update_doc: dict[str, Any] = {
-            "progress": progress,
-            "updated_at": datetime.now(timezone.utc),
-        }
+        update_doc: dict[str, Any] = {"progress": progress}
 
         if stats:
             for key, value in stats.items():
@@ -175,7 +235,7 @@ class ScrapeJobRepository(BaseRepository):
 
         await self.collection.update_one(
             {"_id": ObjectId(job_id)},
-            {"$set": update_doc},
+            {"$set": update_doc, "$currentDate": {"updated_at": True}},
         )
 
     async def update_target_status(
@@ -188,48 +248,124 @@ class ScrapeJobRepository(BaseRepository):
         error: str | None = None,
     ) -> None:
         """Update the status of a specific target in a job."""
-        update_doc: dict[str, Any] = {
-            "targets.$.status": status,
-            "targets.$.progress": progress,
-            "targets.$.results_count": results_count,
-            "updated_at": datetime.now(timezone.utc),
-        }
+        await self.update_target_statuses_bulk(
+            job_id,
+            [
+                TargetJobStatus(
+                    target_id=target_id,
+                    status=status,
+                    progress=progress,
+                    results_count=results_count,
+                    error=error,
+                )
+            ],
+        )
 
-        if error:
-            update_doc["targets.$.error"] = error
+    async def update_target_statuses_bulk(
+        self,
+        job_id: str,
+        updates: list[TargetJobStatus],
+    ) -> None:
+        """Update the status of several targets in a job with one bulk write."""
+        if not updates:
+            return
+
+        job_oid = ObjectId(job_id)
+        ops = []
+        for update in updates:
+            update_doc: dict[str, Any] = {
+                "status": update.status,
+                "progress": update.progress,
+                "results_count": update.results_count,
+            }
+            if update.error:
+                update_doc["error"] = update.error
+
+            ops.append(
+                UpdateOne(
+                    {"job_id": job_oid, "target_id": update.target_id},
+                    {"$set": update_doc},
+                )
+            )
 
-        await self.collection.update_one(
-            {"_id": ObjectId(job_id), "targets.target_id": target_id},
-            {"$set": update_doc},
+        await asyncio.gather(
+            self.job_targets_collection.bulk_write(ops, ordered=False),
+            self.collection.update_one(
+                {"_id": job_oid},
+                {"$currentDate": {"updated_at": True}},
+            ),
         )
 
     async def cancel_job(self, job_id: str, user_id: str) -> ScrapeJob:
-        """Cancel a running or queued job."""
-        job = await self.get_job(job_id, user_id)
+        """Cancel a running or queued job.
 
-        if job.status not in ("queued", "running"):
+        The status check is part of the update filter, so concurrent
+        cancellations cannot both succeed.
+        """
+        result = await self.collection.find_one_and_update(
+            {
+                "_id": ObjectId(job_id),
+                "user_id": user_id,
+                "status": {"$in": ["queued", "running"]},
+            },
+            [
+                {
+                    "$set": {
+                        "status": "cancelled",
+                        "updated_at": "$$NOW",
+                        "completed_at": "$$NOW",
+                    }
+                }
+            ],
+            return_document=ReturnDocument.AFTER,
+        )
+        if result:
+            return self._doc_to_model(result, ScrapeJob)
+
+        # Nothing was updated: tell a missing job from one that already finished
+        job = await self.collection.find_one(
+            {"_id": ObjectId(job_id), "user_id": user_id},
+            {"status": 1},
+        )
+        if not job:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot cancel job with status '{job.status}'",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Scrape job not found",
             )
-
-        return await self.update_job_status(job_id, "cancelled")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot cancel job with status '{job['status']}'",
+        )
 
     async def get_running_jobs_count(self, user_id: str) -> int:
         """Get count of running jobs for a user."""
         return await self.collection.count_documents(
-            {"user_id": user_id, "status": "running"}
+            {"user_id": user_id, "status": "running"},
+            hint=[("user_id", 1), ("status", 1)],
         )
 
-    async def get_queued_jobs(self, limit: int = 10) -> list[ScrapeJob]:
-        """Get queued jobs for processing (oldest first)."""
+    async def get_queued_jobs(self, limit: int = 10) -> list[ScrapeJobSummary]:
+        """Get queued jobs for processing (oldest first).
+
+        Only the fields needed to schedule a job are fetched; load the full
+        job with get_job when it is picked up.
+        """
         cursor = (
-            self.collection.find({"status": "queued"})
+            self.collection.find(
+                {"status": "queued"},
+                {
+                    "project_id": 1,
+                    "user_id": 1,
+                    "status": 1,
+                    "trigger": 1,
+                    "created_at": 1,
+                },
+            )
             .sort("created_at", 1)
             .limit(limit)
         )
         jobs = await cursor.to_list(length=limit)
-        return [self._doc_to_model(j, ScrapeJob) for j in jobs]
+        return [self._doc_to_model_trusted(j, ScrapeJobSummary) for j in jobs]
 
     async def increment_stats(
         self,
@@ -238,17 +374,31 @@ class ScrapeJobRepository(BaseRepository):
         amount: int = 1,
     ) -> None:
         """Increment a stats field."""
+        await self.increment_stats_bulk(job_id, {field: amount})
+
+    async def increment_stats_bulk(self, job_id: str, increments: dict[str, int]) -> None:
+        """Increment several stats fields in one update.
+
+        While the job stats buffer is running the increments are queued and
+        written with other pending increments on the next flush.
+        """
+        if _job_stats_buffer.running:
+            oid = ObjectId(job_id)
+            for field, amount in increments.items():
+                _job_stats_buffer.add(oid, field, amount)
+            return
+
         await self.collection.update_one(
             {"_id": ObjectId(job_id)},
             {
-                "$inc": {f"stats.{field}": amount},
-                "$set": {"updated_at": datetime.now(timezone.utc)},
+                "$inc": {f"stats.{field}": amount for field, amount in increments.items()},
+                "$currentDate": {"updated_at": True},
             },
         )
 
 
 def get_scrape_job_repository(
-    db: AsyncIOMotorDatabase = Depends(get_database),
+    db: AsyncDatabase = Depends(get_database),
 ) -> ScrapeJobRepository:
     """Dependency for getting scrape job repository."""
     return ScrapeJobRepository(db)
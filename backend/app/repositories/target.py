@@ -1,9 +1,10 @@
 """Target repository for database operations."""
 
 import re
-from datetime import datetime
+from collections.abc import Callable
+from datetime import datetime, timezone
 from typing import Any
-from urllib.parse import urlparse
+from urllib.parse import SplitResult, urlsplit
 
 from bson import ObjectId
 
@@ -52,52 +53,76 @@ PLATFORM_PATTERNS = {
 }
 
 
-def detect_platform(url: str) -> str | None:
-    """Detect platform from URL."""
-    parsed = urlparse(url)
+# One alternation per platform, compiled once at import
+_COMPILED_PLATFORM_PATTERNS: list[tuple[str, re.Pattern[str]]] = [
+    (platform, re.compile("|".join(f"(?:{p})" for p in patterns)))
+    for platform, patterns in PLATFORM_PATTERNS.items()
+]
+
+
+def detect_platform(parsed: SplitResult) -> str | None:
+    """Detect platform from a split URL."""
     domain = parsed.netloc.lower()
 
-    for platform, patterns in PLATFORM_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, domain):
-                return platform
+    for platform, pattern in _COMPILED_PLATFORM_PATTERNS:
+        if pattern.search(domain):
+            return platform
 
     return None
 
 
-def extract_platform_data(url: str, platform: str) -> PlatformData:
-    """Extract platform-specific data from URL."""
-    data = PlatformData()
-    parsed = urlparse(url)
-    path = parsed.path
-
-    if platform == "amazon":
-        # Extract ASIN from Amazon URL
-        asin_match = re.search(r"/dp/([A-Z0-9]{10})", path)
-        if asin_match:
-            data.asin = asin_match.group(1)
-
-    elif platform == "steam":
-        # Extract app ID from Steam URL
-        app_match = re.search(r"/app/(\d+)", path)
-        if app_match:
-            data.app_id = int(app_match.group(1))
-
-    elif platform == "youtube":
-        # Extract video ID
-        if "youtu.be" in parsed.netloc:
-            data.video_id = path.strip("/")
-        else:
-            video_match = re.search(r"[?&]v=([^&]+)", parsed.query or "")
-            if video_match:
-                data.video_id = video_match.group(1)
-
-    elif platform == "reddit":
-        # Extract post ID
-        post_match = re.search(r"/comments/([a-z0-9]+)", path)
-        if post_match:
-            data.post_id = post_match.group(1)
+# Platform ID extractors, compiled once at import
+_ASIN_RE = re.compile(r"/dp/([A-Z0-9]{10})")
+_STEAM_APP_RE = re.compile(r"/app/(\d+)")
+_YT_V_RE = re.compile(r"(?:^|&)v=([^&]+)")
+_REDDIT_POST_RE = re.compile(r"/comments/([a-z0-9]+)")
+
+
+def _extract_amazon(parsed: SplitResult, data: PlatformData) -> None:
+    """Extract ASIN from Amazon URL."""
+    asin_match = _ASIN_RE.search(parsed.path)
+    if asin_match:
+        data.asin = asin_match.group(1)
+
+
+def _extract_steam(parsed: SplitResult, data: PlatformData) -> None:
+    """Extract app ID from Steam URL."""
+    app_match = _STEAM_APP_RE.search(parsed.path)
+    if app_match:
+        data.app_id = int(app_match.group(1))
+
+
+def _extract_youtube(parsed: SplitResult, data: PlatformData) -> None:
+    """Extract video ID from YouTube URL."""
+    if "youtu.be" in parsed.netloc:
+        data.video_id = parsed.path.strip("/")
+    else:
+        video_match = _YT_V_RE.search(parsed.query or "")
+        if video_match:
+            data.video_id = video_match.group(1)
 
+
+def _extract_reddit(parsed: SplitResult, data: PlatformData) -> None:
+    """Extract post ID from Reddit URL."""
+    post_match = _REDDIT_POST_RE.search(parsed.path)
+    if post_match:
+        data.post_id = post_match.group(1)
+
+
+_PLATFORM_EXTRACTORS: dict[str, Callable[[SplitResult, PlatformData], None]] = {
+    "amazon": _extract_amazon,
+    "steam": _extract_steam,
+    "youtube": _extract_youtube,
+    "reddit": _extract_reddit,
+}
+
+
+def extract_platform_data(parsed: SplitResult, platform: str) -> PlatformData:
+    """Extract platform-specific data from a split URL."""
+    data = PlatformData()
+    extractor = _PLATFORM_EXTRACTORS.get(platform)
+    if extractor:
+        extractor(parsed, data)
     return data
 
 
@@ -111,12 +136,49 @@ class TargetRepository(BaseRepository[TargetInDB]):
         self, project_id: str, user_id: str, target_data: TargetCreate
     ) -> Target:
         """Create a new target."""
+        data = self._build_target_doc(project_id, user_id, target_data)
+        target_in_db = await self.create(data)
+        return self._to_target(target_in_db)
+
+    async def create_targets_bulk(
+        self, project_id: str, user_id: str, bulk_data: TargetBulkCreate
+    ) -> list[Target]:
+        """Create multiple targets at once with a single insert."""
+        if not bulk_data.urls:
+            return []
+
+        # Build every document up front, then write them in one round trip
+        now = datetime.now(timezone.utc)
+        docs = [
+            {
+                **self._build_target_doc(
+                    project_id,
+                    user_id,
+                    TargetCreate(url=url, options=bulk_data.options),
+                ),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for url in bulk_data.urls
+        ]
+
+        # insert_many sets _id on each document in place
+        await self.collection.insert_many(docs, ordered=False)
+        return [self._to_target(TargetInDB(**doc)) for doc in docs]
+
+    def _build_target_doc(
+        self, project_id: str, user_id: str, target_data: TargetCreate
+    ) -> dict[str, Any]:
+        """Build the document for a new target."""
+        # Parse once and share the result across detection and labelling
+        parsed = urlsplit(target_data.url)
+
         # Detect platform
-        platform = detect_platform(target_data.url)
+        platform = detect_platform(parsed)
         platform_data = PlatformData()
 
         if platform:
-            platform_data = extract_platform_data(target_data.url, platform)
+            platform_data = extract_platform_data(parsed, platform)
 
         # Determine detected type based on platform
         detected_type = None
@@ -131,11 +193,12 @@ class TargetRepository(BaseRepository[TargetInDB]):
         elif platform in ("google", "trustpilot", "yelp"):
             detected_type = "business"
 
-        data = {
+        return {
             "project_id": project_id,
             "user_id": user_id,
             "url": target_data.url,
-            "label": target_data.label or self._generate_label(target_data.url, platform),
+            "label": target_data.label
+            or self._generate_label(parsed, platform, target_data.url),
             "platform": platform,
             "detected_type": detected_type,
             "platform_data": platform_data.model_dump(),
@@ -146,20 +209,6 @@ class TargetRepository(BaseRepository[TargetInDB]):
             "error_message": None,
         }
 
-        target_in_db = await self.create(data)
-        return self._to_target(target_in_db)
-
-    async def create_targets_bulk(
-        self, project_id: str, user_id: str, bulk_data: TargetBulkCreate
-    ) -> list[Target]:
-        """Create multiple targets at once."""
-        targets = []
-        for url in bulk_data.urls:
-            target_data = TargetCreate(url=url, options=bulk_data.options)
-            target = await self.create_target(project_id, user_id, target_data)
-            targets.append(target)
-        return targets
-
     async def get_target(
         self, target_id: str, user_id: str | None = None
     ) -> Target:
@@ -201,24 +250,23 @@ class TargetRepository(BaseRepository[TargetInDB]):
     async def update_target(
         self, target_id: str, user_id: str, update_data: TargetUpdate
     ) -> Target:
-        """Update a target."""
-        await self.get_target(target_id, user_id)
-
+        """Update a target, scoped to its owner in the same write."""
         data = update_data.model_dump(exclude_unset=True)
 
         if "options" in data and data["options"]:
             data["options"] = data["options"]
 
-        target_in_db = await self.update(target_id, data)
+        target_in_db = await self.update(target_id, data, {"user_id": user_id})
         if not target_in_db:
             raise TargetNotFoundError()
 
         return self._to_target(target_in_db)
 
     async def delete_target(self, target_id: str, user_id: str) -> bool:
-        """Delete a target."""
-        await self.get_target(target_id, user_id)
-        return await self.delete(target_id)
+        """Delete a target, scoped to its owner in the same write."""
+        if not await self.delete(target_id, {"user_id": user_id}):
+            raise TargetNotFoundError()
+        return True
 
     async def delete_targets_by_project(self, project_id: str) -> int:
         """Delete all targets for a project."""
@@ -232,26 +280,33 @@ class TargetRepository(BaseRepository[TargetInDB]):
         update_dict = {f"stats.{k}": v for k, v in stats_update.items()}
         await self.collection.update_one(
             {"_id": ObjectId(target_id)},
-            {"$set": update_dict},
+            {"$set": update_dict, "$currentDate": {"updated_at": True}},
         )
 
     async def set_error(self, target_id: str, error_message: str) -> None:
         """Set target error status."""
         await self.collection.update_one(
             {"_id": ObjectId(target_id)},
-            {"$set": {"status": "error", "error_message": error_message}},
+            {
+                "$set": {"status": "error", "error_message": error_message},
+                "$currentDate": {"updated_at": True},
+            },
         )
 
     async def clear_error(self, target_id: str) -> None:
         """Clear target error status."""
         await self.collection.update_one(
             {"_id": ObjectId(target_id)},
-            {"$set": {"status": "active", "error_message": None}},
+            {
+                "$set": {"status": "active", "error_message": None},
+                "$currentDate": {"updated_at": True},
+            },
         )
 
-    def _generate_label(self, url: str, platform: str | None) -> str:
-        """Generate a label from URL."""
-        parsed = urlparse(url)
+    def _generate_label(
+        self, parsed: SplitResult, platform: str | None, url: str
+    ) -> str:
+        """Generate a label from a split URL."""
         path = parsed.path.strip("/")
 
         if platform == "amazon" and "/dp/" in path:
@@ -269,8 +324,8 @@ class TargetRepository(BaseRepository[TargetInDB]):
         return parsed.netloc[:50] if parsed.netloc else url[:50]
 
     def _to_target(self, target_in_db: TargetInDB) -> Target:
-        """Convert TargetInDB to Target."""
-        return Target(
+        """Convert TargetInDB to Target without revalidating its fields."""
+        return Target.model_construct(
             id=target_in_db.id,
             project_id=target_in_db.project_id,
             user_id=target_in_db.user_id,
@@ -1,15 +1,43 @@
 """User repository for database operations."""
 
-from datetime import datetime
+import asyncio
+import hashlib
+import hmac
 from typing import Any
 
 from bson import ObjectId
 
+from app.core.cache import InMemoryCache
+from app.core.config import get_settings
 from app.core.exceptions import EmailAlreadyExistsError, UserNotFoundError
 from app.models.user import User, UserCreate, UserInDB, UserUpdate
 from app.repositories.base import BaseRepository
 from app.utils.password import hash_password, verify_password
 
+# Short-lived caches that let repeated logins skip the lookup and the KDF.
+# Users are cached by email; credentials by email -> HMAC of the password
+# that last verified and the stored hash it verified against, so a changed
+# hash invalidates the entry in every process once the user cache expires.
+# This process clears both when a password or status changes.
+_auth_user_cache = InMemoryCache(default_ttl=5, max_size=4096)
+_auth_credential_cache = InMemoryCache(default_ttl=30, max_size=4096)
+
+# Fields never needed to describe a user to the rest of the app
+_PROFILE_PROJECTION = {"password_hash": 0, "oauth_tokens": 0}
+
+
+def _credential_digest(email: str, password: str, password_hash: str) -> bytes:
+    """Keyed digest of a login attempt, never the password itself."""
+    key = get_settings().secret_key.encode()
+    message = f"{email}\0{password}\0{password_hash}".encode()
+    return hmac.new(key, message, hashlib.sha256).digest()[:16]
+
+
+def _invalidate_auth_cache(email: str) -> None:
+    """Forget cached login state for an email."""
+    _auth_user_cache.delete(email)
+    _auth_credential_cache.delete(email)
+
 
 class UserRepository(BaseRepository[UserInDB]):
     """Repository for user database operations."""
@@ -18,16 +46,26 @@ class UserRepository(BaseRepository[UserInDB]):
     model_class = UserInDB
 
     async def create_user(self, user_data: UserCreate) -> User:
-        """Create a new user with hashed password."""
-        # Check if email already exists
-        if await self.email_exists(user_data.email):
+        """Create a new user with hashed password.
+
+        The password is hashed in a worker thread while the email check
+        runs, so the KDF neither blocks the event loop nor adds to latency.
+        """
+        hash_task = asyncio.create_task(asyncio.to_thread(hash_password, user_data.password))
+        try:
+            email_taken = await self.email_exists(user_data.email)
+        except BaseException:
+            hash_task.cancel()
+            raise
+        if email_taken:
+            hash_task.cancel()
             raise EmailAlreadyExistsError()
 
-        # Hash password and prepare data
+        # Prepare data
         data = {
             "email": user_data.email.lower(),
             "name": user_data.name,
-            "password_hash": hash_password(user_data.password),
+            "password_hash": await hash_task,
             "is_active": True,
             "is_verified": False,
             "role": "user",
@@ -40,21 +78,38 @@ class UserRepository(BaseRepository[UserInDB]):
 
     async def get_user_by_id(self, user_id: str) -> User | None:
         """Get a user by ID (without password hash)."""
-        user_in_db = await self.get_by_id(user_id)
-        if user_in_db:
-            return self._to_user(user_in_db)
-        return None
+        oid = self._coerce_id(user_id)
+        if oid is None:
+            return None
+        return await self._get_profile({"_id": oid})
 
     async def get_user_by_email(self, email: str) -> User | None:
         """Get a user by email (without password hash)."""
-        user_in_db = await self.get_one({"email": email.lower()})
-        if user_in_db:
-            return self._to_user(user_in_db)
+        return await self.get_user_profile_by_email(email)
+
+    async def get_user_profile_by_email(self, email: str) -> User | None:
+        """Get a user's profile by email, never reading the password hash."""
+        return await self._get_profile({"email": email.lower()})
+
+    async def _get_profile(self, filter: dict[str, Any]) -> User | None:
+        """Read a user without the fields that must not leave the repository."""
+        doc = await self.collection.find_one(filter, _PROFILE_PROJECTION)
+        if doc:
+            return self._doc_to_model_trusted(doc, User)
         return None
 
     async def get_user_with_password(self, email: str) -> UserInDB | None:
-        """Get a user by email with password hash for authentication."""
-        return await self.get_one({"email": email.lower()})
+        """Get a user by email with password hash for authentication.
+
+        Lookups are cached for a few seconds to absorb bursts of logins.
+        """
+        email = email.lower()
+        user_in_db = _auth_user_cache.get(email)
+        if user_in_db is None:
+            user_in_db = await self.get_one({"email": email})
+            if user_in_db:
+                _auth_user_cache.set(email, user_in_db)
+        return user_in_db
 
     async def update_user(self, user_id: str, user_data: UserUpdate) -> User | None:
         """Update user information."""
@@ -62,8 +117,17 @@ class UserRepository(BaseRepository[UserInDB]):
         if not update_data:
             return await self.get_user_by_id(user_id)
 
+        # Logins are cached by email, so an email change must clear the old one too
+        old_email = None
+        if "email" in update_data:
+            current = await self.get_by_id(user_id)
+            old_email = current.email if current else None
+
         user_in_db = await self.update(user_id, update_data)
         if user_in_db:
+            _invalidate_auth_cache(user_in_db.email)
+            if old_email and old_email != user_in_db.email:
+                _invalidate_auth_cache(old_email)
             return self._to_user(user_in_db)
         return None
 
@@ -75,20 +139,33 @@ class UserRepository(BaseRepository[UserInDB]):
         if not user_in_db:
             raise UserNotFoundError()
 
-        if not verify_password(current_password, user_in_db.password_hash):
+        if not await asyncio.to_thread(
+            verify_password, current_password, user_in_db.password_hash
+        ):
             return False
 
-        await self.update(user_id, {"password_hash": hash_password(new_password)})
+        password_hash = await asyncio.to_thread(hash_password, new_password)
+        await self.update(user_id, {"password_hash": password_hash})
+        _invalidate_auth_cache(user_in_db.email)
         return True
 
     async def set_password(self, user_id: str, new_password: str) -> bool:
         """Set user password (for password reset)."""
-        result = await self.update(user_id, {"password_hash": hash_password(new_password)})
+        password_hash = await asyncio.to_thread(hash_password, new_password)
+        result = await self.update(user_id, {"password_hash": password_hash})
+        if result is not None:
+            _invalidate_auth_cache(result.email)
         return result is not None
 
     async def update_last_login(self, user_id: str) -> None:
         """Update user's last login timestamp."""
-        await self.update(user_id, {"last_login": datetime.utcnow()})
+        oid = self._coerce_id(user_id)
+        if oid is None:
+            return
+        await self.collection.update_one(
+            {"_id": oid},
+            {"$currentDate": {"last_login": True, "updated_at": True}},
+        )
 
     async def verify_user(self, user_id: str) -> bool:
         """Mark user as verified."""
@@ -98,11 +175,15 @@ class UserRepository(BaseRepository[UserInDB]):
     async def deactivate_user(self, user_id: str) -> bool:
         """Deactivate a user account."""
         result = await self.update(user_id, {"is_active": False})
+        if result is not None:
+            _invalidate_auth_cache(result.email)
         return result is not None
 
     async def activate_user(self, user_id: str) -> bool:
         """Activate a user account."""
         result = await self.update(user_id, {"is_active": True})
+        if result is not None:
+            _invalidate_auth_cache(result.email)
         return result is not None
 
     async def email_exists(self, email: str) -> bool:
@@ -110,13 +191,25 @@ class UserRepository(BaseRepository[UserInDB]):
         return await self.exists({"email": email.lower()})
 
     async def authenticate(self, email: str, password: str) -> User | None:
-        """Authenticate a user by email and password."""
+        """Authenticate a user by email and password.
+
+        A password that verified in the last few seconds is accepted from
+        the credential cache without rerunning the KDF; is_active is
+        always checked.
+        """
+        email = email.lower()
         user_in_db = await self.get_user_with_password(email)
         if not user_in_db:
             return None
 
-        if not verify_password(password, user_in_db.password_hash):
-            return None
+        digest = _credential_digest(email, password, user_in_db.password_hash)
+        cached = _auth_credential_cache.get(email)
+        if cached is None or not hmac.compare_digest(cached, digest):
+            if not await asyncio.to_thread(
+                verify_password, password, user_in_db.password_hash
+            ):
+                return None
+            _auth_credential_cache.set(email, digest)
 
         if not user_in_db.is_active:
             return None
@@ -128,8 +221,8 @@ class UserRepository(BaseRepository[UserInDB]):
         return self._to_user(user_in_db)
 
     def _to_user(self, user_in_db: UserInDB) -> User:
-        """Convert UserInDB to User (removing password hash)."""
-        return User(
+        """Convert UserInDB to User (removing password hash) without revalidation."""
+        return User.model_construct(
             id=user_in_db.id,
             email=user_in_db.email,
             name=user_in_db.name,
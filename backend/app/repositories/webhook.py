@@ -1,11 +1,12 @@
 """Webhook repository for database operations."""
 
+import asyncio
 from datetime import datetime, timezone
 from typing import Any
 
 from bson import ObjectId
 from fastapi import Depends, HTTPException, status
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.core.database import get_database
 from app.models.webhook import (
@@ -16,7 +17,23 @@ from app.models.webhook import (
     WebhookList,
     WebhookUpdate,
 )
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, InsertBuffer
+
+# Characters of a webhook response kept in the delivery log, and the bytes
+# to read for them (a UTF-8 character is at most 4 bytes)
+RESPONSE_BODY_MAX_CHARS = 1000
+RESPONSE_BODY_MAX_BYTES = RESPONSE_BODY_MAX_CHARS * 4
+
+# Delivery history is listed newest first; _id orders same-instant deliveries
+_DELIVERIES_SORT = [("delivered_at", -1), ("_id", -1)]
+
+# Global buffer that batches delivery log inserts
+_delivery_buffer = InsertBuffer("webhook_deliveries")
+
+
+def get_delivery_buffer() -> InsertBuffer:
+    """Get the process-wide webhook delivery log buffer."""
+    return _delivery_buffer
 
 
 class WebhookRepository(BaseRepository):
@@ -25,7 +42,7 @@ class WebhookRepository(BaseRepository):
     collection_name = "webhooks"
     model_class = Webhook
 
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncDatabase):
         super().__init__()
         self.deliveries_collection = db["webhook_deliveries"]
 
@@ -49,6 +66,7 @@ class WebhookRepository(BaseRepository):
             "last_triggered": None,
             "last_status": None,
             "consecutive_failures": 0,
+            "deliveries_count": 0,
             "created_at": now,
             "updated_at": now,
         }
@@ -68,7 +86,7 @@ class WebhookRepository(BaseRepository):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Webhook not found",
             )
-        return self._doc_to_model(doc, Webhook)
+        return self._doc_to_model_trusted(doc, Webhook)
 
     async def get_webhooks(
         self,
@@ -87,7 +105,7 @@ class WebhookRepository(BaseRepository):
         webhooks = await cursor.to_list(length=None)
 
         return WebhookList(
-            items=[self._doc_to_model(w, Webhook) for w in webhooks],
+            items=[self._doc_to_model_trusted(w, Webhook) for w in webhooks],
             total=len(webhooks),
         )
 
@@ -115,7 +133,7 @@ class WebhookRepository(BaseRepository):
         cursor = self.collection.find(query)
         webhooks = await cursor.to_list(length=None)
 
-        return [self._doc_to_model(w, Webhook) for w in webhooks]
+        return [self._doc_to_model_trusted(w, Webhook) for w in webhooks]
 
     async def update_webhook(
         self,
@@ -142,7 +160,7 @@ class WebhookRepository(BaseRepository):
                 detail="Webhook not found",
             )
 
-        return self._doc_to_model(result, Webhook)
+        return self._doc_to_model_trusted(result, Webhook)
 
     async def delete_webhook(self, webhook_id: str, user_id: str) -> None:
         """Delete a webhook."""
@@ -161,11 +179,15 @@ class WebhookRepository(BaseRepository):
         event: str,
         payload: dict[str, Any],
         status_code: int | None,
-        response_body: str | None,
+        response_body: bytes | None,
         error: str | None,
         duration_ms: float | None,
     ) -> None:
-        """Record a webhook delivery attempt."""
+        """Record a webhook delivery attempt.
+
+        response_body is the raw prefix read from the response; it is
+        decoded leniently and cut to RESPONSE_BODY_MAX_CHARS.
+        """
         now = datetime.now(timezone.utc)
 
         delivery_doc = {
@@ -173,40 +195,50 @@ class WebhookRepository(BaseRepository):
             "event": event,
             "payload": payload,
             "status_code": status_code,
-            "response_body": response_body[:1000] if response_body else None,  # Truncate
+            "response_body": (
+                response_body.decode("utf-8", errors="replace")[:RESPONSE_BODY_MAX_CHARS]
+                if response_body
+                else None
+            ),
             "error": error,
             "delivered_at": now,
             "duration_ms": duration_ms,
         }
-        await self.deliveries_collection.insert_one(delivery_doc)
 
-        # Update webhook status
+        # Update webhook status in one server-side step. Every field in a
+        # $set stage sees the pre-update document, so the disable check
+        # reads the failure count before this delivery is added to it.
         success = status_code is not None and 200 <= status_code < 300
-        update: dict[str, Any] = {
+        failures = {"$ifNull": ["$consecutive_failures", 0]}
+        status_update: dict[str, Any] = {
             "last_triggered": now,
             "last_status": status_code,
             "updated_at": now,
+            # Webhooks created before the counter existed count from zero;
+            # scripts/reconcile_webhook_delivery_counts.py sets their totals
+            "deliveries_count": {"$add": [{"$ifNull": ["$deliveries_count", 0]}, 1]},
         }
-
         if success:
-            update["consecutive_failures"] = 0
+            status_update["consecutive_failures"] = 0
         else:
-            update["$inc"] = {"consecutive_failures": 1}
+            status_update["consecutive_failures"] = {"$add": [failures, 1]}
             # Disable after 5 consecutive failures
-            webhook = await self.collection.find_one({"_id": ObjectId(webhook_id)})
-            if webhook and webhook.get("consecutive_failures", 0) >= 4:
-                update["enabled"] = False
-
-        if "$inc" in update:
-            inc_update = update.pop("$inc")
-            await self.collection.update_one(
-                {"_id": ObjectId(webhook_id)},
-                {"$set": update, "$inc": inc_update},
-            )
+            status_update["enabled"] = {
+                "$cond": [{"$gte": [failures, 4]}, False, "$enabled"]
+            }
+
+        update = self.collection.update_one(
+            {"_id": ObjectId(webhook_id)},
+            [{"$set": status_update}],
+        )
+        # The delivery log is batched while the buffer runs; the webhook's
+        # status is written immediately since it gates the next delivery
+        if _delivery_buffer.running:
+            _delivery_buffer.add(delivery_doc)
+            await update
         else:
-            await self.collection.update_one(
-                {"_id": ObjectId(webhook_id)},
-                {"$set": update},
+            await asyncio.gather(
+                self.deliveries_collection.insert_one(delivery_doc), update
             )
 
     async def get_deliveries(
@@ -214,19 +246,40 @@ class WebhookRepository(BaseRepository):
         webhook_id: str,
         page: int = 1,
         page_size: int = 20,
+        before: tuple[datetime, ObjectId] | None = None,
+        include_total: bool = True,
     ) -> WebhookDeliveryList:
-        """Get delivery history for a webhook."""
-        query = {"webhook_id": webhook_id}
-        total = await self.deliveries_collection.count_documents(query)
+        """Get delivery history for a webhook, newest first.
+
+        Passing before (the delivered_at and _id of the last item already
+        seen) pages by keyset instead of skip(), so deep pages cost the same
+        as the first. total is None when include_total is False; otherwise it
+        comes from the webhook's deliveries_count rather than a count of
+        the delivery log.
+        """
+        query: dict[str, Any] = {"webhook_id": webhook_id}
+        if before is not None:
+            delivered_at, oid = before
+            query["$or"] = [
+                {"delivered_at": {"$lt": delivered_at}},
+                {"delivered_at": delivered_at, "_id": {"$lt": oid}},
+            ]
+            page = 1
         skip = (page - 1) * page_size
 
         cursor = (
             self.deliveries_collection.find(query)
-            .sort("delivered_at", -1)
+            .sort(_DELIVERIES_SORT)
             .skip(skip)
             .limit(page_size)
         )
-        deliveries = await cursor.to_list(length=page_size)
+        if include_total:
+            total, deliveries = await asyncio.gather(
+                self._delivery_total(webhook_id),
+                cursor.to_list(length=page_size),
+            )
+        else:
+            total, deliveries = None, await cursor.to_list(length=page_size)
 
         items = []
         for d in deliveries:
@@ -240,9 +293,16 @@ class WebhookRepository(BaseRepository):
             page_size=page_size,
         )
 
+    async def _delivery_total(self, webhook_id: str) -> int:
+        """Read a webhook's delivery count."""
+        doc = await self.collection.find_one(
+            {"_id": ObjectId(webhook_id)}, {"deliveries_count": 1}
+        )
+        return doc.get("deliveries_count", 0) if doc else 0
+
 
 def get_webhook_repository(
-    db: AsyncIOMotorDatabase = Depends(get_database),
+    db: AsyncDatabase = Depends(get_database),
 ) -> WebhookRepository:
     """Dependency for getting webhook repository."""
     return WebhookRepository(db)
@@ -1,7 +1,7 @@
 """Authentication service with business logic."""
 
 import hashlib
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 import structlog
 from bson import ObjectId
@@ -25,6 +25,15 @@ from app.repositories.user import UserRepository
 logger = structlog.get_logger(__name__)
 
 
+def _hash_token(token: str) -> str:
+    """Fingerprint a refresh token for storage and lookup.
+
+    Stored hashes are SHA-256 hex digests, so changing the algorithm would
+    invalidate every live session.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 class AuthService:
     """Service for authentication operations."""
 
@@ -93,8 +102,9 @@ class AuthService:
         if not user_id:
             raise InvalidTokenError("Invalid refresh token")
 
-        # Check if token is blacklisted
-        if await self._is_token_revoked(refresh_token):
+        # Refresh tokens are single-use: claiming the stored token both checks
+        # it was not revoked and revokes it, so a replay can never succeed
+        if not await self._revoke_refresh_token(refresh_token):
             raise TokenBlacklistedError()
 
         # Get user
@@ -102,9 +112,6 @@ class AuthService:
         if not user or not user.is_active:
             raise InvalidTokenError("User not found or inactive")
 
-        # Revoke old refresh token
-        await self._revoke_refresh_token(refresh_token)
-
         # Create new tokens
         new_access_token = create_access_token(
             subject=user_id,
@@ -130,32 +137,25 @@ class AuthService:
         settings = get_settings()
         collection = MongoDB.get_collection("refresh_tokens")
 
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
-        expires_at = datetime.utcnow() + timedelta(days=settings.jwt_refresh_token_expire_days)
+        token_hash = _hash_token(token)
+        now = datetime.now(timezone.utc)
 
         await collection.insert_one(
             {
                 "user_id": ObjectId(user_id),
                 "token_hash": token_hash,
-                "expires_at": expires_at,
-                "created_at": datetime.utcnow(),
+                "expires_at": now + timedelta(days=settings.jwt_refresh_token_expire_days),
+                "created_at": now,
             }
         )
 
-    async def _revoke_refresh_token(self, token: str) -> None:
-        """Revoke a refresh token."""
-        collection = MongoDB.get_collection("refresh_tokens")
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
-
-        await collection.delete_one({"token_hash": token_hash})
-
-    async def _is_token_revoked(self, token: str) -> bool:
-        """Check if a refresh token has been revoked."""
+    async def _revoke_refresh_token(self, token: str) -> bool:
+        """Revoke a refresh token, returning False if it was already revoked."""
         collection = MongoDB.get_collection("refresh_tokens")
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        token_hash = _hash_token(token)
 
-        doc = await collection.find_one({"token_hash": token_hash})
-        return doc is None
+        result = await collection.delete_one({"token_hash": token_hash})
+        return result.deleted_count == 1
 
     async def revoke_all_user_tokens(self, user_id: str) -> None:
         """Revoke all refresh tokens for a user."""
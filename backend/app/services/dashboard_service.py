@@ -1,12 +1,95 @@
 """Dashboard statistics service."""
 
+import asyncio
+import heapq
+from collections import defaultdict
+from itertools import islice
 from datetime import datetime, timezone, timedelta
+from types import MappingProxyType
 from typing import Any
 
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
 
+from app.core.cache import InMemoryCache
 from app.models.base import StudioBaseModel
 
+# Labels for the $dateTrunc bucket of each trend interval (the interval
+# names double as $dateTrunc units)
+_DATE_FORMAT = MappingProxyType({
+    "hour": "%Y-%m-%dT%H:00",
+    "day": "%Y-%m-%d",
+    "week": "%G-W%V",
+    "month": "%Y-%m",
+})
+
+# Up to this many matching results are reduced in Python instead of
+# through an aggregation pipeline
+_SMALL_RESULT_SET = 5000
+
+# Index serving the per-project result scans in project stats
+_PROJECT_RESULTS_INDEX = [("project_id", 1), ("user_id", 1), ("created_at", -1)]
+
+# Dashboard stats per user. Page loads and polling repeat the same read
+# within seconds, so a short TTL absorbs most of them.
+_dashboard_cache = InMemoryCache(default_ttl=10, max_size=1024)
+
+# Entries shown in the dashboard's recent jobs list and activity feed
+_RECENT_JOBS_LIMIT = 5
+_RECENT_ACTIVITY_LIMIT = 10
+
+# Dashboard pipeline pieces that do not depend on the user or the clock,
+# built once and shared by every call
+_COUNT_STAGE: dict[str, Any] = {"$count": "n"}
+_RESULTS_FACET_BRANCHES: dict[str, Any] = {
+    "total": [_COUNT_STAGE],
+    "avg_sentiment": [
+        {"$group": {"_id": None, "v": {"$avg": "$analysis.sentiment.score"}}},
+    ],
+    "sentiment_dist": [
+        {"$group": {"_id": "$analysis.sentiment.label", "c": {"$sum": 1}}},
+    ],
+    "platform_dist": [
+        {"$group": {"_id": "$platform", "c": {"$sum": 1}}},
+    ],
+    "recent": [
+        {"$sort": {"created_at": -1}},
+        {"$limit": _RECENT_ACTIVITY_LIMIT},
+        {"$project": {"platform": 1, "created_at": 1}},
+    ],
+}
+_JOBS_FACET_BRANCHES: dict[str, Any] = {
+    "total": [_COUNT_STAGE],
+    # Feeds both recent_jobs and recent_activity
+    "recent": [
+        {"$sort": {"created_at": -1}},
+        {"$limit": _RECENT_ACTIVITY_LIMIT},
+        {"$project": {"project_id": 1, "status": 1, "progress": 1, "created_at": 1}},
+    ],
+}
+_PROJECTS_BY_STATUS_STAGE: dict[str, Any] = {
+    "$group": {"_id": "$status", "c": {"$sum": 1}},
+}
+
+# Fields read by the in-Python trend and emotion reductions
+_TREND_PROJECTION: dict[str, Any] = {
+    "_id": 0,
+    "created_at": 1,
+    "analysis.sentiment.score": 1,
+}
+_EMOTIONS_PROJECTION: dict[str, Any] = {"_id": 0, "analysis.emotions.detected": 1}
+
+
+def invalidate_dashboard_cache(user_id: str) -> None:
+    """Drop a user's cached dashboard stats after their data changes."""
+    _dashboard_cache.delete(user_id)
+
+
+def _facet_count(facet: dict[str, Any], branch: str) -> int:
+    """Read a {"$count": "n"} branch; $count emits nothing for zero matches."""
+    rows = facet.get(branch) or []
+    return rows[0]["n"] if rows else 0
+
 
 class DashboardStats(StudioBaseModel):
     """Overall dashboard statistics."""
@@ -43,75 +126,84 @@ class ProjectStats(StudioBaseModel):
 class DashboardService:
     """Service for aggregating dashboard statistics."""
 
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncDatabase):
         self.db = db
         self.projects = db["projects"]
         self.targets = db["targets"]
         self.results = db["results"]
         self.scrape_jobs = db["scrape_jobs"]
 
+    @staticmethod
+    async def _aggregate(
+        collection: AsyncCollection, pipeline: list[dict[str, Any]], length: int | None
+    ) -> list[dict[str, Any]]:
+        """Run an aggregation and collect up to ``length`` documents."""
+        cursor = await collection.aggregate(pipeline)
+        return await cursor.to_list(length)
+
     async def get_dashboard_stats(self, user_id: str) -> DashboardStats:
         """Get overall dashboard statistics for a user."""
+        cached = _dashboard_cache.get(user_id)
+        if cached is not None:
+            return cached
+
         now = datetime.now(timezone.utc)
         last_24h = now - timedelta(hours=24)
         last_7_days = now - timedelta(days=7)
 
-        # Project counts
-        total_projects = await self.projects.count_documents({"user_id": user_id})
-        active_projects = await self.projects.count_documents(
-            {"user_id": user_id, "status": "active"}
-        )
-
-        # Target count
-        total_targets = await self.targets.count_documents({"user_id": user_id})
-
-        # Result count
-        total_results = await self.results.count_documents({"user_id": user_id})
-        results_last_7_days = await self.results.count_documents(
-            {"user_id": user_id, "created_at": {"$gte": last_7_days}}
-        )
-
-        # Job counts
-        total_jobs = await self.scrape_jobs.count_documents({"user_id": user_id})
-        jobs_last_24h = await self.scrape_jobs.count_documents(
-            {"user_id": user_id, "created_at": {"$gte": last_24h}}
-        )
-
-        # Average sentiment
-        sentiment_pipeline = [
+        results_pipeline = [
             {"$match": {"user_id": user_id}},
-            {"$group": {"_id": None, "avg_score": {"$avg": "$analysis.sentiment.score"}}},
+            {"$facet": {
+                **_RESULTS_FACET_BRANCHES,
+                "last_7d": [
+                    {"$match": {"created_at": {"$gte": last_7_days}}},
+                    _COUNT_STAGE,
+                ],
+            }},
         ]
-        sentiment_result = await self.results.aggregate(sentiment_pipeline).to_list(1)
-        avg_sentiment = sentiment_result[0]["avg_score"] if sentiment_result else None
-
-        # Sentiment distribution
-        sentiment_dist_pipeline = [
+        jobs_pipeline = [
             {"$match": {"user_id": user_id}},
-            {"$group": {"_id": "$analysis.sentiment.label", "count": {"$sum": 1}}},
+            {"$facet": {
+                **_JOBS_FACET_BRANCHES,
+                "last_24h": [
+                    {"$match": {"created_at": {"$gte": last_24h}}},
+                    _COUNT_STAGE,
+                ],
+            }},
         ]
-        sentiment_dist_result = await self.results.aggregate(sentiment_dist_pipeline).to_list(10)
-        sentiment_distribution = {
-            r["_id"]: r["count"] for r in sentiment_dist_result if r["_id"]
-        }
-
-        # Platform distribution
-        platform_pipeline = [
+        projects_pipeline = [
             {"$match": {"user_id": user_id}},
-            {"$group": {"_id": "$platform", "count": {"$sum": 1}}},
+            _PROJECTS_BY_STATUS_STAGE,
         ]
-        platform_result = await self.results.aggregate(platform_pipeline).to_list(20)
+
+        # One round trip per collection, all in flight at once
+        results_facet, jobs_facet, project_counts, total_targets = await asyncio.gather(
+            self._aggregate(self.results, results_pipeline, 1),
+            self._aggregate(self.scrape_jobs, jobs_pipeline, 1),
+            self._aggregate(self.projects, projects_pipeline, None),
+            self.targets.count_documents({"user_id": user_id}),
+        )
+        results_facet = results_facet[0] if results_facet else {}
+        jobs_facet = jobs_facet[0] if jobs_facet else {}
+
+        projects_by_status = {r["_id"]: r["c"] for r in project_counts}
+        total_projects = sum(projects_by_status.values())
+        active_projects = projects_by_status.get("active", 0)
+
+        total_results = _facet_count(results_facet, "total")
+        results_last_7_days = _facet_count(results_facet, "last_7d")
+        avg_rows = results_facet.get("avg_sentiment") or []
+        avg_sentiment = avg_rows[0]["v"] if avg_rows else None
+        sentiment_distribution = {
+            r["_id"]: r["c"] for r in results_facet.get("sentiment_dist", []) if r["_id"]
+        }
         platform_distribution = {
-            r["_id"]: r["count"] for r in platform_result if r["_id"]
+            r["_id"]: r["c"] for r in results_facet.get("platform_dist", []) if r["_id"]
         }
 
-        # Recent jobs
-        recent_jobs_cursor = (
-            self.scrape_jobs.find({"user_id": user_id})
-            .sort("created_at", -1)
-            .limit(5)
-        )
-        recent_jobs_docs = await recent_jobs_cursor.to_list(5)
+        total_jobs = _facet_count(jobs_facet, "total")
+        jobs_last_24h = _facet_count(jobs_facet, "last_24h")
+        recent_job_docs = jobs_facet.get("recent", [])
         recent_jobs = [
             {
                 "id": str(j["_id"]),
@@ -120,13 +212,13 @@ class DashboardService:
                 "progress": j.get("progress", 0),
                 "created_at": j["created_at"],
             }
-            for j in recent_jobs_docs
+            for j in recent_job_docs[:_RECENT_JOBS_LIMIT]
         ]
+        recent_activity = self._recent_activity(
+            recent_job_docs, results_facet.get("recent", [])
+        )
 
-        # Recent activity (combined jobs and results)
-        recent_activity = await self._get_recent_activity(user_id, limit=10)
-
-        return DashboardStats(
+        stats = DashboardStats(
             total_projects=total_projects,
             active_projects=active_projects,
             total_targets=total_targets,
@@ -140,6 +232,8 @@ class DashboardService:
             recent_jobs=recent_jobs,
             recent_activity=recent_activity,
         )
+        _dashboard_cache.set(user_id, stats)
+        return stats
 
     async def get_project_stats(
         self,
@@ -147,50 +241,49 @@ class DashboardService:
         user_id: str,
     ) -> ProjectStats:
         """Get detailed statistics for a specific project."""
-        # Get project
-        project = await self.projects.find_one(
-            {"_id": project_id, "user_id": user_id}
-        )
-        project_name = project["name"] if project else "Unknown"
-
-        # Target counts
-        total_targets = await self.targets.count_documents(
-            {"project_id": project_id, "user_id": user_id}
-        )
-        active_targets = await self.targets.count_documents(
-            {"project_id": project_id, "user_id": user_id, "status": "active"}
-        )
-
-        # Result count
-        total_results = await self.results.count_documents(
-            {"project_id": project_id, "user_id": user_id}
-        )
+        scope = {"project_id": project_id, "user_id": user_id}
+        # Count and average in the same pass over the project's results
+        results_pipeline = [
+            {"$match": scope},
+            {"$group": {
+                "_id": None,
+                "count": {"$sum": 1},
+                "avg_score": {"$avg": "$analysis.sentiment.score"},
+            }},
+        ]
 
-        # Job count
-        total_jobs = await self.scrape_jobs.count_documents(
-            {"project_id": project_id, "user_id": user_id}
+        # None of these depend on each other, so issue them together
+        (
+            project,
+            total_targets,
+            active_targets,
+            total_jobs,
+            last_job,
+            results_summary,
+            sentiment_trend,
+            top_emotions,
+        ) = await asyncio.gather(
+            self.projects.find_one(
+                {"_id": project_id, "user_id": user_id}, {"name": 1}
+            ),
+            self.targets.count_documents(scope),
+            self.targets.count_documents({**scope, "status": "active"}),
+            self.scrape_jobs.count_documents(scope),
+            self.scrape_jobs.find_one(
+                {**scope, "status": "completed"},
+                {"completed_at": 1},
+                sort=[("completed_at", -1)],
+            ),
+            self._aggregate(self.results, results_pipeline, 1),
+            self._get_sentiment_trend(project_id, user_id, days=30),
+            self._get_top_emotions(project_id, user_id, limit=5),
         )
 
-        # Last scrape
-        last_job = await self.scrape_jobs.find_one(
-            {"project_id": project_id, "user_id": user_id, "status": "completed"},
-            sort=[("completed_at", -1)],
-        )
+        project_name = project["name"] if project else "Unknown"
         last_scrape = last_job.get("completed_at") if last_job else None
-
-        # Average sentiment
-        sentiment_pipeline = [
-            {"$match": {"project_id": project_id, "user_id": user_id}},
-            {"$group": {"_id": None, "avg_score": {"$avg": "$analysis.sentiment.score"}}},
-        ]
-        sentiment_result = await self.results.aggregate(sentiment_pipeline).to_list(1)
-        avg_sentiment = sentiment_result[0]["avg_score"] if sentiment_result else None
-
-        # Sentiment trend (last 30 days)
-        sentiment_trend = await self._get_sentiment_trend(project_id, user_id, days=30)
-
-        # Top emotions
-        top_emotions = await self._get_top_emotions(project_id, user_id, limit=5)
+        summary = results_summary[0] if results_summary else {}
+        total_results = summary.get("count", 0)
+        avg_sentiment = summary.get("avg_score")
 
         return ProjectStats(
             project_id=project_id,
@@ -205,32 +298,61 @@ class DashboardService:
             top_emotions=top_emotions,
         )
 
-    async def _get_recent_activity(
-        self,
-        user_id: str,
-        limit: int = 10,
+    @staticmethod
+    def _recent_activity(
+        jobs: list[dict],
+        results: list[dict],
+        limit: int = _RECENT_ACTIVITY_LIMIT,
     ) -> list[dict]:
-        """Get recent activity combining jobs and results."""
-        activity = []
-
-        # Get recent jobs
-        jobs_cursor = (
-            self.scrape_jobs.find({"user_id": user_id})
-            .sort("created_at", -1)
-            .limit(limit)
-        )
-        async for job in jobs_cursor:
-            activity.append({
+        """Merge already fetched recent jobs and results into one feed.
+
+        Both inputs come back from Mongo newest first, so a lazy merge
+        yields the feed in order without sorting.
+        """
+        job_events = (
+            {
                 "type": "job",
                 "id": str(job["_id"]),
                 "status": job["status"],
                 "timestamp": job["created_at"],
                 "description": f"Scrape job {job['status']}",
-            })
+            }
+            for job in jobs
+        )
+        result_events = (
+            {
+                "type": "result",
+                "id": str(result["_id"]),
+                "timestamp": result["created_at"],
+                "description": f"New {result.get('platform') or 'unknown'} result",
+            }
+            for result in results
+        )
+        merged = heapq.merge(
+            job_events, result_events, key=lambda x: x["timestamp"], reverse=True
+        )
+        return list(islice(merged, limit))
 
-        # Sort by timestamp and limit
-        activity.sort(key=lambda x: x["timestamp"], reverse=True)
-        return activity[:limit]
+    async def _fetch_if_small(
+        self,
+        query: dict[str, Any],
+        projection: dict[str, Any],
+    ) -> list[dict] | None:
+        """Fetch projected results, or None if more than _SMALL_RESULT_SET match.
+
+        Small sets are cheaper to reduce in Python than to push through an
+        aggregation; callers fall back to their pipeline on None. The size
+        is probed first with a capped count over the index keys, so large
+        projects never pull documents they will not use.
+        """
+        matched = await self.results.count_documents(
+            query, limit=_SMALL_RESULT_SET + 1, hint=_PROJECT_RESULTS_INDEX
+        )
+        if matched > _SMALL_RESULT_SET:
+            return None
+
+        cursor = self.results.find(query, projection).hint(_PROJECT_RESULTS_INDEX)
+        return await cursor.to_list(length=None)
 
     async def _get_sentiment_trend(
         self,
@@ -240,28 +362,50 @@ class DashboardService:
     ) -> list[dict]:
         """Get sentiment score trend over time."""
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        query = {
+            "project_id": project_id,
+            "user_id": user_id,
+            "created_at": {"$gte": cutoff},
+        }
+
+        docs = await self._fetch_if_small(query, _TREND_PROJECTION)
+        if docs is not None:
+            # date -> [count, score sum, scored count]
+            buckets: defaultdict[str, list] = defaultdict(lambda: [0, 0.0, 0])
+            for doc in docs:
+                bucket = buckets[doc["created_at"].strftime("%Y-%m-%d")]
+                bucket[0] += 1
+                score = ((doc.get("analysis") or {}).get("sentiment") or {}).get("score")
+                if score is not None:
+                    bucket[1] += score
+                    bucket[2] += 1
+            return [
+                {
+                    "date": date,
+                    "avg_score": total / scored if scored else None,
+                    "count": count,
+                }
+                for date, (count, total, scored) in sorted(buckets.items())
+            ]
 
         pipeline = [
-            {"$match": {
-                "project_id": project_id,
-                "user_id": user_id,
-                "created_at": {"$gte": cutoff},
-            }},
-            {"$project": {
-                "date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
-                "score": "$analysis.sentiment.score",
-            }},
+            {"$match": query},
             {"$group": {
-                "_id": "$date",
-                "avg_score": {"$avg": "$score"},
+                "_id": {"$dateTrunc": {"date": "$created_at", "unit": "day"}},
+                "avg_score": {"$avg": "$analysis.sentiment.score"},
                 "count": {"$sum": 1},
             }},
             {"$sort": {"_id": 1}},
         ]
 
-        result = await self.results.aggregate(pipeline).to_list(days)
+        # A window of N days starting mid-day touches N + 1 calendar days
+        result = await self._aggregate(self.results, pipeline, days + 1)
         return [
-            {"date": r["_id"], "avg_score": r["avg_score"], "count": r["count"]}
+            {
+                "date": r["_id"].strftime("%Y-%m-%d"),
+                "avg_score": r["avg_score"],
+                "count": r["count"],
+            }
             for r in result
         ]
 
@@ -272,8 +416,32 @@ class DashboardService:
         limit: int = 5,
     ) -> list[dict]:
         """Get top detected emotions."""
+        query = {"project_id": project_id, "user_id": user_id}
+
+        docs = await self._fetch_if_small(query, _EMOTIONS_PROJECTION)
+        if docs is not None:
+            # emotion -> [count, score sum, scored count]
+            emotions: defaultdict[str, list] = defaultdict(lambda: [0, 0.0, 0])
+            for doc in docs:
+                detected = ((doc.get("analysis") or {}).get("emotions") or {}).get("detected")
+                for item in detected or ():
+                    entry = emotions[item.get("emotion")]
+                    entry[0] += 1
+                    if item.get("score") is not None:
+                        entry[1] += item["score"]
+                        entry[2] += 1
+            top = heapq.nlargest(limit, emotions.items(), key=lambda e: e[1][0])
+            return [
+                {
+                    "emotion": emotion,
+                    "avg_score": total / scored if scored else None,
+                    "count": count,
+                }
+                for emotion, (count, total, scored) in top
+            ]
+
         pipeline = [
-            {"$match": {"project_id": project_id, "user_id": user_id}},
+            {"$match": query},
             {"$unwind": "$analysis.emotions.detected"},
             {"$group": {
                 "_id": "$analysis.emotions.detected.emotion",
@@ -284,7 +452,7 @@ class DashboardService:
             {"$limit": limit},
         ]
 
-        result = await self.results.aggregate(pipeline).to_list(limit)
+        result = await self._aggregate(self.results, pipeline, limit)
         return [
             {"emotion": r["_id"], "avg_score": r["avg_score"], "count": r["count"]}
             for r in result
@@ -300,44 +468,39 @@ class DashboardService:
         """Get trend data for a specific metric."""
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
 
-        date_format = {
-            "hour": "%Y-%m-%dT%H:00",
-            "day": "%Y-%m-%d",
-            "week": "%Y-W%V",
-            "month": "%Y-%m",
-        }.get(interval, "%Y-%m-%d")
+        if interval not in _DATE_FORMAT:
+            interval = "day"
+        date_format = _DATE_FORMAT[interval]
+        # Group on the truncated date itself; only the buckets get formatted
+        bucket = {"$dateTrunc": {
+            "date": "$created_at",
+            "unit": interval,
+            "startOfWeek": "monday",
+        }}
 
         if metric == "sentiment":
-            pipeline = [
-                {"$match": {"user_id": user_id, "created_at": {"$gte": cutoff}}},
-                {"$project": {
-                    "bucket": {"$dateToString": {"format": date_format, "date": "$created_at"}},
-                    "score": "$analysis.sentiment.score",
-                }},
-                {"$group": {
-                    "_id": "$bucket",
-                    "value": {"$avg": "$score"},
-                    "count": {"$sum": 1},
-                }},
-                {"$sort": {"_id": 1}},
-            ]
+            group = {
+                "_id": bucket,
+                "value": {"$avg": "$analysis.sentiment.score"},
+                "count": {"$sum": 1},
+            }
         elif metric == "volume":
-            pipeline = [
-                {"$match": {"user_id": user_id, "created_at": {"$gte": cutoff}}},
-                {"$project": {
-                    "bucket": {"$dateToString": {"format": date_format, "date": "$created_at"}},
-                }},
-                {"$group": {
-                    "_id": "$bucket",
-                    "value": {"$sum": 1},
-                }},
-                {"$sort": {"_id": 1}},
-            ]
+            group = {"_id": bucket, "value": {"$sum": 1}}
         else:
             return []
 
-        result = await self.results.aggregate(pipeline).to_list(days * 24)
+        pipeline = [
+            {"$match": {"user_id": user_id, "created_at": {"$gte": cutoff}}},
+            {"$group": group},
+            {"$sort": {"_id": 1}},
+        ]
+
+        result = await self._aggregate(self.results, pipeline, days * 24 + 1)
         return [
-            {"date": r["_id"], "value": r["value"], "count": r.get("count", r["value"])}
+            {
+                "date": r["_id"].strftime(date_format),
+                "value": r["value"],
+                "count": r.get("count", r["value"]),
+            }
             for r in result
         ]
@@ -0,0 +1,69 @@
+"""Language detection for scraped content."""
+
+import logging
+from typing import Any
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_LABEL_PREFIX = "__label__"
+
+# Loaded on first use; None after a failed or skipped load
+_model: Any = None
+_model_loaded = False
+
+
+def _get_model() -> Any:
+    """Load the configured fastText language ID model once."""
+    global _model, _model_loaded
+    if _model_loaded:
+        return _model
+    _model_loaded = True
+
+    model_path = get_settings().language_model_path
+    if not model_path:
+        logger.info("Language detection disabled: LANGUAGE_MODEL_PATH is not set")
+        return None
+
+    try:
+        import fasttext
+    except ImportError:
+        logger.warning(
+            "Language detection requires fasttext. Install with: pip install fasttext-wheel"
+        )
+        return None
+
+    try:
+        _model = fasttext.load_model(model_path)
+    except ValueError as e:
+        logger.warning(f"Could not load language model {model_path}: {e}")
+    return _model
+
+
+def detect_languages(texts: list[str]) -> list[str | None]:
+    """
+    Detect the language of each text in one batched model call.
+
+    Args:
+        texts: Texts to classify
+
+    Returns:
+        ISO 639 language codes in input order, or None for every text
+        when no language model is configured
+    """
+    model = _get_model()
+    if model is None or not texts:
+        return [None] * len(texts)
+
+    # fastText predicts one line per input, so newlines must be removed.
+    # Detection is optional, so a failing model never costs the results.
+    try:
+        labels, _ = model.predict([text.replace("\n", " ") for text in texts], k=1)
+    except Exception as e:
+        logger.warning(f"Language detection failed: {e}")
+        return [None] * len(texts)
+    return [
+        label[0].removeprefix(_LABEL_PREFIX) if label else None
+        for label in labels
+    ]
@@ -1,184 +1,194 @@
 """Preset configuration service."""
 
-from app.models.project import (
-    ProjectConfig,
-    ScraperConfig,
-    LLMConfig,
-    AnalysisConfig,
-    ScheduleConfig,
-    LimitsConfig,
-)
+from functools import cache
 
+from app.models.project import ProjectConfig
 
+# Preset configs are kept as plain data and validated into ProjectConfig
+# the first time each one is requested, so importing this module is cheap
 PRESETS = {
     "starter": {
         "name": "Starter",
         "description": "Basic sentiment analysis for beginners",
-        "config": ProjectConfig(
-            scrapers=ScraperConfig(
-                platforms=["amazon"],
-                commercial_provider=None,
-            ),
-            llm=LLMConfig(
-                provider="groq",
-                model="llama-3.3-70b-versatile",
-                temperature=0.3,
-                max_tokens=500,
-            ),
-            analysis=AnalysisConfig(
-                sentiment=True,
-                sentiment_classes=3,
-                emotions=False,
-                summarize=False,
-                extract_insights=False,
-            ),
-            schedule=ScheduleConfig(enabled=False),
-            limits=LimitsConfig(
-                max_reviews_per_target=50,
-                max_requests_per_day=100,
-                rate_limit_delay=2.0,
-            ),
-        ),
+        "config": {
+            "scrapers": {
+                "platforms": ["amazon"],
+                "commercial_provider": None,
+            },
+            "llm": {
+                "provider": "groq",
+                "model": "llama-3.3-70b-versatile",
+                "temperature": 0.3,
+                "max_tokens": 500,
+            },
+            "analysis": {
+                "sentiment": True,
+                "sentiment_classes": 3,
+                "emotions": False,
+                "summarize": False,
+                "extract_insights": False,
+            },
+            "schedule": {"enabled": False},
+            "limits": {
+                "max_reviews_per_target": 50,
+                "max_requests_per_day": 100,
+                "rate_limit_delay": 2.0,
+            },
+        },
     },
     "standard": {
         "name": "Standard",
         "description": "Comprehensive analysis for most use cases",
-        "config": ProjectConfig(
-            scrapers=ScraperConfig(
-                platforms=["amazon", "steam", "youtube"],
-                commercial_provider=None,
-            ),
-            llm=LLMConfig(
-                provider="groq",
-                model="llama-3.3-70b-versatile",
-                temperature=0.5,
-                max_tokens=1000,
-            ),
-            analysis=AnalysisConfig(
-                sentiment=True,
-                sentiment_classes=5,
-                emotions=True,
-                emotion_model="ekman",
-                summarize=False,
-                extract_insights=False,
-            ),
-            schedule=ScheduleConfig(enabled=False),
-            limits=LimitsConfig(
-                max_reviews_per_target=100,
-                max_requests_per_day=500,
-                rate_limit_delay=1.0,
-            ),
-        ),
+        "config": {
+            "scrapers": {
+                "platforms": ["amazon", "steam", "youtube"],
+                "commercial_provider": None,
+            },
+            "llm": {
+                "provider": "groq",
+                "model": "llama-3.3-70b-versatile",
+                "temperature": 0.5,
+                "max_tokens": 1000,
+            },
+            "analysis": {
+                "sentiment": True,
+                "sentiment_classes": 5,
+                "emotions": True,
+                "emotion_model": "ekman",
+                "summarize": False,
+                "extract_insights": False,
+            },
+            "schedule": {"enabled": False},
+            "limits": {
+                "max_reviews_per_target": 100,
+                "max_requests_per_day": 500,
+                "rate_limit_delay": 1.0,
+            },
+        },
     },
     "advanced": {
         "name": "Advanced",
         "description": "Full-featured analysis with all options",
-        "config": ProjectConfig(
-            scrapers=ScraperConfig(
-                platforms=["amazon", "steam", "youtube", "reddit", "trustpilot"],
-                commercial_provider="scraperapi",
-            ),
-            llm=LLMConfig(
-                provider="groq",
-                model="llama-3.3-70b-versatile",
-                temperature=0.7,
-                max_tokens=2000,
-            ),
-            analysis=AnalysisConfig(
-                sentiment=True,
-                sentiment_classes=5,
-                emotions=True,
-                emotion_model="goemotions",
-                summarize=True,
-                extract_insights=True,
-            ),
-            schedule=ScheduleConfig(
-                enabled=True,
-                frequency="daily",
-                time="09:00",
-            ),
-            limits=LimitsConfig(
-                max_reviews_per_target=200,
-                max_requests_per_day=1000,
-                rate_limit_delay=0.5,
-            ),
-        ),
+        "config": {
+            "scrapers": {
+                "platforms": ["amazon", "steam", "youtube", "reddit", "trustpilot"],
+                "commercial_provider": "scraperapi",
+            },
+            "llm": {
+                "provider": "groq",
+                "model": "llama-3.3-70b-versatile",
+                "temperature": 0.7,
+                "max_tokens": 2000,
+            },
+            "analysis": {
+                "sentiment": True,
+                "sentiment_classes": 5,
+                "emotions": True,
+                "emotion_model": "goemotions",
+                "summarize": True,
+                "extract_insights": True,
+            },
+            "schedule": {
+                "enabled": True,
+                "frequency": "daily",
+                "time": "09:00",
+            },
+            "limits": {
+                "max_reviews_per_target": 200,
+                "max_requests_per_day": 1000,
+                "rate_limit_delay": 0.5,
+            },
+        },
     },
     "budget": {
         "name": "Budget",
         "description": "Cost-effective analysis with minimal API usage",
-        "config": ProjectConfig(
-            scrapers=ScraperConfig(
-                platforms=["amazon"],
-                commercial_provider=None,
-            ),
-            llm=LLMConfig(
-                provider="groq",
-                model="llama-3.1-8b-instant",
-                temperature=0.3,
-                max_tokens=300,
-            ),
-            analysis=AnalysisConfig(
-                sentiment=True,
-                sentiment_classes=3,
-                emotions=False,
-                summarize=False,
-                extract_insights=False,
-            ),
-            schedule=ScheduleConfig(enabled=False),
-            limits=LimitsConfig(
-                max_reviews_per_target=25,
-                max_requests_per_day=50,
-                rate_limit_delay=3.0,
-            ),
-        ),
+        "config": {
+            "scrapers": {
+                "platforms": ["amazon"],
+                "commercial_provider": None,
+            },
+            "llm": {
+                "provider": "groq",
+                "model": "llama-3.1-8b-instant",
+                "temperature": 0.3,
+                "max_tokens": 300,
+            },
+            "analysis": {
+                "sentiment": True,
+                "sentiment_classes": 3,
+                "emotions": False,
+                "summarize": False,
+                "extract_insights": False,
+            },
+            "schedule": {"enabled": False},
+            "limits": {
+                "max_reviews_per_target": 25,
+                "max_requests_per_day": 50,
+                "rate_limit_delay": 3.0,
+            },
+        },
     },
     "enterprise": {
         "name": "Enterprise",
         "description": "Maximum throughput for enterprise needs",
-        "config": ProjectConfig(
-            scrapers=ScraperConfig(
-                platforms=["amazon", "steam", "youtube", "reddit", "trustpilot", "yelp", "google"],
-                commercial_provider="scraperapi",
-            ),
-            llm=LLMConfig(
-                provider="openai",
-                model="gpt-4o-mini",
-                temperature=0.5,
-                max_tokens=4000,
-            ),
-            analysis=AnalysisConfig(
-                sentiment=True,
-                sentiment_classes=5,
-                emotions=True,
-                emotion_model="goemotions",
-                summarize=True,
-                extract_insights=True,
-            ),
-            schedule=ScheduleConfig(
-                enabled=True,
-                frequency="hourly",
-            ),
-            limits=LimitsConfig(
-                max_reviews_per_target=500,
-                max_requests_per_day=5000,
-                rate_limit_delay=0.2,
-            ),
-        ),
+        "config": {
+            "scrapers": {
+                "platforms": ["amazon", "steam", "youtube", "reddit", "trustpilot", "yelp", "google"],
+                "commercial_provider": "scraperapi",
+            },
+            "llm": {
+                "provider": "openai",
+                "model": "gpt-4o-mini",
+                "temperature": 0.5,
+                "max_tokens": 4000,
+            },
+            "analysis": {
+                "sentiment": True,
+                "sentiment_classes": 5,
+                "emotions": True,
+                "emotion_model": "goemotions",
+                "summarize": True,
+                "extract_insights": True,
+            },
+            "schedule": {
+                "enabled": True,
+                "frequency": "hourly",
+            },
+            "limits": {
+                "max_reviews_per_target": 500,
+                "max_requests_per_day": 5000,
+                "rate_limit_delay": 0.2,
+            },
+        },
     },
 }
 
 
+@cache
+def _build_preset_config(preset_name: str) -> ProjectConfig:
+    """Validate a preset's config once and reuse it."""
+    return ProjectConfig.model_validate(PRESETS[preset_name]["config"])
+
+
+@cache
+def _preset_config_dump(preset_name: str) -> dict:
+    """Serialize a preset's config once and reuse it."""
+    return _build_preset_config(preset_name).model_dump()
+
+
 def get_preset_config(preset_name: str) -> ProjectConfig | None:
     """Get configuration for a preset."""
-    preset = PRESETS.get(preset_name)
-    if preset:
-        return preset["config"]
+    if preset_name in PRESETS:
+        return _build_preset_config(preset_name)
     return None
 
 
 def get_all_presets() -> list[dict]:
-    """Get all available presets."""
+    """Get all available presets.
+
+    Returns a new list that callers may extend.
+    """
     return [
         {
             "id": key,
@@ -190,13 +200,17 @@ def get_all_presets() -> list[dict]:
 
 
 def get_preset_details(preset_name: str) -> dict | None:
-    """Get full preset details including config."""
+    """Get full preset details including config.
+
+    Returns a new top-level dict that callers may add keys to; the nested
+    config dict is shared and must not be modified.
+    """
     preset = PRESETS.get(preset_name)
     if preset:
         return {
             "id": preset_name,
             "name": preset["name"],
             "description": preset["description"],
-            "config": preset["config"].model_dump(),
+            "config": _preset_config_dump(preset_name),
         }
     return None
@@ -2,29 +2,46 @@
 
 import asyncio
 import logging
-from datetime import datetime, timezone
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
 
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from fastapi import Request
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.models.scrape_job import ScrapeJobCreate, ScrapeJobOptions
 from app.repositories.project import ProjectRepository
+from app.repositories.result import ResultRepository
 from app.repositories.schedule import ScheduleRepository
 from app.repositories.scrape_job import ScrapeJobRepository
-from app.services.scrape_executor import get_job_queue
+from app.services.scrape_executor import JobQueue
 
 logger = logging.getLogger(__name__)
 
+# How often projects with new results are rebuilt in the daily sentiment rollup
+ROLLUP_REFRESH_INTERVAL = timedelta(hours=1)
+
+# How far each rollup pass reaches back before the previous one started
+ROLLUP_REFRESH_OVERLAP = timedelta(minutes=5)
+
+# Longest the loop sleeps without a wakeup. Bounds how late it notices
+# schedules changed by another process or leases that expired.
+MAX_IDLE_SECONDS = 60.0
+
 
 class SchedulerService:
     """Service for managing scheduled scrape jobs."""
 
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncDatabase, job_queue: JobQueue):
         self.db = db
+        self.job_queue = job_queue
         self.schedule_repo = ScheduleRepository(db)
-        self.project_repo = ProjectRepository(db)
+        self.project_repo = ProjectRepository()
         self.job_repo = ScrapeJobRepository(db)
+        self.result_repo = ResultRepository(db)
         self._running = False
+        self._rollup_refreshed_at: datetime | None = None
         self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
 
     async def start(self) -> None:
         """Start the scheduler service."""
@@ -35,15 +52,17 @@ class SchedulerService:
         self._task = asyncio.create_task(self._run_loop())
         logger.info("Scheduler service started")
 
+    def notify(self) -> None:
+        """Wake the loop early, e.g. after a schedule was created or changed."""
+        self._wakeup.set()
+
     async def stop(self) -> None:
         """Stop the scheduler service."""
         self._running = False
         if self._task:
             self._task.cancel()
-            try:
+            with suppress(asyncio.CancelledError):
                 await self._task
-            except asyncio.CancelledError:
-                pass
         logger.info("Scheduler service stopped")
 
     async def _run_loop(self) -> None:
@@ -54,14 +73,34 @@ class SchedulerService:
             except Exception as e:
                 logger.error(f"Scheduler error: {e}")
 
-            # Check every minute
-            await asyncio.sleep(60)
+            try:
+                await self._refresh_rollup_if_due()
+            except Exception as e:
+                logger.error(f"Rollup refresh error: {e}")
+
+            # Sleep until the next schedule is due unless notified sooner
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=await self._seconds_until_next_due()
+                )
+            self._wakeup.clear()
+
+    async def _seconds_until_next_due(self) -> float:
+        """Seconds until the next schedule is due, capped at MAX_IDLE_SECONDS."""
+        try:
+            next_due = await self.schedule_repo.get_next_due_at()
+        except Exception as e:
+            logger.error(f"Failed to read next due schedule: {e}")
+            return MAX_IDLE_SECONDS
+
+        if next_due is None:
+            return MAX_IDLE_SECONDS
+        delay = (next_due - datetime.now(timezone.utc)).total_seconds()
+        return max(0.0, min(MAX_IDLE_SECONDS, delay))
 
     async def _process_due_schedules(self) -> None:
         """Process all schedules that are due to run."""
-        schedules = await self.schedule_repo.get_due_schedules()
-
-        for schedule in schedules:
+        while (schedule := await self.schedule_repo.claim_due_schedule()) is not None:
             try:
                 await self._execute_schedule(schedule)
             except Exception as e:
@@ -73,6 +112,31 @@ class SchedulerService:
                     error=str(e),
                 )
 
+    async def _refresh_rollup_if_due(self) -> None:
+        """Bring the daily sentiment rollup up to date once per refresh interval.
+
+        Only projects with results inserted since the previous pass are
+        rebuilt. After a restart the rollup's own last refresh time is used,
+        and the whole rollup is built only when it is empty.
+        """
+        now = datetime.now(timezone.utc)
+        since = self._rollup_refreshed_at
+        if since is not None and now - since < ROLLUP_REFRESH_INTERVAL:
+            return
+
+        if since is None:
+            since = await self.result_repo.get_rollup_refreshed_at()
+        if since is None:
+            await self.result_repo.refresh_daily_rollup()
+            logger.info("Daily sentiment rollup rebuilt")
+        else:
+            # Overlap the previous pass so results inserted while it ran are not missed
+            count = await self.result_repo.refresh_changed_rollups(
+                since - ROLLUP_REFRESH_OVERLAP
+            )
+            logger.info(f"Daily sentiment rollup refreshed for {count} projects")
+        self._rollup_refreshed_at = now
+
     async def _execute_schedule(self, schedule) -> None:
         """Execute a single schedule."""
         logger.info(f"Executing schedule {schedule.id} for project {schedule.project_id}")
@@ -109,8 +173,7 @@ class SchedulerService:
             )
 
             # Enqueue job
-            job_queue = await get_job_queue(self.db)
-            await job_queue.enqueue(job, project)
+            await self.job_queue.enqueue(job, project)
 
             await self.schedule_repo.record_execution(
                 schedule_id=schedule.id,
@@ -148,28 +211,11 @@ class SchedulerService:
             trigger="manual",
         )
 
-        job_queue = await get_job_queue(self.db)
-        await job_queue.enqueue(job, project)
+        await self.job_queue.enqueue(job, project)
 
         return job.id
 
 
-# Global scheduler instance
-_scheduler: SchedulerService | None = None
-
-
-async def get_scheduler(db: AsyncIOMotorDatabase) -> SchedulerService:
-    """Get or create the scheduler service."""
-    global _scheduler
-    if _scheduler is None:
-        _scheduler = SchedulerService(db)
-        await _scheduler.start()
-    return _scheduler
-
-
-async def shutdown_scheduler() -> None:
-    """Shutdown the scheduler service."""
-    global _scheduler
-    if _scheduler:
-        await _scheduler.stop()
-        _scheduler = None
+def get_scheduler(request: Request) -> SchedulerService:
+    """FastAPI dependency for the scheduler started by the app lifespan."""
+    return request.app.state.scheduler
@@ -2,27 +2,75 @@
 
 import asyncio
 import logging
+import time
 from datetime import datetime, timezone
 from typing import Any
 
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from bson import ObjectId
+from fastapi import Request
+from pymongo.asynchronous.database import AsyncDatabase
 
+from app.core.exceptions import RateLimitError
+from app.core.rate_limit import AsyncTokenBucket
 from app.models.project import Project
 from app.models.result import Result, ResultContent, AnalysisResult
 from app.models.scrape_job import ScrapeJob
 from app.models.target import Target
+from app.repositories.base import construct_model
+from app.repositories.result import ResultRepository
 from app.repositories.scrape_job import ScrapeJobRepository
+from app.services.dashboard_service import invalidate_dashboard_cache
+from app.services.language import detect_languages
 from app.services.sentimatrix_service import SentimatrixService
 
 logger = logging.getLogger(__name__)
 
+# Result documents written per insert_many call
+RESULT_INSERT_BATCH_SIZE = 500
+
+# Parsed items sent to the analyzer per call, and analysis calls in flight per target
+ANALYSIS_MICRO_BATCH_SIZE = 32
+MAX_PENDING_ANALYSES = 4
+
+# Target fields read when scraping; the documents come from our own collection
+_TARGET_SCRAPE_PROJECTION = {"url": 1, "platform": 1}
+
+# Daily request budgets, shared by every job of a project in this process
+_daily_limiters: dict[str, AsyncTokenBucket] = {}
+
+
+def _prune_daily_limiters() -> None:
+    """Drop budgets that are full and unused for a whole period.
+
+    A full bucket behaves exactly like a new one, and after a period without
+    an acquire no running job is still drawing on it, so dropping it keeps
+    the map to recently active projects.
+    """
+    now = time.monotonic()
+    for project_id, limiter in list(_daily_limiters.items()):
+        if now - limiter.last_used >= limiter.time_period and limiter.is_full():
+            del _daily_limiters[project_id]
+
+
+def _get_daily_limiter(project: Project) -> AsyncTokenBucket:
+    """Get the project's daily request budget, resized when its limit changes."""
+    _prune_daily_limiters()
+    max_per_day = project.config.limits.max_requests_per_day
+    limiter = _daily_limiters.get(project.id)
+    if limiter is None:
+        limiter = _daily_limiters[project.id] = AsyncTokenBucket(max_per_day, 86400)
+    elif limiter.max_rate != max_per_day:
+        # Requests already made today still count against the new limit
+        limiter.set_max_rate(max_per_day)
+    return limiter
+
 
 class ScrapeExecutor:
     """Executes scrape jobs using Sentimatrix."""
 
     def __init__(
         self,
-        db: AsyncIOMotorDatabase,
+        db: AsyncDatabase,
         job_repo: ScrapeJobRepository,
     ):
         self.db = db
@@ -30,6 +78,9 @@ class ScrapeExecutor:
         self.results_collection = db["results"]
         self.targets_collection = db["targets"]
         self._cancelled = False
+        self._target_tasks: list[asyncio.Task] = []
+        self._daily_limiter: AsyncTokenBucket | None = None
+        self._burst_limiter: AsyncTokenBucket | None = None
 
     async def execute_job(self, job: ScrapeJob, project: Project) -> None:
         """
@@ -42,6 +93,10 @@ class ScrapeExecutor:
         self._cancelled = False
         logger.info(f"Starting job {job.id} for project {project.id}")
 
+        # Scrape calls from all of this job's targets share one pacing bucket
+        self._daily_limiter = _get_daily_limiter(project)
+        self._burst_limiter = AsyncTokenBucket(1, project.config.limits.rate_limit_delay)
+
         # Update job status to running
         await self.job_repo.update_job_status(job.id, "running")
 
@@ -53,94 +108,129 @@ class ScrapeExecutor:
                 limits_config=project.config.limits,
                 commercial_provider=project.config.scrapers.commercial_provider,
             ) as sm_service:
-                # Process each target
+                # Process targets concurrently, up to the project's limit
                 total_targets = len(job.targets)
                 completed_targets = 0
+                slots = asyncio.Semaphore(project.config.limits.max_concurrent_targets)
+                progress_lock = asyncio.Lock()
+
+                # Load every target up front instead of one lookup per target
+                targets_by_id = await self._get_targets(
+                    [target_status.target_id for target_status in job.targets]
+                )
+
+                async def process(target_status) -> None:
+                    nonlocal completed_targets
+                    async with slots:
+                        target_id = target_status.target_id
+                        logger.info(f"Processing target {target_id}")
+
+                        try:
+                            # Update target status
+                            await self.job_repo.update_target_status(
+                                job.id, target_id, "running"
+                            )
 
-                for target_status in job.targets:
-                    if self._cancelled:
-                        logger.info(f"Job {job.id} cancelled")
-                        await self.job_repo.update_job_status(job.id, "cancelled")
-                        return
-
-                    target_id = target_status.target_id
-                    logger.info(f"Processing target {target_id}")
+                            # Get target details
+                            target = targets_by_id.get(target_id)
+                            if not target:
+                                await self.job_repo.update_target_status(
+                                    job.id,
+                                    target_id,
+                                    "failed",
+                                    error="Target not found",
+                                )
+                                await self.job_repo.increment_stats(job.id, "errors_count")
+                                return
+
+                            # Scrape target
+                            requests_made, results_count = await self._scrape_and_analyze_target(
+                                job=job,
+                                target=target,
+                                project=project,
+                                sm_service=sm_service,
+                            )
 
-                    try:
-                        # Update target status
-                        await self.job_repo.update_target_status(
-                            job.id, target_id, "running"
-                        )
+                            # Update target status
+                            await self.job_repo.update_target_status(
+                                job.id,
+                                target_id,
+                                "completed",
+                                progress=100,
+                                results_count=results_count,
+                            )
+                            await self.job_repo.increment_stats_bulk(
+                                job.id,
+                                {
+                                    "requests_made": requests_made,
+                                    "targets_completed": 1,
+                                    "results_total": results_count,
+                                },
+                            )
 
-                        # Get target details
-                        target = await self._get_target(target_id)
-                        if not target:
+                        except Exception as e:
+                            logger.error(f"Error processing target {target_id}: {e}")
                             await self.job_repo.update_target_status(
                                 job.id,
                                 target_id,
                                 "failed",
-                                error="Target not found",
+                                error=str(e),
                             )
                             await self.job_repo.increment_stats(job.id, "errors_count")
-                            continue
-
-                        # Scrape target
-                        results_count = await self._scrape_and_analyze_target(
-                            job=job,
-                            target=target,
-                            project=project,
-                            sm_service=sm_service,
-                        )
-
-                        # Update target status
-                        await self.job_repo.update_target_status(
-                            job.id,
-                            target_id,
-                            "completed",
-                            progress=100,
-                            results_count=results_count,
-                        )
-                        await self.job_repo.increment_stats(job.id, "targets_completed")
-                        await self.job_repo.increment_stats(
-                            job.id, "results_total", results_count
-                        )
-
-                    except Exception as e:
-                        logger.error(f"Error processing target {target_id}: {e}")
-                        await self.job_repo.update_target_status(
-                            job.id,
-                            target_id,
-                            "failed",
-                            error=str(e),
-                        )
-                        await self.job_repo.increment_stats(job.id, "errors_count")
-
-                    # Update overall progress
-                    completed_targets += 1
-                    progress = int((completed_targets / total_targets) * 100)
-                    await self.job_repo.update_job_progress(job.id, progress)
-
-                    # Rate limiting between targets
-                    await asyncio.sleep(project.config.limits.rate_limit_delay)
+
+                        # Update overall progress; the lock keeps writes in order
+                        async with progress_lock:
+                            completed_targets += 1
+                            progress = int((completed_targets / total_targets) * 100)
+                            await self.job_repo.update_job_progress(job.id, progress)
+
+                # cancel() cancels these tasks, interrupting in-flight scrapes
+                # and analysis calls instead of waiting for them to finish
+                self._target_tasks = [asyncio.create_task(process(t)) for t in job.targets]
+                if self._cancelled:
+                    self._cancel_target_tasks()
+                outcomes = await asyncio.gather(*self._target_tasks, return_exceptions=True)
+                for outcome in outcomes:
+                    if isinstance(outcome, asyncio.CancelledError) and self._cancelled:
+                        continue
+                    if isinstance(outcome, BaseException):
+                        raise outcome
+
+                if self._cancelled:
+                    logger.info(f"Job {job.id} cancelled")
+                    await self.job_repo.update_job_status(job.id, "cancelled")
+                    return
 
             # Job completed
             await self.job_repo.update_job_status(job.id, "completed")
             logger.info(f"Job {job.id} completed successfully")
+            invalidate_dashboard_cache(job.user_id)
+
+            # Fold the new results into the dashboard rollup right away
+            try:
+                await ResultRepository(self.db).refresh_daily_rollup(job.project_id)
+            except Exception as e:
+                logger.warning(f"Rollup refresh failed for project {job.project_id}: {e}")
 
         except Exception as e:
             logger.error(f"Job {job.id} failed: {e}")
             await self.job_repo.update_job_status(job.id, "failed", error_message=str(e))
             raise
 
-    async def _get_target(self, target_id: str) -> Target | None:
-        """Get target from database."""
-        from bson import ObjectId
+    async def _get_targets(self, target_ids: list[str]) -> dict[str, Target]:
+        """Get the fields scraping needs for a job's targets, keyed by ID."""
+        object_ids = [ObjectId(tid) for tid in target_ids if ObjectId.is_valid(tid)]
+        if not object_ids:
+            return {}
 
-        doc = await self.targets_collection.find_one({"_id": ObjectId(target_id)})
-        if not doc:
-            return None
-        doc["id"] = str(doc.pop("_id"))
-        return Target(**doc)
+        cursor = self.targets_collection.find(
+            {"_id": {"$in": object_ids}}, _TARGET_SCRAPE_PROJECTION
+        )
+        targets = {}
+        async for doc in cursor:
+            doc["id"] = str(doc.pop("_id"))
+            targets[doc["id"]] = construct_model(Target, doc)
+        return targets
 
     async def _scrape_and_analyze_target(
         self,
@@ -148,81 +238,124 @@ class ScrapeExecutor:
         target: Target,
         project: Project,
         sm_service: SentimatrixService,
-    ) -> int:
+    ) -> tuple[int, int]:
         """
         Scrape content from a target and analyze it.
 
         Returns:
-            Number of results scraped and stored
+            Number of requests made and number of results stored
         """
-        # Scrape content
-        scraped_data = await sm_service.scrape_url(
-            url=target.url,
-            platform=target.platform,
-            max_results=job.options.max_results,
-        )
+        # An empty daily budget can take hours to refill, so it fails the target
+        # instead of holding a job queue slot while it waits
+        if not self._daily_limiter.try_acquire():
+            raise RateLimitError("Daily request limit reached for this project")
+
+        # Scrape content with the project's request spacing
+        async with self._burst_limiter:
+            scraped_data = await sm_service.scrape_url(
+                url=target.url,
+                platform=target.platform,
+                max_results=job.options.max_results,
+            )
 
         if not scraped_data:
             logger.warning(f"No data scraped from {target.url}")
-            return 0
-
-        # Process each scraped item
-        results_stored = 0
-        batch_texts = []
-        batch_contents = []
+            return 0, 0
+
+        # Analyze parsed items in micro-batches while later items are still being
+        # parsed, keeping a bounded number of analysis calls in flight
+        pending = asyncio.Semaphore(MAX_PENDING_ANALYSES)
+        tasks: list[asyncio.Task[int]] = []
+        chunk: list[ResultContent] = []
+        parsed_count = 0
+
+        async def dispatch(contents: list[ResultContent]) -> None:
+            await pending.acquire()
+            tasks.append(
+                asyncio.create_task(
+                    self._analyze_and_store_chunk(job, target, contents, sm_service, pending)
+                )
+            )
 
-        for raw_item in scraped_data:
-            # Parse content
-            content = sm_service.parse_scraped_content(raw_item)
-            if not content.text:
-                continue
+        try:
+            for raw_item in scraped_data:
+                # Parse content
+                content = sm_service.parse_scraped_content(raw_item)
+                if not content.text:
+                    continue
+
+                chunk.append(content)
+                parsed_count += 1
+                if len(chunk) >= ANALYSIS_MICRO_BATCH_SIZE:
+                    await dispatch(chunk)
+                    chunk = []
+
+            if chunk:
+                await dispatch(chunk)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
 
-            batch_texts.append(content.text)
-            batch_contents.append(content)
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
 
-            # Increment request count
-            await self.job_repo.increment_stats(job.id, "requests_made")
+        # One request counted per parsed item
+        return parsed_count, sum(outcomes)
 
-        # Analyze in batch if we have texts
-        if batch_texts:
+    async def _analyze_and_store_chunk(
+        self,
+        job: ScrapeJob,
+        target: Target,
+        contents: list[ResultContent],
+        sm_service: SentimatrixService,
+        pending: asyncio.Semaphore,
+    ) -> int:
+        """Analyze one micro-batch of parsed items and store the results."""
+        try:
+            texts = [content.text for content in contents]
+            # One batched model call labels the whole micro-batch
+            languages = detect_languages(texts)
             try:
-                analyses = await sm_service.analyze_batch(batch_texts, batch_size=10)
-
-                # Store results
-                for content, analysis in zip(batch_contents, analyses):
-                    await self._store_result(
-                        job=job,
-                        target=target,
-                        content=content,
-                        analysis=analysis,
+                analyses = await sm_service.analyze_batch(texts, batch_size=10)
+                now = datetime.now(timezone.utc)
+                result_docs = [
+                    self._build_result_doc(
+                        job, target, content, analysis.model_dump(), language, now
                     )
-                    results_stored += 1
-
+                    for content, analysis, language in zip(contents, analyses, languages)
+                ]
             except Exception as e:
                 logger.error(f"Batch analysis failed: {e}")
-                # Fall back to storing without analysis
-                for content in batch_contents:
-                    await self._store_result(
-                        job=job,
-                        target=target,
-                        content=content,
-                        analysis=AnalysisResult(),
-                    )
-                    results_stored += 1
-
-        return results_stored
-
-    async def _store_result(
-        self,
+                # Fall back to storing without analysis; the empty analysis
+                # is serialized once and shared by the whole batch
+                now = datetime.now(timezone.utc)
+                no_analysis = AnalysisResult().model_dump()
+                result_docs = [
+                    self._build_result_doc(job, target, content, no_analysis, language, now)
+                    for content, language in zip(contents, languages)
+                ]
+
+            await self._store_results(result_docs)
+            return len(result_docs)
+        finally:
+            pending.release()
+
+    @staticmethod
+    def _build_result_doc(
         job: ScrapeJob,
         target: Target,
         content: ResultContent,
-        analysis: AnalysisResult,
-    ) -> None:
-        """Store a result in the database."""
-        now = datetime.now(timezone.utc)
-
-        # Calculate word count
+        analysis_doc: dict[str, Any],
+        language: str | None,
+        now: datetime,
+    ) -> dict[str, Any]:
+        """Build the result document for one analyzed item."""
+        # Calculate word count; str.split runs in C and is several times faster
+        # than counting regex matches, so the short-lived list is the cheaper path
         word_count = len(content.text.split()) if content.text else 0
 
         result_doc = {
@@ -231,29 +364,45 @@ class ScrapeExecutor:
             "user_id": job.user_id,
             "scrape_job_id": job.id,
             "content": content.model_dump(),
-            "analysis": analysis.model_dump(),
+            "analysis": analysis_doc,
             "platform": target.platform,
-            "language": None,  # Could detect with langdetect
+            "language": language,
             "word_count": word_count,
             "created_at": now,
             "updated_at": now,
         }
+        return result_doc
 
-        await self.results_collection.insert_one(result_doc)
+    async def _store_results(self, result_docs: list[dict[str, Any]]) -> None:
+        """Insert result documents in unordered batches."""
+        for start in range(0, len(result_docs), RESULT_INSERT_BATCH_SIZE):
+            await self.results_collection.insert_many(
+                result_docs[start:start + RESULT_INSERT_BATCH_SIZE], ordered=False
+            )
 
     def cancel(self) -> None:
         """Cancel the current job execution."""
         self._cancelled = True
+        self._cancel_target_tasks()
+
+    def _cancel_target_tasks(self) -> None:
+        """Cancel target tasks that have not finished."""
+        for task in self._target_tasks:
+            if not task.done():
+                task.cancel()
 
 
 class JobQueue:
     """Simple in-memory job queue for processing scrape jobs."""
 
-    def __init__(self, db: AsyncIOMotorDatabase, max_concurrent: int = 3):
+    def __init__(self, db: AsyncDatabase, max_concurrent: int = 3):
         self.db = db
         self.max_concurrent = max_concurrent
         self._queue: asyncio.Queue[tuple[ScrapeJob, Project]] = asyncio.Queue()
         self._running: dict[str, ScrapeExecutor] = {}
+        # One slot per concurrently executing job
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._job_tasks: set[asyncio.Task] = set()
         self._worker_task: asyncio.Task | None = None
 
     async def start(self) -> None:
@@ -262,13 +411,16 @@ class JobQueue:
         logger.info("Job queue started")
 
     async def stop(self) -> None:
-        """Stop the job queue worker."""
+        """Stop the job queue worker and any jobs still executing."""
         if self._worker_task:
             self._worker_task.cancel()
             try:
                 await self._worker_task
             except asyncio.CancelledError:
                 pass
+        for task in self._job_tasks:
+            task.cancel()
+        await asyncio.gather(*self._job_tasks, return_exceptions=True)
         logger.info("Job queue stopped")
 
     async def enqueue(self, job: ScrapeJob, project: Project) -> None:
@@ -284,49 +436,48 @@ class JobQueue:
         return False
 
     async def _worker(self) -> None:
-        """Process jobs from the queue."""
+        """Dispatch queued jobs as execution slots become free."""
         while True:
             try:
-                # Wait for job
+                # Wait for job, then for a free slot
                 job, project = await self._queue.get()
-
-                # Wait if at capacity
-                while len(self._running) >= self.max_concurrent:
-                    await asyncio.sleep(1)
-
-                # Execute job
-                job_repo = ScrapeJobRepository(self.db)
-                executor = ScrapeExecutor(self.db, job_repo)
-                self._running[job.id] = executor
+                await self._slots.acquire()
 
                 try:
-                    await executor.execute_job(job, project)
-                finally:
-                    del self._running[job.id]
+                    job_repo = ScrapeJobRepository(self.db)
+                    executor = ScrapeExecutor(self.db, job_repo)
+                except Exception:
+                    self._slots.release()
                     self._queue.task_done()
+                    raise
+                self._running[job.id] = executor
+
+                task = asyncio.create_task(self._execute(job, project, executor))
+                self._job_tasks.add(task)
+                task.add_done_callback(self._job_tasks.discard)
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Worker error: {e}")
 
-
-# Global job queue instance
-_job_queue: JobQueue | None = None
-
-
-async def get_job_queue(db: AsyncIOMotorDatabase) -> JobQueue:
-    """Get or create the job queue."""
-    global _job_queue
-    if _job_queue is None:
-        _job_queue = JobQueue(db)
-        await _job_queue.start()
-    return _job_queue
+    async def _execute(
+        self,
+        job: ScrapeJob,
+        project: Project,
+        executor: ScrapeExecutor,
+    ) -> None:
+        """Run one job and free its slot when it finishes."""
+        try:
+            await executor.execute_job(job, project)
+        except Exception as e:
+            logger.error(f"Worker error: {e}")
+        finally:
+            del self._running[job.id]
+            self._slots.release()
+            self._queue.task_done()
 
 
-async def shutdown_job_queue() -> None:
-    """Shutdown the job queue."""
-    global _job_queue
-    if _job_queue:
-        await _job_queue.stop()
-        _job_queue = None
+def get_job_queue(request: Request) -> JobQueue:
+    """FastAPI dependency for the job queue started by the app lifespan."""
+    return request.app.state.job_queue
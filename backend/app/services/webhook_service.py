@@ -10,18 +10,28 @@ from datetime import datetime, timezone
 from typing import Any
 
 import httpx
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.models.webhook import Webhook, WebhookTestResult
-from app.repositories.webhook import WebhookRepository
+from app.repositories.webhook import RESPONSE_BODY_MAX_BYTES, WebhookRepository
 
 logger = logging.getLogger(__name__)
 
 
+async def _read_body_prefix(response: httpx.Response, limit: int) -> bytes:
+    """Read at most limit bytes of a streamed response body."""
+    body = bytearray()
+    async for chunk in response.aiter_bytes():
+        body += chunk
+        if len(body) >= limit:
+            break
+    return bytes(body[:limit])
+
+
 class WebhookService:
     """Service for delivering webhooks."""
 
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncDatabase):
         self.db = db
         self.webhook_repo = WebhookRepository(db)
         self._timeout = 30.0  # 30 second timeout
@@ -74,14 +84,19 @@ class WebhookService:
         error = None
 
         try:
+            # Stream the response so a large body is never read past what
+            # the delivery log keeps
             async with httpx.AsyncClient(timeout=self._timeout) as client:
-                response = await client.post(
+                async with client.stream(
+                    "POST",
                     webhook.url,
                     content=payload_json,
                     headers=headers,
-                )
-                status_code = response.status_code
-                response_body = response.text
+                ) as response:
+                    status_code = response.status_code
+                    response_body = await _read_body_prefix(
+                        response, RESPONSE_BODY_MAX_BYTES
+                    )
 
         except httpx.TimeoutException:
             error = "Request timed out"
@@ -173,13 +188,15 @@ class WebhookService:
                 signature = self._sign_payload(payload_json, webhook.secret)
                 headers["X-Webhook-Signature"] = f"sha256={signature}"
 
+            # Only the status is reported, so the body is never read
             async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
+                async with client.stream(
+                    "POST",
                     webhook.url,
                     content=payload_json,
                     headers=headers,
-                )
-                status_code = response.status_code
+                ) as response:
+                    status_code = response.status_code
 
         except httpx.TimeoutException:
             error = "Request timed out"
@@ -201,7 +218,7 @@ class WebhookService:
 
 # Event helper functions
 async def trigger_job_started(
-    db: AsyncIOMotorDatabase,
+    db: AsyncDatabase,
     user_id: str,
     project_id: str,
     job_id: str,
@@ -222,7 +239,7 @@ async def trigger_job_started(
 
 
 async def trigger_job_completed(
-    db: AsyncIOMotorDatabase,
+    db: AsyncDatabase,
     user_id: str,
     project_id: str,
     job_id: str,
@@ -245,7 +262,7 @@ async def trigger_job_completed(
 
 
 async def trigger_job_failed(
-    db: AsyncIOMotorDatabase,
+    db: AsyncDatabase,
     user_id: str,
     project_id: str,
     job_id: str,
@@ -2,16 +2,19 @@
 
 import asyncio
 from typing import AsyncGenerator, Generator
+from unittest.mock import MagicMock
 
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
 from httpx import ASGITransport, AsyncClient
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.core.config import Settings, get_settings
 from app.db.mongodb import MongoDB
 from app.main import create_app
+from app.services.scheduler import SchedulerService
+from app.services.scrape_executor import JobQueue
 
 
 def get_test_settings() -> Settings:
@@ -61,12 +64,21 @@ async def client(test_db: None) -> AsyncGenerator[AsyncClient, None]:
     """Create async test client."""
     app = create_app()
 
+    # ASGITransport does not run the lifespan, so attach the workers here;
+    # the scheduler loop is left stopped so tests only run jobs they enqueue
+    db = MongoDB.get_database()
+    app.state.job_queue = JobQueue(db)
+    await app.state.job_queue.start()
+    app.state.scheduler = SchedulerService(db, app.state.job_queue)
+
     async with AsyncClient(
         transport=ASGITransport(app=app),
         base_url="http://test",
     ) as ac:
         yield ac
 
+    await app.state.job_queue.stop()
+
 
 @pytest.fixture(scope="function")
 def sync_client(test_db: None) -> Generator[TestClient, None, None]:
@@ -76,6 +88,22 @@ def sync_client(test_db: None) -> Generator[TestClient, None, None]:
         yield tc
 
 
+@pytest.fixture
+def mock_db(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Mocked database handing out one mock collection per name."""
+    db = MagicMock(spec=AsyncDatabase)
+    collections: dict[str, MagicMock] = {}
+
+    def get_collection(name: str) -> MagicMock:
+        if name not in collections:
+            collections[name] = MagicMock(name=name, database=db)
+        return collections[name]
+
+    db.__getitem__.side_effect = get_collection
+    monkeypatch.setattr(MongoDB, "get_database", lambda: db)
+    return db
+
+
 @pytest.fixture
 def test_user_data() -> dict:
     """Sample user data for testing."""
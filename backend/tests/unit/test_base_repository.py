@@ -0,0 +1,200 @@
+"""Tests for base repository helpers."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import ConnectionFailure
+
+from app.core.exceptions import ValidationError
+from app.db.mongodb import MongoDB
+from app.models.result import AnalysisResult, Result
+from app.repositories.base import BaseRepository, InsertBuffer, StatsBuffer, object_id
+
+
+class _FakeCollection:
+    """Records buffer writes, optionally failing or stalling first."""
+
+    def __init__(self, fail_times: int = 0, delay: float = 0.0):
+        self.fail_times = fail_times
+        self.delay = delay
+        self.inserted: list[dict] = []
+        self.bulk_ops: list = []
+
+    async def _write(self) -> None:
+        await asyncio.sleep(self.delay)
+        if self.fail_times:
+            self.fail_times -= 1
+            raise ConnectionFailure("connection reset")
+
+    async def insert_many(self, docs, ordered=True):
+        await self._write()
+        self.inserted.extend(docs)
+
+    async def bulk_write(self, operations, ordered=True):
+        await self._write()
+        self.bulk_ops.extend(operations)
+
+
+class TestObjectId:
+    """Test client-supplied ID parsing."""
+
+    def test_valid_id(self):
+        """Test a valid hex ID is parsed."""
+        oid = ObjectId()
+
+        assert object_id(str(oid)) == oid
+
+    def test_invalid_id_rejected(self):
+        """Test a malformed ID is a bad request rather than a server error."""
+        with pytest.raises(ValidationError) as exc_info:
+            object_id("not-an-id")
+
+        assert exc_info.value.status_code == 400
+
+
+class TestTrustedDocToModel:
+    """Test building models from stored documents without validation."""
+
+    def _doc(self) -> dict:
+        now = datetime.now(timezone.utc)
+        return {
+            "_id": ObjectId(),
+            "project_id": "p1",
+            "target_id": "t1",
+            "user_id": "u1",
+            "scrape_job_id": "j1",
+            "content": {"text": "Great product"},
+            "analysis": {
+                "sentiment": {"label": "positive", "score": 0.8},
+                "emotions": {"detected": [{"emotion": "joy", "score": 0.9}]},
+            },
+            "platform": "amazon",
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    def test_matches_validated_model(self):
+        """Test the trusted path produces the same output as validation."""
+        doc = self._doc()
+
+        trusted = BaseRepository._doc_to_model_trusted(dict(doc), Result)
+        validated = BaseRepository._doc_to_model(dict(doc), Result)
+
+        assert trusted.model_dump() == validated.model_dump()
+
+    def test_nested_models_constructed(self):
+        """Test nested documents become model instances."""
+        doc = self._doc()
+        oid = doc["_id"]
+
+        result = BaseRepository._doc_to_model_trusted(doc, Result)
+
+        assert result.id == str(oid)
+        assert isinstance(result.analysis, AnalysisResult)
+        assert result.analysis.emotions.detected[0].emotion == "joy"
+
+
+class TestInsertBuffer:
+    """Test delivery-style insert batching."""
+
+    def test_not_running_until_started(self):
+        """Test callers fall back to direct inserts before start()."""
+        assert not InsertBuffer("webhook_deliveries").running
+
+    def test_full_batch_wakes_flusher(self):
+        """Test reaching max_batch signals an early flush."""
+        buffer = InsertBuffer("webhook_deliveries", max_batch=2)
+
+        buffer.add({"event": "a"})
+        assert not buffer._full.is_set()
+
+        buffer.add({"event": "b"})
+        assert buffer._full.is_set()
+
+    async def test_failed_flush_requeues_documents(self, monkeypatch):
+        """Test a failed insert puts the batch back for the next flush."""
+        collection = _FakeCollection(fail_times=1)
+        monkeypatch.setattr(MongoDB, "get_collection", lambda name: collection)
+        buffer = InsertBuffer("webhook_deliveries")
+        buffer.add({"event": "a"})
+
+        with pytest.raises(ConnectionFailure):
+            await buffer.flush_now()
+        await buffer.flush_now()
+
+        assert collection.inserted == [{"event": "a"}]
+
+    async def test_stop_finishes_in_flight_flush(self, monkeypatch):
+        """Test stop() lets a running flush complete instead of cancelling it."""
+        collection = _FakeCollection(delay=0.05)
+        monkeypatch.setattr(MongoDB, "get_collection", lambda name: collection)
+        buffer = InsertBuffer("webhook_deliveries", flush_interval=0.01)
+        await buffer.start()
+        buffer.add({"event": "a"})
+        await asyncio.sleep(0.02)
+
+        await buffer.stop()
+
+        assert collection.inserted == [{"event": "a"}]
+
+    def test_restart_on_new_loop(self):
+        """Test the buffer can be started again under a new event loop."""
+        buffer = InsertBuffer("webhook_deliveries", flush_interval=0.01)
+
+        async def run() -> None:
+            await buffer.start()
+            await asyncio.sleep(0.02)
+            await buffer.stop()
+
+        asyncio.run(run())
+        asyncio.run(run())
+
+        assert not buffer.running
+
+
+class TestStatsBuffer:
+    """Test coalesced stats increments."""
+
+    async def test_failed_flush_requeues_increments(self, monkeypatch):
+        """Test a failed bulk write merges its increments back."""
+        collection = _FakeCollection(fail_times=1)
+        monkeypatch.setattr(MongoDB, "get_collection", lambda name: collection)
+        buffer = StatsBuffer("projects")
+        doc_id = ObjectId()
+        buffer.add(doc_id, "targets_count", 2)
+
+        with pytest.raises(ConnectionFailure):
+            await buffer.flush_now()
+        buffer.add(doc_id, "targets_count", 1)
+        await buffer.flush_now()
+
+        assert collection.bulk_ops[0]._doc == {"$inc": {"stats.targets_count": 3}}
+
+    async def test_stop_finishes_in_flight_flush(self, monkeypatch):
+        """Test stop() lets a running flush complete instead of cancelling it."""
+        collection = _FakeCollection(delay=0.05)
+        monkeypatch.setattr(MongoDB, "get_collection", lambda name: collection)
+        buffer = StatsBuffer("projects", flush_interval=0.01)
+        await buffer.start()
+        buffer.add(ObjectId(), "targets_count")
+        await asyncio.sleep(0.02)
+
+        await buffer.stop()
+
+        assert len(collection.bulk_ops) == 1
+
+    def test_restart_on_new_loop(self):
+        """Test the buffer can be started again under a new event loop."""
+        buffer = StatsBuffer("projects", flush_interval=0.01)
+
+        async def run() -> None:
+            await buffer.start()
+            await asyncio.sleep(0.02)
+            await buffer.stop()
+
+        asyncio.run(run())
+        asyncio.run(run())
+
+        assert not buffer.running
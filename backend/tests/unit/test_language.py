@@ -0,0 +1,38 @@
+"""Tests for language detection."""
+
+from app.services import language
+
+
+class _FailingModel:
+    def predict(self, texts, k=1):
+        raise ValueError("predict failed")
+
+
+class _EnglishModel:
+    def predict(self, texts, k=1):
+        return [["__label__en"] for _ in texts], None
+
+
+class TestDetectLanguages:
+    """Test batched language detection."""
+
+    def test_labels_stripped(self, monkeypatch):
+        """Test fastText labels are returned as plain language codes."""
+        monkeypatch.setattr(language, "_model_loaded", True)
+        monkeypatch.setattr(language, "_model", _EnglishModel())
+
+        assert language.detect_languages(["hello\nworld", "hi"]) == ["en", "en"]
+
+    def test_no_model_returns_none(self, monkeypatch):
+        """Test every text gets None when no model is configured."""
+        monkeypatch.setattr(language, "_model_loaded", True)
+        monkeypatch.setattr(language, "_model", None)
+
+        assert language.detect_languages(["a", "b"]) == [None, None]
+
+    def test_predict_failure_returns_none(self, monkeypatch):
+        """Test a failing model never fails the batch."""
+        monkeypatch.setattr(language, "_model_loaded", True)
+        monkeypatch.setattr(language, "_model", _FailingModel())
+
+        assert language.detect_languages(["a", "b"]) == [None, None]
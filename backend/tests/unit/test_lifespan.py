@@ -0,0 +1,56 @@
+"""Tests for application startup and shutdown."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.mongodb import MongoDB
+from app.main import create_app
+from app.repositories.project import get_stats_buffer
+from app.services.scheduler import SchedulerService
+from app.services.scrape_executor import JobQueue
+
+
+@pytest.fixture
+def mongo(mock_db, monkeypatch):
+    """Patch the MongoDB connection so the lifespan runs without a server."""
+    connect, disconnect = AsyncMock(), AsyncMock()
+    monkeypatch.setattr(MongoDB, "connect", connect)
+    monkeypatch.setattr(MongoDB, "disconnect", disconnect)
+    monkeypatch.setattr(SchedulerService, "start", AsyncMock())
+    return connect, disconnect
+
+
+class TestLifespan:
+    """Test the lifespan starts and stops the background workers."""
+
+    def test_workers_started_and_stopped(self, mongo, monkeypatch):
+        """Test the workers are attached to app.state and stopped on exit."""
+        connect, disconnect = mongo
+        scheduler_stop = AsyncMock()
+        monkeypatch.setattr(SchedulerService, "stop", scheduler_stop)
+        app = create_app()
+
+        with TestClient(app):
+            assert isinstance(app.state.job_queue, JobQueue)
+            assert isinstance(app.state.scheduler, SchedulerService)
+            assert get_stats_buffer().running
+            connect.assert_awaited_once()
+
+        scheduler_stop.assert_awaited_once()
+        assert not get_stats_buffer().running
+        disconnect.assert_awaited_once()
+
+    def test_failed_startup_stops_started_workers(self, mongo, monkeypatch):
+        """Test a startup failure still stops the buffers and disconnects."""
+        _, disconnect = mongo
+        monkeypatch.setattr(
+            JobQueue, "start", AsyncMock(side_effect=RuntimeError("no worker"))
+        )
+
+        with pytest.raises(RuntimeError, match="no worker"), TestClient(create_app()):
+            pass
+
+        assert not get_stats_buffer().running
+        disconnect.assert_awaited_once()
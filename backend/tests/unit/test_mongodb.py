@@ -0,0 +1,33 @@
+"""Tests for MongoDB index setup."""
+
+from unittest.mock import AsyncMock
+
+from pymongo.errors import OperationFailure
+
+from app.db.mongodb import INDEXES, MongoDB
+
+
+class TestCreateIndexes:
+    """Test index creation at connect time."""
+
+    async def test_failed_index_does_not_block_others(self, mock_db, monkeypatch):
+        """Test a unique index over duplicates is logged and the rest are built."""
+        unique = INDEXES["api_keys"][-1].document["name"]
+
+        async def create_indexes(indexes):
+            if any(index.document["name"] == unique for index in indexes):
+                raise OperationFailure("E11000 duplicate key error", code=11000)
+            return [index.document["name"] for index in indexes]
+
+        api_keys = mock_db["api_keys"]
+        api_keys.create_indexes = AsyncMock(side_effect=create_indexes)
+        for name in INDEXES:
+            if name != "api_keys":
+                mock_db[name].create_indexes = AsyncMock()
+        monkeypatch.setattr(MongoDB, "_database", mock_db)
+
+        await MongoDB._create_indexes()
+
+        built = [call.args[0] for call in api_keys.create_indexes.await_args_list[1:]]
+        assert built == [[index] for index in INDEXES["api_keys"]]
+        mock_db["presets"].create_indexes.assert_awaited_once_with(INDEXES["presets"])
@@ -60,6 +60,14 @@ class TestPresets:
 
         assert details is None
 
+    def test_caller_changes_do_not_leak(self):
+        """Test the settings endpoints' additions don't alter cached presets."""
+        get_all_presets().append({"id": "custom"})
+        get_preset_details("standard")["is_system"] = True
+
+        assert len(get_all_presets()) == len(PRESETS)
+        assert "is_system" not in get_preset_details("standard")
+
     def test_starter_preset_minimal(self):
         """Test starter preset has minimal features."""
         config = get_preset_config("starter")
@@ -0,0 +1,66 @@
+"""Tests for rate limiting utilities."""
+
+import asyncio
+import time
+
+from app.core.rate_limit import AsyncTokenBucket
+
+
+class TestAsyncTokenBucket:
+    """Test outbound call pacing."""
+
+    async def test_burst_up_to_capacity(self):
+        """Test a full bucket admits max_rate calls without waiting."""
+        limiter = AsyncTokenBucket(max_rate=3, time_period=60)
+
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+
+        assert time.monotonic() - start < 0.05
+
+    async def test_waits_for_refill(self):
+        """Test an empty bucket waits for the next token."""
+        limiter = AsyncTokenBucket(max_rate=1, time_period=0.1)
+
+        async with limiter:
+            pass
+        start = time.monotonic()
+        async with limiter:
+            pass
+
+        assert time.monotonic() - start >= 0.08
+
+    async def test_full_again_after_refill(self):
+        """Test is_full tracks consumption and refill."""
+        limiter = AsyncTokenBucket(max_rate=1, time_period=0.05)
+        assert limiter.is_full()
+
+        await limiter.acquire()
+        assert not limiter.is_full()
+
+        await asyncio.sleep(0.06)
+        assert limiter.is_full()
+
+    def test_try_acquire_does_not_wait(self):
+        """Test try_acquire takes available tokens and refuses when empty."""
+        limiter = AsyncTokenBucket(max_rate=2, time_period=60)
+
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+
+    def test_set_max_rate_keeps_spent_tokens(self):
+        """Test resizing the bucket keeps what was already taken spent."""
+        limiter = AsyncTokenBucket(max_rate=3, time_period=86400)
+        limiter.try_acquire()
+        limiter.try_acquire()
+
+        limiter.set_max_rate(5)
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+
+        limiter.set_max_rate(1)
+        assert not limiter.try_acquire()
@@ -0,0 +1,139 @@
+"""Tests for result repository helpers."""
+
+import re
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+from bson import ObjectId
+
+from app.repositories.result import (
+    DAILY_ROLLUP_COLLECTION,
+    ResultRepository,
+    substring_pattern,
+)
+
+
+class TestSubstringPattern:
+    """Test search input escaping."""
+
+    def test_plain_text_unchanged(self):
+        """Test plain words are matched literally."""
+        assert substring_pattern("great battery") == re.escape("great battery")
+
+    def test_metacharacters_escaped(self):
+        """Test regex metacharacters cannot alter the pattern."""
+        pattern = substring_pattern("(a+)+$")
+
+        assert re.fullmatch(pattern, "(a+)+$")
+        assert not re.search(pattern, "aaaa")
+
+
+class TestResultRepository:
+    """Test result queries against a mocked database."""
+
+    def _doc(self) -> dict:
+        now = datetime.now(timezone.utc)
+        return {
+            "_id": ObjectId(),
+            "project_id": "p1",
+            "target_id": "t1",
+            "user_id": "u1",
+            "content": {"text": "Great product"},
+            "analysis": {"sentiment": {"label": "positive", "score": 0.8}},
+            "platform": "amazon",
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    def test_collections(self, mock_db):
+        """Test the repository binds the results and rollup collections."""
+        repo = ResultRepository(mock_db)
+
+        assert repo.collection is mock_db["results"]
+        assert repo.rollup_collection is mock_db[DAILY_ROLLUP_COLLECTION]
+
+    async def test_paginated_results(self, mock_db):
+        """Test a page of stored results is built into models."""
+        doc = self._doc()
+        oid = doc["_id"]
+        collection = mock_db["results"]
+        cursor = collection.find.return_value
+        cursor.sort.return_value = cursor.skip.return_value = cursor
+        cursor.limit.return_value = cursor
+        cursor.__aiter__.return_value = [doc]
+        collection.count_documents = AsyncMock(return_value=1)
+
+        page = await ResultRepository(mock_db).get_results_by_target("t1", "u1")
+
+        assert page.total == 1
+        assert page.items[0].id == str(oid)
+        assert page.items[0].analysis.sentiment.label == "positive"
+
+    async def test_delete_result_adjusts_rollup(self, mock_db):
+        """Test deleting a result subtracts it from its daily rollup row."""
+        doc = self._doc()
+        doc["content"]["date"] = datetime(2024, 5, 1, 15, 30)
+        mock_db["results"].find_one_and_delete = AsyncMock(return_value=doc)
+        rollup = mock_db[DAILY_ROLLUP_COLLECTION]
+        rollup.update_one = AsyncMock()
+        rollup.delete_one = AsyncMock()
+
+        await ResultRepository(mock_db).delete_result(str(doc["_id"]), "u1")
+
+        rollup_id = {
+            "project_id": "p1",
+            "user_id": "u1",
+            "target_id": "t1",
+            "day": datetime(2024, 5, 1),
+        }
+        rollup.update_one.assert_awaited_once_with(
+            {"_id": rollup_id},
+            {"$inc": {"count": -1, "scored": -1, "score_sum": -0.8}},
+        )
+        rollup.delete_one.assert_awaited_once_with(
+            {"_id": rollup_id, "count": {"$lte": 0}}
+        )
+
+    async def test_sentiment_over_time_without_rollup(self, mock_db):
+        """Test a project with no rollup rows is read from the results."""
+        empty, raw = AsyncMock(), AsyncMock()
+        empty.to_list.return_value = []
+        raw.to_list.return_value = [
+            {"_id": datetime(2024, 5, 1), "avg_score": 0.5, "count": 2}
+        ]
+        mock_db[DAILY_ROLLUP_COLLECTION].aggregate = AsyncMock(return_value=empty)
+        mock_db["results"].aggregate = AsyncMock(return_value=raw)
+
+        trend = await ResultRepository(mock_db).get_sentiment_over_time("p1", "u1")
+
+        assert trend == [{"date": "2024-05-01", "avg_score": 0.5, "count": 2}]
+        pipeline = mock_db["results"].aggregate.await_args.args[0]
+        assert pipeline[0] == {"$match": {"project_id": "p1", "user_id": "u1"}}
+
+    async def test_refresh_changed_rollups(self, mock_db):
+        """Test only projects with results inserted since the cutoff are rebuilt."""
+        since = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        mock_db["results"].distinct = AsyncMock(return_value=["p1", "p2"])
+        repo = ResultRepository(mock_db)
+        repo.refresh_daily_rollup = AsyncMock()
+
+        assert await repo.refresh_changed_rollups(since) == 2
+
+        query = mock_db["results"].distinct.await_args.args[1]
+        assert query == {"_id": {"$gte": ObjectId.from_datetime(since)}}
+        assert repo.refresh_daily_rollup.await_args_list == [(("p1",),), (("p2",),)]
+
+    async def test_sentiment_over_time_labels(self, mock_db):
+        """Test buckets keep the interval's date label format."""
+        cursor = AsyncMock()
+        cursor.to_list.return_value = [
+            {"_id": datetime(2024, 12, 30), "avg_score": 0.1, "count": 3}
+        ]
+        mock_db[DAILY_ROLLUP_COLLECTION].aggregate = AsyncMock(return_value=cursor)
+        repo = ResultRepository(mock_db)
+
+        day = await repo.get_sentiment_over_time("p1", "u1", interval="day")
+        week = await repo.get_sentiment_over_time("p1", "u1", interval="week")
+
+        assert day[0]["date"] == "2024-12-30"
+        assert week[0]["date"] == "2025-W01"
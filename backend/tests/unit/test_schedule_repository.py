@@ -0,0 +1,41 @@
+"""Tests for schedule repository queries."""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+from bson import ObjectId
+
+from app.repositories.schedule import ScheduleRepository
+
+
+class TestScheduleRepository:
+    """Test schedule queries against a mocked database."""
+
+    def test_collections(self, mock_db):
+        """Test the repository binds the schedule and execution collections."""
+        repo = ScheduleRepository(mock_db)
+
+        assert repo.collection is mock_db["schedules"]
+        assert repo.executions_collection is mock_db["schedule_executions"]
+
+    async def test_schedules(self, mock_db):
+        """Test stored schedules are built into a schedule list."""
+        now = datetime.now(timezone.utc)
+        oid = ObjectId()
+        schedule = {
+            "_id": oid,
+            "project_id": "p1",
+            "user_id": "u1",
+            "frequency": "weekly",
+            "day_of_week": 1,
+            "created_at": now,
+            "updated_at": now,
+        }
+        cursor = mock_db["schedules"].find.return_value.sort.return_value
+        cursor.to_list = AsyncMock(return_value=[schedule])
+
+        schedules = await ScheduleRepository(mock_db).get_schedules("u1")
+
+        assert schedules.total == 1
+        assert schedules.items[0].id == str(oid)
+        assert schedules.items[0].frequency == "weekly"
@@ -0,0 +1,49 @@
+"""Tests for the scheduler service."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.scheduler import ROLLUP_REFRESH_OVERLAP, SchedulerService
+
+
+class TestRollupRefresh:
+    """Test the periodic daily rollup refresh."""
+
+    def _scheduler(self, mock_db) -> SchedulerService:
+        scheduler = SchedulerService(mock_db, MagicMock())
+        scheduler.result_repo = AsyncMock()
+        return scheduler
+
+    async def test_empty_rollup_rebuilt(self, mock_db):
+        """Test the whole rollup is built when it has never been written."""
+        scheduler = self._scheduler(mock_db)
+        scheduler.result_repo.get_rollup_refreshed_at.return_value = None
+
+        await scheduler._refresh_rollup_if_due()
+
+        scheduler.result_repo.refresh_daily_rollup.assert_awaited_once_with()
+        scheduler.result_repo.refresh_changed_rollups.assert_not_awaited()
+
+    async def test_later_passes_incremental(self, mock_db):
+        """Test later passes only rebuild projects changed since the last pass."""
+        scheduler = self._scheduler(mock_db)
+        last = datetime.now(timezone.utc) - timedelta(hours=2)
+        scheduler._rollup_refreshed_at = last
+
+        await scheduler._refresh_rollup_if_due()
+
+        scheduler.result_repo.refresh_changed_rollups.assert_awaited_once_with(
+            last - ROLLUP_REFRESH_OVERLAP
+        )
+        scheduler.result_repo.refresh_daily_rollup.assert_not_awaited()
+        assert scheduler._rollup_refreshed_at > last
+
+    async def test_not_due(self, mock_db):
+        """Test nothing is refreshed within the refresh interval."""
+        scheduler = self._scheduler(mock_db)
+        scheduler._rollup_refreshed_at = datetime.now(timezone.utc)
+
+        await scheduler._refresh_rollup_if_due()
+
+        scheduler.result_repo.refresh_changed_rollups.assert_not_awaited()
+        scheduler.result_repo.get_rollup_refreshed_at.assert_not_awaited()
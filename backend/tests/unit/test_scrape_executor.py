@@ -0,0 +1,28 @@
+"""Tests for scrape job execution."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.exceptions import RateLimitError
+from app.core.rate_limit import AsyncTokenBucket
+from app.services.scrape_executor import ScrapeExecutor
+
+
+class TestDailyBudget:
+    """Test the per-project daily request budget."""
+
+    async def test_empty_budget_fails_without_waiting(self, mock_db):
+        """Test an exhausted budget fails the target instead of blocking."""
+        executor = ScrapeExecutor(mock_db, MagicMock())
+        executor._daily_limiter = AsyncTokenBucket(max_rate=1, time_period=86400)
+        executor._daily_limiter.try_acquire()
+        executor._burst_limiter = AsyncTokenBucket(max_rate=1)
+        sm_service = MagicMock(scrape_url=AsyncMock())
+
+        with pytest.raises(RateLimitError):
+            await executor._scrape_and_analyze_target(
+                job=MagicMock(), target=MagicMock(), project=MagicMock(), sm_service=sm_service
+            )
+
+        sm_service.scrape_url.assert_not_awaited()
@@ -0,0 +1,43 @@
+"""Tests for scrape job repository queries."""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+from bson import ObjectId
+
+from app.repositories.scrape_job import ScrapeJobRepository
+
+
+class TestScrapeJobRepository:
+    """Test scrape job queries against a mocked database."""
+
+    def test_collections(self, mock_db):
+        """Test the repository binds the job and per-target collections."""
+        repo = ScrapeJobRepository(mock_db)
+
+        assert repo.collection is mock_db["scrape_jobs"]
+        assert repo.targets_collection is mock_db["targets"]
+        assert repo.job_targets_collection is mock_db["scrape_job_targets"]
+
+    async def test_jobs_by_project(self, mock_db):
+        """Test the $facet page and total are built into a job list."""
+        now = datetime.now(timezone.utc)
+        oid = ObjectId()
+        job = {
+            "_id": oid,
+            "project_id": "p1",
+            "user_id": "u1",
+            "status": "completed",
+            "stats": {"targets_total": 2},
+            "created_at": now,
+            "updated_at": now,
+        }
+        cursor = AsyncMock()
+        cursor.to_list.return_value = [{"items": [job], "total": [{"n": 7}]}]
+        mock_db["scrape_jobs"].aggregate = AsyncMock(return_value=cursor)
+
+        jobs = await ScrapeJobRepository(mock_db).get_jobs_by_project("p1", "u1")
+
+        assert jobs.total == 7
+        assert jobs.items[0].id == str(oid)
+        assert jobs.items[0].stats.targets_total == 2
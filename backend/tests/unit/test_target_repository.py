@@ -0,0 +1,78 @@
+"""Tests for target repository helpers."""
+
+from urllib.parse import urlsplit
+
+import pytest
+
+from app.repositories.target import detect_platform, extract_platform_data
+
+
+class TestDetectPlatform:
+    """Test platform detection from URLs."""
+
+    @pytest.mark.parametrize(
+        "url,platform",
+        [
+            ("https://www.amazon.co.uk/dp/B08N5WRWNW", "amazon"),
+            ("https://amzn.to/3abcdef", "amazon"),
+            ("https://store.steampowered.com/app/570/", "steam"),
+            ("https://youtu.be/dQw4w9WgXcQ", "youtube"),
+            ("https://old.reddit.com/r/python/comments/abc123/", "reddit"),
+            ("https://maps.google.com/?cid=123", "google"),
+            ("https://www.trustpilot.com/review/example.com", "trustpilot"),
+            ("https://www.yelp.co.uk/biz/cafe", "yelp"),
+        ],
+    )
+    def test_known_platforms(self, url, platform):
+        """Test each platform is detected from its domains."""
+        assert detect_platform(urlsplit(url)) == platform
+
+    def test_unknown_platform(self):
+        """Test an unrecognised domain has no platform."""
+        assert detect_platform(urlsplit("https://example.com/reviews")) is None
+
+
+class TestExtractPlatformData:
+    """Test platform ID extraction from URLs."""
+
+    def test_amazon_asin(self):
+        """Test the ASIN is taken from the product path."""
+        url = urlsplit("https://www.amazon.com/dp/B08N5WRWNW")
+
+        data = extract_platform_data(url, "amazon")
+
+        assert data.asin == "B08N5WRWNW"
+
+    def test_steam_app_id(self):
+        """Test the app ID is parsed as an integer."""
+        url = urlsplit("https://store.steampowered.com/app/570/")
+
+        data = extract_platform_data(url, "steam")
+
+        assert data.app_id == 570
+
+    def test_youtube_video_id(self):
+        """Test video IDs from both watch and short URLs."""
+        watch_url = urlsplit("https://www.youtube.com/watch?v=abc123&t=5")
+        short_url = urlsplit("https://youtu.be/abc123")
+
+        watch = extract_platform_data(watch_url, "youtube")
+        short = extract_platform_data(short_url, "youtube")
+
+        assert watch.video_id == short.video_id == "abc123"
+
+    def test_reddit_post_id(self):
+        """Test the post ID is taken from the comments path."""
+        url = urlsplit("https://www.reddit.com/r/python/comments/abc123/title/")
+
+        data = extract_platform_data(url, "reddit")
+
+        assert data.post_id == "abc123"
+
+    def test_platform_without_extractor(self):
+        """Test platforms without IDs return empty data."""
+        url = urlsplit("https://www.yelp.com/biz/cafe")
+
+        data = extract_platform_data(url, "yelp")
+
+        assert data.model_dump(exclude_none=True) == {}
@@ -44,7 +44,12 @@ class TestWebhookModels:
         with pytest.raises(ValidationError) as exc_info:
             WebhookCreate(url="not-a-url")
 
-        assert "URL must start with http:// or https://" in str(exc_info.value)
+        assert "valid URL" in str(exc_info.value)
+
+    def test_webhook_create_invalid_scheme(self):
+        """Test non-HTTP URL scheme is rejected."""
+        with pytest.raises(ValidationError):
+            WebhookCreate(url="ftp://example.com/webhook")
 
     def test_webhook_create_invalid_event(self):
         """Test invalid event type."""
@@ -54,7 +59,7 @@ class TestWebhookModels:
                 events=["invalid.event"],
             )
 
-        assert "Invalid event" in str(exc_info.value)
+        assert "invalid.event" in str(exc_info.value)
 
     def test_webhook_create_http_url(self):
         """Test HTTP URL is valid."""
@@ -100,6 +105,11 @@ class TestWebhookUpdate:
 
         assert update.url == "https://new-url.com/webhook"
 
+    def test_update_invalid_url(self):
+        """Test updating with an invalid URL."""
+        with pytest.raises(ValidationError):
+            WebhookUpdate(url="not-a-url")
+
     def test_update_multiple_fields(self):
         """Test updating multiple fields."""
         update = WebhookUpdate(
@@ -111,6 +121,11 @@ class TestWebhookUpdate:
         assert update.events == ["job.started"]
         assert update.secret == "new-secret"
 
+    def test_update_invalid_event(self):
+        """Test updating with an invalid event type."""
+        with pytest.raises(ValidationError):
+            WebhookUpdate(events=["invalid.event"])
+
 
 class TestWebhookDelivery:
     """Test webhook delivery model."""
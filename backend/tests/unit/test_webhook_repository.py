@@ -0,0 +1,32 @@
+"""Tests for webhook repository queries."""
+
+from unittest.mock import AsyncMock
+
+from bson import ObjectId
+
+from app.repositories.webhook import WebhookRepository
+
+
+class TestDeliveryCount:
+    """Test the per-webhook delivery counter."""
+
+    async def test_record_delivery_seeds_missing_count(self, mock_db):
+        """Test a webhook without a counter starts counting instead of skipping."""
+        webhooks = mock_db["webhooks"]
+        webhooks.update_one = AsyncMock()
+        mock_db["webhook_deliveries"].insert_one = AsyncMock()
+
+        await WebhookRepository(mock_db).record_delivery(
+            str(ObjectId()), "job.completed", {}, 200, b"ok", None, 12.0
+        )
+
+        stage = webhooks.update_one.await_args.args[1][0]["$set"]
+        assert stage["deliveries_count"] == {
+            "$add": [{"$ifNull": ["$deliveries_count", 0]}, 1]
+        }
+
+    async def test_total_without_count(self, mock_db):
+        """Test a webhook that never stored a counter reports zero."""
+        mock_db["webhooks"].find_one = AsyncMock(return_value={"_id": ObjectId()})
+
+        assert await WebhookRepository(mock_db)._delivery_total(str(ObjectId())) == 0
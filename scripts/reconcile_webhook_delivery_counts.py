@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Webhook Delivery Count Reconciliation for Sentimatrix Studio
+
+Sets each webhook's deliveries_count from its delivery log. Webhooks created
+before the counter existed start counting from zero when they are upgraded,
+so their totals leave out older deliveries until this script has run.
+
+Run it once while the app is stopped, before starting the upgraded version.
+Deliveries recorded while the script runs would otherwise be counted twice
+or not at all.
+
+Usage:
+    python scripts/reconcile_webhook_delivery_counts.py
+
+Requirements:
+    pip install pymongo
+
+Environment Variables:
+    MONGODB_URL: MongoDB connection string (default: mongodb://localhost:27017)
+    DATABASE_NAME: Database name (default: sentimatrix_studio)
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+try:
+    from bson import ObjectId
+    from bson.errors import InvalidId
+    from pymongo import AsyncMongoClient, UpdateOne
+except ImportError:
+    print("Required packages not installed. Run:")
+    print("  pip install pymongo")
+    sys.exit(1)
+
+
+async def reconcile(mongodb_url: str, database_name: str) -> None:
+    """Set deliveries_count on every webhook from the delivery log."""
+    client = AsyncMongoClient(mongodb_url)
+    db = client[database_name]
+
+    cursor = await db.webhook_deliveries.aggregate(
+        [{"$group": {"_id": "$webhook_id", "count": {"$sum": 1}}}]
+    )
+    counts: dict[ObjectId, int] = {}
+    async for row in cursor:
+        try:
+            counts[ObjectId(row["_id"])] = row["count"]
+        except (InvalidId, TypeError):
+            continue
+
+    operations = []
+    async for webhook in db.webhooks.find({}, {"_id": 1}):
+        operations.append(
+            UpdateOne(
+                {"_id": webhook["_id"]},
+                {"$set": {"deliveries_count": counts.get(webhook["_id"], 0)}},
+            )
+        )
+
+    if operations:
+        await db.webhooks.bulk_write(operations, ordered=False)
+    print(f"Reconciled delivery counts for {len(operations)} webhooks")
+
+    await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reconcile webhook delivery counts with the delivery log",
+    )
+    parser.add_argument(
+        "--mongodb-url",
+        type=str,
+        default=os.getenv("MONGODB_URL", "mongodb://localhost:27017"),
+        help="MongoDB connection URL"
+    )
+    parser.add_argument(
+        "--database",
+        type=str,
+        default=os.getenv("DATABASE_NAME", "sentimatrix_studio"),
+        help="Database name"
+    )
+
+    args = parser.parse_args()
+
+    asyncio.run(reconcile(mongodb_url=args.mongodb_url, database_name=args.database))
+
+
+if __name__ == "__main__":
+    main()